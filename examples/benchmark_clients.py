@@ -0,0 +1,70 @@
+"""
+LLM 호출 방식 비교 예제
+
+LangChain 래퍼(client='langchain')와 HTTP API 직접 호출(client='direct')의
+응답과 호출 시간을 같은 프롬프트로 비교합니다.
+"""
+import sys
+import os
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config_manager import ConfigManager
+from src.llm_provider import LLMProviderManager
+
+
+def benchmark(client: str, prompts: list, repeat: int = 3) -> dict:
+    """
+    호출 방식별 측정
+    
+    Args:
+        client: 'langchain' 또는 'direct'
+        prompts: 측정할 프롬프트 리스트
+        repeat: 반복 횟수
+    
+    Returns:
+        응답 리스트와 평균 호출 시간 딕셔너리
+    """
+    llm_config = ConfigManager('config/ollama_config.yaml').get_llm_config()
+    provider = LLMProviderManager(
+        provider=llm_config.provider,
+        model=llm_config.model,
+        base_url=llm_config.base_url,
+        temperature=0.0,  # 비교를 위해 결정적 생성
+        max_tokens=llm_config.max_tokens,
+        keep_alive=llm_config.keep_alive,
+        client=client
+    )
+    
+    responses = []
+    elapsed = []
+    for _ in range(repeat):
+        for prompt in prompts:
+            start = time.perf_counter()
+            responses.append(provider.invoke(prompt, use_cache=False))
+            elapsed.append(time.perf_counter() - start)
+    provider.close()
+    
+    return {'responses': responses, 'avg': sum(elapsed) / len(elapsed)}
+
+
+def main():
+    """메인 함수"""
+    prompts = [
+        "다음 질의의 명확성을 평가하세요: 파이썬 웹 스크래핑",
+        "Rate the clarity of this query: React hooks",
+    ]
+    
+    results = {client: benchmark(client, prompts) for client in ['langchain', 'direct']}
+    
+    for client, result in results.items():
+        print(f"{client:>10}: 평균 {result['avg'] * 1000:.1f}ms")
+    
+    same = results['langchain']['responses'] == results['direct']['responses']
+    print(f"응답 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,7 @@ from src.llm_provider import LLMProviderManager
 from src.prompt_optimizer import PromptOptimizer
 from src.workflow import PromptOptimizationWorkflow
 from src.display import DisplayManager
+from src.run_context import RunContext
 
 
 def example_1_custom_config():
@@ -110,19 +111,20 @@ def example_2_analyze_optimization_steps():
         prompt_optimizer = PromptOptimizer(llm_provider)
         workflow = PromptOptimizationWorkflow(llm_provider, prompt_optimizer, display)
         
-        # 질의 실행
+        # 질의 실행 (실행 기록은 RunContext에 보관)
         query = "API 설계 베스트 프랙티스"
-        final_state = workflow.run(query)
+        run_context = RunContext(query)
+        final_state = workflow.run(query, run_context=run_context)
         
         # 최적화 단계 분석
         print("\n" + "="*60)
         print("최적화 단계 상세 분석")
         print("="*60)
         
-        steps = prompt_optimizer.get_optimization_steps()
+        steps = run_context.steps
         for i, step in enumerate(steps, 1):
             print(f"\n단계 {i}: {step.name}")
-            print(f"  시간: {step.timestamp.strftime('%H:%M:%S')}")
+            print(f"  시간: {step.time.strftime('%H:%M:%S')}")
             print(f"  설명: {step.description}")
             print(f"  입력 길이: {len(step.input_data)} 문자")
             print(f"  출력 길이: {len(step.output_data)} 문자")
@@ -133,13 +135,10 @@ def example_2_analyze_optimization_steps():
         print("="*60)
         
         history = workflow.get_state_history()
-        for i, state in enumerate(history, 1):
+        for i, record in enumerate(history, 1):
             print(f"\n상태 {i}:")
-            print(f"  완료된 단계: {len(state['steps'])}")
-            if state['steps']:
-                last_step = state['steps'][-1]
-                print(f"  마지막 단계: {last_step['name']}")
-                print(f"  상태: {last_step['status']}")
+            print(f"  완료된 단계: {record.node}")
+            print(f"  소요 시간: {record.duration:.2f}초")
     
     except Exception as e:
         display.show_error(e, "단계 분석")
@@ -220,7 +219,6 @@ def example_4_batch_processing():
         )
         
         prompt_optimizer = PromptOptimizer(llm_provider)
-        workflow = PromptOptimizationWorkflow(llm_provider, prompt_optimizer, display)
         
         # 배치 질의
         queries = [
@@ -229,23 +227,32 @@ def example_4_batch_processing():
             "마이크로서비스 아키텍처"
         ]
         
-        results = []
+        # 분석과 최적화를 동시에 처리 (결과는 입력 순서대로 반환)
+        display.show_info(f"{len(queries)}개 질의 최적화 중...")
+        optimized = prompt_optimizer.optimize_many(queries, max_concurrency=4)
         
-        for i, query in enumerate(queries, 1):
-            display.show_info(f"배치 처리 {i}/{len(queries)}")
-            
-            final_state = workflow.run(query)
-            
-            results.append({
-                'query': query,
-                'success': not final_state.get('error'),
-                'optimized': final_state.get('optimized_prompt', ''),
-                'response': final_state.get('llm_response', '')
-            })
-            
-            # 다음 질의 전에 히스토리 초기화
-            workflow.clear_history()
-            prompt_optimizer.clear_steps()
+        # 최적화에 성공한 프롬프트만 일괄 호출
+        succeeded = [r for r in optimized if r['error'] is None]
+        display.show_info(f"{len(succeeded)}개 프롬프트 LLM 호출 중...")
+        responses = llm_provider.invoke_batch(
+            [r['optimized_prompt'] for r in succeeded],
+            max_concurrency=4
+        )
+        for item, response in zip(succeeded, responses):
+            if isinstance(response, Exception):
+                item['error'] = str(response)
+            else:
+                item['response'] = response
+        
+        results = [
+            {
+                'query': r['query'],
+                'success': r['error'] is None,
+                'optimized': r['optimized_prompt'] or '',
+                'response': r.get('response', '')
+            }
+            for r in optimized
+        ]
         
         # 결과 요약
         print("\n" + "="*60)
@@ -0,0 +1,217 @@
+"""
+LLM 백엔드 풀 모듈
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class Backend:
+    """LLM 백엔드 노드"""
+    
+    def __init__(self, base_url: str, llm: Optional[Any] = None,
+                 limiter: Optional[Any] = None):
+        """
+        Args:
+            base_url: 백엔드 서비스 URL
+            llm: 이 백엔드용 LLM 객체 (지연 모드에서는 None)
+            limiter: 이 백엔드의 동시 요청 제한 (AdaptiveLimiter)
+        """
+        self.base_url = base_url
+        self.llm = llm
+        self.limiter = limiter
+        self.inflight = 0
+        self.ewma_latency: Optional[float] = None
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.total_requests = 0
+        self.total_failures = 0
+    
+    def score(self) -> float:
+        """
+        라우팅 점수 (낮을수록 우선)
+        
+        진행 중인 요청 수에 지연 시간 EWMA를 곱합니다. 아직 측정값이 없는
+        백엔드는 0점으로 취급하여 먼저 사용해 보도록 합니다.
+        """
+        return (self.inflight + 1) * (self.ewma_latency or 0.0)
+
+
+class BackendPool:
+    """
+    최소 진행 요청(least-outstanding-requests) 기반 백엔드 풀
+    
+    연속으로 실패한 백엔드는 제외하고, 백그라운드 스레드가 주기적으로
+    다시 검사하여 복구되면 풀에 되돌립니다.
+    """
+    
+    def __init__(self, backends: List[Backend], ewma_alpha: float = 0.3,
+                 max_failures: int = 3, probe_interval: float = 10.0,
+                 probe: Optional[Callable[[Backend], bool]] = None):
+        """
+        Args:
+            backends: 백엔드 목록 (첫 번째가 기본 백엔드)
+            ewma_alpha: 지연 시간 EWMA 가중치 (0~1, 클수록 최근 값 반영)
+            max_failures: 제외하기까지 허용하는 연속 실패 횟수
+            probe_interval: 제외된 백엔드 재검사 주기 (초)
+            probe: 백엔드 상태 검사 함수 (None이면 재검사하지 않음)
+        """
+        if not backends:
+            raise ValueError("백엔드가 최소 하나 필요합니다.")
+        self.backends = backends
+        self.ewma_alpha = ewma_alpha
+        self.max_failures = max_failures
+        self.probe_interval = probe_interval
+        self.probe = probe
+        self._lock = threading.Lock()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    @property
+    def primary(self) -> Backend:
+        """기본 백엔드"""
+        return self.backends[0]
+    
+    def acquire(self, exclude: Iterable[Backend] = ()) -> Backend:
+        """
+        요청을 보낼 백엔드 선택 및 진행 요청 수 증가
+        
+        Args:
+            exclude: 이번 선택에서 제외할 백엔드 (재시도 시 직전 실패 백엔드)
+        
+        Returns:
+            선택된 백엔드
+        """
+        excluded = set(id(b) for b in exclude)
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and id(b) not in excluded]
+            if not candidates:
+                candidates = [b for b in self.backends if b.healthy]
+            if not candidates:
+                # 모두 제외된 경우에도 요청은 시도
+                candidates = self.backends
+            
+            backend = min(candidates, key=lambda b: (b.score(), b.inflight))
+            backend.inflight += 1
+            backend.total_requests += 1
+            return backend
+    
+    def release(self, backend: Backend, latency: Optional[float], success: bool) -> bool:
+        """
+        요청 완료 기록
+        
+        Args:
+            backend: acquire로 선택한 백엔드
+            latency: 요청 소요 시간 (초)
+            success: 성공 여부
+        
+        Returns:
+            이번 실패로 백엔드가 제외되었는지 여부
+        """
+        ejected = False
+        with self._lock:
+            backend.inflight = max(0, backend.inflight - 1)
+            if success:
+                backend.consecutive_failures = 0
+                if latency is not None:
+                    if backend.ewma_latency is None:
+                        backend.ewma_latency = latency
+                    else:
+                        backend.ewma_latency = (
+                            self.ewma_alpha * latency
+                            + (1 - self.ewma_alpha) * backend.ewma_latency
+                        )
+            else:
+                backend.consecutive_failures += 1
+                backend.total_failures += 1
+                if backend.healthy and backend.consecutive_failures >= self.max_failures:
+                    backend.healthy = False
+                    ejected = True
+        
+        if ejected:
+            self._start_probing()
+        return ejected
+    
+    def cancel(self, backend: Backend):
+        """
+        취소된 요청 기록 (성공/실패 통계에 반영하지 않음)
+        
+        Args:
+            backend: acquire로 선택한 백엔드
+        """
+        with self._lock:
+            backend.inflight = max(0, backend.inflight - 1)
+    
+    def mark_unhealthy(self, backend: Backend):
+        """
+        백엔드를 즉시 제외 (초기 연결 검증 실패 등)
+        
+        Args:
+            backend: 제외할 백엔드
+        """
+        with self._lock:
+            backend.healthy = False
+        self._start_probing()
+    
+    def _start_probing(self):
+        """제외된 백엔드 재검사 스레드 시작"""
+        if self.probe is None:
+            return
+        with self._lock:
+            if self._probe_thread is not None:
+                return
+            self._stop_event.clear()
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop,
+                name="backend-pool-probe",
+                daemon=True
+            )
+            self._probe_thread.start()
+    
+    def _probe_loop(self):
+        """제외된 백엔드가 없어질 때까지 주기적으로 재검사"""
+        while not self._stop_event.wait(self.probe_interval):
+            with self._lock:
+                ejected = [b for b in self.backends if not b.healthy]
+                if not ejected:
+                    self._probe_thread = None
+                    return
+            
+            for backend in ejected:
+                try:
+                    recovered = self.probe(backend)
+                except Exception:
+                    recovered = False
+                if recovered:
+                    with self._lock:
+                        backend.healthy = True
+                        backend.consecutive_failures = 0
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        백엔드별 상태 반환
+        
+        Returns:
+            백엔드별 상태 딕셔너리 리스트
+        """
+        with self._lock:
+            return [
+                {
+                    'base_url': b.base_url,
+                    'healthy': b.healthy,
+                    'inflight': b.inflight,
+                    'ewma_latency': b.ewma_latency,
+                    'requests': b.total_requests,
+                    'failures': b.total_failures,
+                    'concurrency': b.limiter.get_stats() if b.limiter is not None else None
+                }
+                for b in self.backends
+            ]
+    
+    def close(self):
+        """재검사 스레드 종료"""
+        self._stop_event.set()
+        with self._lock:
+            thread = self._probe_thread
+            self._probe_thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
@@ -0,0 +1,391 @@
+"""
+워크플로우 체크포인트 저장소 모듈
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """
+    SQLite 기반 LangGraph 체크포인트 저장소
+    
+    노드가 끝날 때마다 그래프 상태를 thread_id(실행 식별자)별로 저장하므로,
+    프로세스가 중단된 뒤 같은 thread_id로 다시 실행하면 마지막으로 완료된
+    노드 다음부터 이어서 실행할 수 있습니다.
+    
+    WAL 모드로 열고, 쓰기는 commit_every개 또는 commit_interval초마다 한 번에
+    커밋합니다. 커밋하지 않은 쓰기도 같은 연결에서 바로 조회되며, 프로세스가
+    비정상 종료되면 마지막 커밋 이후의 쓰기만 잃습니다 (해당 질의는 이전
+    체크포인트부터 다시 실행). 여러 스레드에서 함께 사용할 수 있습니다.
+    """
+    
+    def __init__(self, path: str = ".cache/checkpoints.db", commit_every: int = 100,
+                 commit_interval: float = 1.0, serde: Optional[Any] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (':memory:'이면 메모리 저장소)
+            commit_every: 커밋 전에 모을 최대 쓰기 수 (1이면 쓰기마다 커밋)
+            commit_interval: 커밋 사이의 최대 간격 (초)
+            serde: 체크포인트 직렬화 객체 (None이면 LangGraph 기본값)
+        """
+        if commit_every < 1:
+            raise ValueError("commit_every는 1 이상이어야 합니다.")
+        super().__init__(serde=serde)
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.commits = 0
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._lock = threading.RLock()
+        
+        directory = os.path.dirname(path)
+        if path != ':memory:' and directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT NOT NULL, "
+            "checkpoint_ns TEXT NOT NULL DEFAULT '', "
+            "checkpoint_id TEXT NOT NULL, "
+            "parent_checkpoint_id TEXT, "
+            "type TEXT, "
+            "checkpoint BLOB, "
+            "metadata_type TEXT, "
+            "metadata BLOB, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS writes ("
+            "thread_id TEXT NOT NULL, "
+            "checkpoint_ns TEXT NOT NULL DEFAULT '', "
+            "checkpoint_id TEXT NOT NULL, "
+            "task_id TEXT NOT NULL, "
+            "idx INTEGER NOT NULL, "
+            "channel TEXT NOT NULL, "
+            "type TEXT, "
+            "value BLOB, "
+            "task_path TEXT NOT NULL DEFAULT '', "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+        )
+        self._conn.commit()
+    
+    def _written(self):
+        """쓰기 1건 기록 후 필요하면 커밋 (잠금 안에서 호출)"""
+        self._pending += 1
+        if (self._pending >= self.commit_every
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self._commit()
+    
+    def _commit(self):
+        """모인 쓰기 커밋 (잠금 안에서 호출)"""
+        if self._pending:
+            self._conn.commit()
+            self.commits += 1
+            self._pending = 0
+        self._last_commit = time.monotonic()
+    
+    def _pending_writes(self, thread_id: str, checkpoint_ns: str,
+                        checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        """체크포인트에 딸린 노드 쓰기 목록 (잠금 안에서 호출)"""
+        rows = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, value)))
+            for task_id, channel, type_, value in rows
+        ]
+    
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        """checkpoints 행을 CheckpointTuple로 변환 (잠금 안에서 호출)"""
+        checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata = row
+        return CheckpointTuple(
+            config={
+                'configurable': {
+                    'thread_id': thread_id,
+                    'checkpoint_ns': checkpoint_ns,
+                    'checkpoint_id': checkpoint_id
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    'configurable': {
+                        'thread_id': thread_id,
+                        'checkpoint_ns': checkpoint_ns,
+                        'checkpoint_id': parent_id
+                    }
+                }
+                if parent_id else None
+            ),
+            pending_writes=self._pending_writes(thread_id, checkpoint_ns, checkpoint_id)
+        )
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        체크포인트 조회
+        
+        Args:
+            config: thread_id (및 checkpoint_id)가 담긴 그래프 설정
+        
+        Returns:
+            CheckpointTuple (checkpoint_id가 없으면 가장 최근 것, 없으면 None)
+        """
+        configurable = config['configurable']
+        thread_id = configurable['thread_id']
+        checkpoint_ns = configurable.get('checkpoint_ns', '')
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: Tuple[Any, ...] = (thread_id, checkpoint_ns)
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+    
+    def list(self, config: Optional[RunnableConfig], *,
+             filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        """
+        체크포인트 목록 조회 (최근 순)
+        
+        Args:
+            config: thread_id 등이 담긴 그래프 설정 (None이면 전체)
+            filter: 메타데이터 조건
+            before: 이 체크포인트보다 이전 것만 조회
+            limit: 최대 개수
+        
+        Returns:
+            CheckpointTuple 반복자
+        """
+        conditions = []
+        params: List[Any] = []
+        if config:
+            configurable = config['configurable']
+            conditions.append("thread_id = ?")
+            params.append(configurable['thread_id'])
+            if configurable.get('checkpoint_ns') is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(configurable['checkpoint_ns'])
+            if get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            conditions.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY checkpoint_id DESC"
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            tuples = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(tuples) >= limit:
+                    break
+                item = self._to_tuple(thread_id, checkpoint_ns, tuple(row))
+                if filter and not all(
+                    item.metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                tuples.append(item)
+        yield from tuples
+    
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint,
+            metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        """
+        체크포인트 저장
+        
+        Args:
+            config: 부모 체크포인트가 담긴 그래프 설정
+            checkpoint: 저장할 체크포인트
+            metadata: 체크포인트 메타데이터
+            new_versions: 이번에 바뀐 채널 버전 (체크포인트에 값이 모두 있으므로 사용하지 않음)
+        
+        Returns:
+            저장한 체크포인트를 가리키는 그래프 설정
+        """
+        configurable = config['configurable']
+        thread_id = configurable['thread_id']
+        checkpoint_ns = configurable.get('checkpoint_ns', '')
+        type_, data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+                "checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint['id'], configurable.get('checkpoint_id'),
+                 type_, data, metadata_type, metadata_data)
+            )
+            self._written()
+        return {
+            'configurable': {
+                'thread_id': thread_id,
+                'checkpoint_ns': checkpoint_ns,
+                'checkpoint_id': checkpoint['id']
+            }
+        }
+    
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                   task_id: str, task_path: str = ""):
+        """
+        노드 쓰기 저장 (다음 체크포인트 전에 완료된 노드의 결과)
+        
+        Args:
+            config: 체크포인트를 가리키는 그래프 설정
+            writes: (채널, 값) 목록
+            task_id: 노드 작업 식별자
+            task_path: 노드 작업 경로
+        """
+        configurable = config['configurable']
+        # 특수 채널(오류, 인터럽트 등)은 덮어쓰고 일반 쓰기는 처음 값을 유지
+        verb = "REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append((
+                configurable['thread_id'],
+                configurable.get('checkpoint_ns', ''),
+                configurable['checkpoint_id'],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                type_,
+                data,
+                task_path
+            ))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR {verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                "task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._written()
+    
+    def delete_thread(self, thread_id: str):
+        """
+        실행 식별자의 체크포인트와 쓰기 전체 삭제
+        
+        Args:
+            thread_id: 실행 식별자
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            self._written()
+    
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """get_tuple의 비동기 버전 (로컬 파일이므로 바로 실행)"""
+        return self.get_tuple(config)
+    
+    async def alist(self, config: Optional[RunnableConfig], *,
+                    filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        """list의 비동기 버전"""
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+    
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        """put의 비동기 버전"""
+        return self.put(config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                          task_id: str, task_path: str = ""):
+        """put_writes의 비동기 버전"""
+        self.put_writes(config, writes, task_id, task_path)
+    
+    async def adelete_thread(self, thread_id: str):
+        """delete_thread의 비동기 버전"""
+        self.delete_thread(thread_id)
+    
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """
+        채널의 다음 버전 (정렬 가능한 문자열)
+        
+        Args:
+            current: 현재 버전
+            channel: 사용하지 않음
+        
+        Returns:
+            다음 버전 문자열
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split('.')[0])
+        return f"{current_v + 1:032}"
+    
+    def flush(self):
+        """모인 쓰기를 즉시 커밋"""
+        with self._lock:
+            self._commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        저장소 통계 반환
+        
+        Returns:
+            threads, checkpoints, pending(커밋 대기 쓰기 수), commits 딕셔너리
+        """
+        with self._lock:
+            threads, checkpoints = self._conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+            return {
+                'threads': threads,
+                'checkpoints': checkpoints,
+                'pending': self._pending,
+                'commits': self.commits
+            }
+    
+    def close(self):
+        """모인 쓰기를 커밋하고 데이터베이스 연결 종료"""
+        with self._lock:
+            self._commit()
+            self._conn.close()
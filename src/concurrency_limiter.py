@@ -0,0 +1,195 @@
+"""
+적응형 동시 요청 제한 모듈
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional
+
+
+class _Waiter:
+    """대기 중인 요청 (스레드 또는 이벤트 루프)"""
+    
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+    
+    def wake(self) -> bool:
+        """
+        대기 해제 (허가를 넘겨받음)
+        
+        Returns:
+            전달 여부 (이벤트 루프가 이미 닫혔으면 False)
+        """
+        if self.loop is None:
+            self.event.set()
+            return True
+        try:
+            self.loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:
+            return False
+        return True
+    
+    def _resolve(self):
+        """대기 완료 (이벤트 루프 스레드에서 실행)"""
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 방식 동시 요청 제한
+    
+    지연 시간이 기준선 안에 머무는 동안에는 한도를 조금씩 늘리고
+    (한도가 찰 때 성공 1건당 1/limit), 오류가 나거나 지연 시간이
+    기준선의 tolerance배를 넘으면 한도에 backoff를 곱해 줄입니다.
+    기준선은 성공한 요청 지연 시간의 느린 EWMA이며, 짧은 분석 요청과 긴
+    답변 요청처럼 지연 시간이 원래 다른 요청을 구분하도록 요청 종류 키마다
+    따로 둡니다. 급증으로 판단한 지연 시간도 spike_alpha만큼 기준선에
+    반영하므로, 지연 시간이 계속 높게 유지되면 기준선이 천천히 따라갑니다.
+    
+    동기 호출(스레드)과 비동기 호출(이벤트 루프)이 같은 한도를 공유하며,
+    허가는 도착 순서대로 넘겨줍니다.
+    """
+    
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1,
+                 max_limit: int = 32, backoff: float = 0.75,
+                 tolerance: float = 2.0, baseline_alpha: float = 0.05,
+                 spike_alpha: float = 0.01):
+        """
+        Args:
+            initial_limit: 초기 동시 요청 한도
+            min_limit: 최소 한도
+            max_limit: 최대 한도
+            backoff: 한도 감소 비율 (0~1)
+            tolerance: 지연 시간 급증으로 판단하는 기준선 배수
+            baseline_alpha: 기준선 EWMA 가중치
+            spike_alpha: 급증으로 판단한 지연 시간의 기준선 EWMA 가중치
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("1 <= min_limit <= max_limit 이어야 합니다.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.baseline_alpha = baseline_alpha
+        self.spike_alpha = spike_alpha
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._baselines: Dict[Hashable, float] = {}
+        self._inflight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._total_wait = 0.0
+        self._acquired = 0
+        self._max_wait = 0.0
+    
+    @property
+    def limit(self) -> int:
+        """현재 동시 요청 한도"""
+        return int(self._limit)
+    
+    def _try_acquire(self, loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_Waiter]:
+        """
+        즉시 허가를 받거나 대기열에 등록 (잠금 안에서 호출)
+        
+        Returns:
+            대기해야 하면 대기 객체, 허가를 받았으면 None
+        """
+        if not self._waiters and self._inflight < self.limit:
+            self._inflight += 1
+            return None
+        waiter = _Waiter(loop)
+        self._waiters.append(waiter)
+        return waiter
+    
+    def _record_wait(self, started: float):
+        """대기 시간 기록"""
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._acquired += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+    
+    def acquire(self):
+        """허가를 받을 때까지 대기 (동기)"""
+        started = time.perf_counter()
+        with self._lock:
+            waiter = self._try_acquire(None)
+        if waiter is not None:
+            waiter.event.wait()
+        self._record_wait(started)
+    
+    async def aacquire(self):
+        """허가를 받을 때까지 대기 (비동기)"""
+        started = time.perf_counter()
+        with self._lock:
+            waiter = self._try_acquire(asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                        raise
+                # 이미 허가를 넘겨받았으면 반납
+                self.release(None, success=None)
+                raise
+        self._record_wait(started)
+    
+    def release(self, latency: Optional[float], success: Optional[bool],
+                key: Hashable = None):
+        """
+        허가 반납 및 한도 조정
+        
+        Args:
+            latency: 요청 소요 시간 (초, 대기 시간 제외)
+            success: 성공 여부 (None이면 취소로 보고 한도를 조정하지 않음)
+            key: 요청 종류 키 (같은 키의 지연 시간끼리 기준선을 공유)
+        """
+        with self._lock:
+            saturated = self._inflight >= self.limit
+            self._inflight -= 1
+            
+            if success is False:
+                self._decrease()
+            elif success and latency is not None:
+                baseline = self._baselines.setdefault(key, latency)
+                if latency > baseline * self.tolerance:
+                    self._decrease()
+                    alpha = self.spike_alpha
+                else:
+                    if saturated:
+                        self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                    alpha = self.baseline_alpha
+                self._baselines[key] = baseline + alpha * (latency - baseline)
+            
+            # 한도 안에서 대기 중인 요청에 허가를 넘겨줌
+            while self._waiters and self._inflight < self.limit:
+                if self._waiters.popleft().wake():
+                    self._inflight += 1
+    
+    def _decrease(self):
+        """한도 감소 (잠금 안에서 호출)"""
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        제한 상태 반환
+        
+        Returns:
+            limit, inflight, queued, avg_wait(초), max_wait(초),
+            baseline_latency(가장 짧은 요청 종류의 기준선, 초), baselines(요청 종류 수) 딕셔너리
+        """
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'inflight': self._inflight,
+                'queued': len(self._waiters),
+                'avg_wait': self._total_wait / self._acquired if self._acquired else 0.0,
+                'max_wait': self._max_wait,
+                'baseline_latency': min(self._baselines.values()) if self._baselines else None,
+                'baselines': len(self._baselines)
+            }
@@ -3,8 +3,28 @@
 """
 import os
 import yaml
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Union
+from dataclasses import dataclass, field
+
+
+# 모델을 따로 지정할 수 있는 워크플로우 단계
+STAGE_NAMES = ('analyze', 'optimize', 'invoke_llm')
+
+# 단계별로 덮어쓸 수 있는 LLM 설정 키
+STAGE_OVERRIDE_KEYS = ('model', 'base_url', 'temperature', 'max_tokens', 'keep_alive', 'client')
+
+# 단계별로 지정할 수 있는 생성 옵션 (optimization.generation)
+GENERATION_STAGES = ('analyze', 'optimize', 'fused')
+GENERATION_KEYS = ('max_tokens', 'num_ctx', 'stop')
+
+
+@dataclass
+class HTTPPoolConfig:
+    """HTTP 연결 풀 설정"""
+    pool_size: int = 10
+    connect_timeout: float = 5.0
+    read_timeout: float = 120.0
+    keepalive_expiry: float = 30.0
 
 
 @dataclass
@@ -12,9 +32,34 @@ class LLMConfig:
     """LLM 설정"""
     provider: str
     model: str
-    base_url: str
+    base_url: Union[str, List[str]]
     temperature: float = 0.7
     max_tokens: int = 2000
+    http: HTTPPoolConfig = field(default_factory=HTTPPoolConfig)
+    lazy: bool = False
+    health_check_ttl: float = 300.0
+    routing: Dict[str, Any] = field(default_factory=dict)
+    concurrency: Dict[str, Any] = field(default_factory=dict)
+    keep_alive: Optional[Union[str, int]] = None
+    warmup: bool = False
+    keep_warm_interval: float = 0.0
+    hedging: Dict[str, Any] = field(default_factory=dict)
+    client: str = 'langchain'
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    
+    def for_stage(self, stage: str) -> Dict[str, Any]:
+        """
+        단계에 적용할 LLM 설정 반환
+        
+        Args:
+            stage: 단계 이름 ('analyze', 'optimize', 'invoke_llm')
+            
+        Returns:
+            STAGE_OVERRIDE_KEYS 설정 딕셔너리 (단계 설정이 없으면 기본값)
+        """
+        settings = {key: getattr(self, key) for key in STAGE_OVERRIDE_KEYS}
+        settings.update(self.stages.get(stage) or {})
+        return settings
 
 
 @dataclass
@@ -22,6 +67,12 @@ class OptimizationConfig:
     """최적화 설정"""
     max_iterations: int = 3
     temperature: float = 0.7
+    memo_size: int = 128
+    generation: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    prefix_reuse: bool = False
+    mode: str = 'staged'
+    parallel: bool = True
+    analysis_format: str = 'text'
 
 
 @dataclass
@@ -29,6 +80,34 @@ class DisplayConfig:
     """디스플레이 설정"""
     show_timestamps: bool = True
     color_output: bool = True
+    streaming: bool = False
+
+
+@dataclass
+class CacheConfig:
+    """LLM 응답 캐시 설정"""
+    enabled: bool = False
+    path: str = ".cache/llm_responses.db"
+    ttl: Optional[float] = 86400
+    max_entries: int = 10000
+    bypass: bool = False
+
+
+@dataclass
+class HistoryConfig:
+    """실행 기록 보관 설정"""
+    capacity: int = 1000
+    spill_path: Optional[str] = None
+    step_spill_path: Optional[str] = None
+
+
+@dataclass
+class CheckpointConfig:
+    """워크플로우 체크포인트 설정"""
+    enabled: bool = False
+    path: str = ".cache/checkpoints.db"
+    commit_every: int = 100
+    commit_interval: float = 1.0
 
 
 class ConfigManager:
@@ -40,10 +119,16 @@ class ConfigManager:
             config_path: 설정 파일 경로 (None이면 기본 설정 사용)
         """
         self.config_path = config_path
+        self.load_error: Optional[str] = None
         self.config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
-        """설정 파일 로드"""
+        """
+        설정 파일 로드
+        
+        파일을 읽거나 검증하지 못하면 load_error에 원인을 기록하고 기본 설정을
+        반환합니다. 오류를 알리고 계속할지는 호출하는 쪽에서 결정합니다.
+        """
         if self.config_path and os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r', encoding='utf-8') as f:
@@ -51,11 +136,10 @@ class ConfigManager:
                     if self.validate_config(config):
                         return config
                     else:
-                        print(f"⚠️  설정 파일 검증 실패. 기본 설정을 사용합니다.")
+                        self.load_error = "설정 파일 검증 실패"
                         return self.get_default_config()
             except Exception as e:
-                print(f"⚠️  설정 파일 로드 실패: {e}")
-                print("기본 설정을 사용합니다.")
+                self.load_error = f"설정 파일 로드 실패: {e}"
                 return self.get_default_config()
         else:
             return self.get_default_config()
@@ -94,6 +178,90 @@ class ConfigManager:
             print(f"   지원 provider: {', '.join(valid_providers)}")
             return False
         
+        # client 값 검증
+        valid_clients = ['langchain', 'direct']
+        if llm_config.get('client', 'langchain') not in valid_clients:
+            print(f"❌ 지원하지 않는 client: {llm_config['client']}")
+            print(f"   지원 client: {', '.join(valid_clients)}")
+            return False
+        
+        # base_url 목록 검증
+        if isinstance(llm_config['base_url'], list) and not llm_config['base_url']:
+            print("❌ base_url 목록이 비어 있습니다.")
+            return False
+        
+        # 단계별 모델 설정 검증
+        stages = llm_config.get('stages') or {}
+        if not isinstance(stages, dict):
+            print("❌ stages는 단계 이름별 설정이어야 합니다.")
+            return False
+        for stage, overrides in stages.items():
+            if stage not in STAGE_NAMES:
+                print(f"❌ 지원하지 않는 단계: {stage}")
+                print(f"   지원 단계: {', '.join(STAGE_NAMES)}")
+                return False
+            overrides = overrides or {}
+            unknown = [key for key in overrides if key not in STAGE_OVERRIDE_KEYS]
+            if unknown:
+                print(f"❌ {stage} 단계에서 지원하지 않는 설정: {', '.join(unknown)}")
+                return False
+            if overrides.get('client', 'langchain') not in valid_clients:
+                print(f"❌ 지원하지 않는 client: {overrides['client']}")
+                return False
+            if isinstance(overrides.get('base_url'), list) and not overrides['base_url']:
+                print(f"❌ {stage} 단계의 base_url 목록이 비어 있습니다.")
+                return False
+        
+        # 최적화 방식 검증
+        valid_modes = ['staged', 'fused']
+        mode = (config.get('optimization') or {}).get('mode', 'staged')
+        if mode not in valid_modes:
+            print(f"❌ 지원하지 않는 최적화 방식: {mode}")
+            print(f"   지원 방식: {', '.join(valid_modes)}")
+            return False
+        
+        # 분석 응답 형식 검증
+        valid_formats = ['text', 'json']
+        analysis_format = (config.get('optimization') or {}).get('analysis_format', 'text')
+        if analysis_format not in valid_formats:
+            print(f"❌ 지원하지 않는 분석 형식: {analysis_format}")
+            print(f"   지원 형식: {', '.join(valid_formats)}")
+            return False
+        
+        # 단계별 생성 옵션 검증
+        generation = (config.get('optimization') or {}).get('generation') or {}
+        if not isinstance(generation, dict):
+            print("❌ optimization.generation은 단계 이름별 설정이어야 합니다.")
+            return False
+        for stage, options in generation.items():
+            if stage not in GENERATION_STAGES:
+                print(f"❌ 생성 옵션을 지원하지 않는 단계: {stage}")
+                print(f"   지원 단계: {', '.join(GENERATION_STAGES)}")
+                return False
+            options = options or {}
+            unknown = [key for key in options if key not in GENERATION_KEYS]
+            if unknown:
+                print(f"❌ {stage} 단계에서 지원하지 않는 생성 옵션: {', '.join(unknown)}")
+                return False
+            stop = options.get('stop')
+            if stop is not None and not (
+                isinstance(stop, list) and all(isinstance(item, str) and item for item in stop)
+            ):
+                print(f"❌ {stage} 단계의 stop은 비어 있지 않은 문자열 목록이어야 합니다.")
+                return False
+        
+        # 실행 기록 보관 설정 검증
+        capacity = (config.get('history') or {}).get('capacity', 1000)
+        if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 0:
+            print("❌ history.capacity는 0 이상의 정수여야 합니다.")
+            return False
+        
+        # 체크포인트 설정 검증
+        commit_every = (config.get('checkpoint') or {}).get('commit_every', 100)
+        if isinstance(commit_every, bool) or not isinstance(commit_every, int) or commit_every < 1:
+            print("❌ checkpoint.commit_every는 1 이상의 정수여야 합니다.")
+            return False
+        
         return True
     
     def get_default_config(self) -> Dict[str, Any]:
@@ -109,27 +277,108 @@ class ConfigManager:
                 'model': 'llama2',
                 'base_url': 'http://localhost:11434',
                 'temperature': 0.7,
-                'max_tokens': 2000
+                'max_tokens': 2000,
+                'http': {
+                    'pool_size': 10,
+                    'connect_timeout': 5.0,
+                    'read_timeout': 120.0,
+                    'keepalive_expiry': 30.0
+                },
+                'lazy': False,
+                'health_check_ttl': 300.0,
+                'routing': {
+                    'ewma_alpha': 0.3,
+                    'max_failures': 3,
+                    'probe_interval': 10.0
+                },
+                'concurrency': {
+                    'initial_limit': 4,
+                    'min_limit': 1,
+                    'max_limit': 32,
+                    'backoff': 0.75,
+                    'tolerance': 2.0
+                },
+                'keep_alive': None,
+                'warmup': False,
+                'keep_warm_interval': 0.0,
+                'hedging': {
+                    'enabled': False,
+                    'percentile': 95.0,
+                    'window': 200,
+                    'min_samples': 20,
+                    'min_delay': 0.05
+                },
+                'client': 'langchain',
+                'stages': {}
             },
             'optimization': {
                 'max_iterations': 3,
-                'temperature': 0.7
+                'temperature': 0.7,
+                'memo_size': 128,
+                'generation': {
+                    'analyze': {'max_tokens': 128, 'stop': ['\n4.', '\n\n\n']},
+                    'optimize': {'max_tokens': 256},
+                    'fused': {'max_tokens': 384, 'stop': ['\n\n\n']}
+                },
+                'prefix_reuse': False,
+                'mode': 'staged',
+                'parallel': True,
+                'analysis_format': 'text'
             },
             'display': {
                 'show_timestamps': True,
-                'color_output': True
+                'color_output': True,
+                'streaming': False
+            },
+            'cache': {
+                'enabled': False,
+                'path': '.cache/llm_responses.db',
+                'ttl': 86400,
+                'max_entries': 10000,
+                'bypass': False
+            },
+            'history': {
+                'capacity': 1000,
+                'spill_path': None,
+                'step_spill_path': None
+            },
+            'checkpoint': {
+                'enabled': False,
+                'path': '.cache/checkpoints.db',
+                'commit_every': 100,
+                'commit_interval': 1.0
             }
         }
     
     def get_llm_config(self) -> LLMConfig:
         """LLM 설정 객체 반환"""
         llm = self.config.get('llm', {})
+        http = llm.get('http', {})
         return LLMConfig(
             provider=llm.get('provider', 'ollama'),
             model=llm.get('model', 'llama2'),
             base_url=llm.get('base_url', 'http://localhost:11434'),
             temperature=llm.get('temperature', 0.7),
-            max_tokens=llm.get('max_tokens', 2000)
+            max_tokens=llm.get('max_tokens', 2000),
+            http=HTTPPoolConfig(
+                pool_size=http.get('pool_size', 10),
+                connect_timeout=http.get('connect_timeout', 5.0),
+                read_timeout=http.get('read_timeout', 120.0),
+                keepalive_expiry=http.get('keepalive_expiry', 30.0)
+            ),
+            lazy=llm.get('lazy', False),
+            health_check_ttl=llm.get('health_check_ttl', 300.0),
+            routing=llm.get('routing', {}) or {},
+            concurrency=llm.get('concurrency', {}) or {},
+            keep_alive=llm.get('keep_alive'),
+            warmup=llm.get('warmup', False),
+            keep_warm_interval=llm.get('keep_warm_interval', 0.0),
+            hedging=llm.get('hedging', {}) or {},
+            client=llm.get('client', 'langchain'),
+            stages={
+                stage: dict(overrides or {})
+                for stage, overrides in (llm.get('stages') or {}).items()
+            }
         )
     
     def get_optimization_config(self) -> OptimizationConfig:
@@ -137,7 +386,16 @@ class ConfigManager:
         opt = self.config.get('optimization', {})
         return OptimizationConfig(
             max_iterations=opt.get('max_iterations', 3),
-            temperature=opt.get('temperature', 0.7)
+            temperature=opt.get('temperature', 0.7),
+            memo_size=opt.get('memo_size', 128),
+            generation={
+                stage: dict(options or {})
+                for stage, options in (opt.get('generation') or {}).items()
+            },
+            prefix_reuse=opt.get('prefix_reuse', False),
+            mode=opt.get('mode', 'staged'),
+            parallel=opt.get('parallel', True),
+            analysis_format=opt.get('analysis_format', 'text')
         )
     
     def get_display_config(self) -> DisplayConfig:
@@ -145,5 +403,36 @@ class ConfigManager:
         disp = self.config.get('display', {})
         return DisplayConfig(
             show_timestamps=disp.get('show_timestamps', True),
-            color_output=disp.get('color_output', True)
+            color_output=disp.get('color_output', True),
+            streaming=disp.get('streaming', False)
+        )
+    
+    def get_cache_config(self) -> CacheConfig:
+        """응답 캐시 설정 객체 반환"""
+        cache = self.config.get('cache', {})
+        return CacheConfig(
+            enabled=cache.get('enabled', False),
+            path=cache.get('path', '.cache/llm_responses.db'),
+            ttl=cache.get('ttl', 86400),
+            max_entries=cache.get('max_entries', 10000),
+            bypass=cache.get('bypass', False)
+        )
+    
+    def get_history_config(self) -> HistoryConfig:
+        """실행 기록 보관 설정 객체 반환"""
+        history = self.config.get('history') or {}
+        return HistoryConfig(
+            capacity=history.get('capacity', 1000),
+            spill_path=history.get('spill_path'),
+            step_spill_path=history.get('step_spill_path')
+        )
+    
+    def get_checkpoint_config(self) -> CheckpointConfig:
+        """워크플로우 체크포인트 설정 객체 반환"""
+        checkpoint = self.config.get('checkpoint') or {}
+        return CheckpointConfig(
+            enabled=checkpoint.get('enabled', False),
+            path=checkpoint.get('path', '.cache/checkpoints.db'),
+            commit_every=checkpoint.get('commit_every', 100),
+            commit_interval=checkpoint.get('commit_interval', 1.0)
         )
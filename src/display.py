@@ -1,6 +1,8 @@
 """
 디스플레이 관리 모듈
 """
+import functools
+import threading
 from datetime import datetime
 from typing import Optional
 from colorama import Fore, Style, init
@@ -10,6 +12,15 @@ from colorama import Fore, Style, init
 init(autoreset=True)
 
 
+def _atomic(method):
+    """출력 메서드를 잠금 안에서 실행 (여러 줄 블록이 다른 스레드의 출력과 섞이지 않도록)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class DisplayManager:
     """최적화 과정 시각화"""
     
@@ -22,6 +33,8 @@ class DisplayManager:
         self.show_timestamps = show_timestamps
         self.color_output = color_output
         self.start_time: Optional[datetime] = None
+        # 병렬 노드나 동시에 실행한 질의가 함께 출력해도 블록 단위로 출력
+        self._lock = threading.RLock()
     
     def _get_timestamp(self) -> str:
         """현재 타임스탬프 반환"""
@@ -46,6 +59,7 @@ class DisplayManager:
         print(self._colorize(header, Fore.CYAN))
         self.start_time = datetime.now()
     
+    @_atomic
     def show_original_query(self, query: str):
         """
         원본 질의 표시
@@ -59,6 +73,7 @@ class DisplayManager:
         print(f"{query}")
         print(self._colorize('='*60, Fore.CYAN))
     
+    @_atomic
     def show_step(self, step_name: str, description: str, timestamp: Optional[str] = None):
         """
         최적화 단계 표시
@@ -74,6 +89,7 @@ class DisplayManager:
         print(self._colorize('─'*60, Fore.BLUE))
         print(f"{description}")
     
+    @_atomic
     def show_analysis_result(self, analysis: dict):
         """
         분석 결과 표시
@@ -85,6 +101,7 @@ class DisplayManager:
         for key, value in analysis.items():
             print(f"  • {key}: {value}")
     
+    @_atomic
     def show_optimized_prompt(self, prompt: str):
         """
         최적화된 프롬프트 표시
@@ -98,6 +115,7 @@ class DisplayManager:
         print(f"{prompt}")
         print(self._colorize('='*60, Fore.GREEN))
     
+    @_atomic
     def show_llm_response(self, response: str, duration: float):
         """
         LLM 응답 표시
@@ -115,6 +133,53 @@ class DisplayManager:
         print(f"{response}")
         print(self._colorize('='*60, Fore.YELLOW))
     
+    @_atomic
+    def show_stream_start(self, title: str):
+        """
+        스트리밍 출력 시작 표시
+        
+        Args:
+            title: 스트리밍 블록 제목
+        """
+        print(f"\n{self._colorize('='*60, Fore.YELLOW)}")
+        print(self._colorize(f"{self._get_timestamp()}{title}", Fore.YELLOW))
+        print(self._colorize('='*60, Fore.YELLOW))
+    
+    @_atomic
+    def show_stream_chunk(self, chunk: str):
+        """
+        스트리밍 청크 즉시 출력
+        
+        Args:
+            chunk: 수신한 텍스트 청크
+        """
+        print(chunk, end='', flush=True)
+    
+    @_atomic
+    def show_stream_end(self, duration: float, metrics: Optional[dict] = None):
+        """
+        스트리밍 출력 종료 및 측정값 표시
+        
+        Args:
+            duration: 전체 소요 시간 (초)
+            metrics: CallMeter 측정값 (ttft, tokens_per_sec, cached, coalesced)
+        """
+        metrics = metrics or {}
+        replayed = metrics.get('cached') or metrics.get('coalesced')
+        parts = [f"소요 시간: {duration:.2f}초"]
+        if metrics.get('cached'):
+            parts.append("캐시 응답")
+        elif metrics.get('coalesced'):
+            parts.append("병합된 응답")
+        elif metrics.get('ttft') is not None:
+            parts.append(f"첫 토큰: {metrics['ttft']:.2f}초")
+        if metrics.get('tokens_per_sec') is not None and not replayed:
+            parts.append(f"{metrics['tokens_per_sec']:.1f} tokens/s")
+        print()
+        print(self._colorize('='*60, Fore.YELLOW))
+        print(self._colorize(f"⏱️  {' | '.join(parts)}", Fore.YELLOW))
+    
+    @_atomic
     def show_error(self, error: Exception, context: str = ""):
         """
         오류 메시지 표시
@@ -131,6 +196,7 @@ class DisplayManager:
         print(f"{type(error).__name__}: {str(error)}")
         print(self._colorize('='*60, Fore.RED))
     
+    @_atomic
     def show_info(self, message: str):
         """
         정보 메시지 표시
@@ -140,6 +206,7 @@ class DisplayManager:
         """
         print(self._colorize(f"{self._get_timestamp()}ℹ️  {message}", Fore.CYAN))
     
+    @_atomic
     def show_warning(self, message: str):
         """
         경고 메시지 표시
@@ -149,6 +216,7 @@ class DisplayManager:
         """
         print(self._colorize(f"{self._get_timestamp()}⚠️  {message}", Fore.YELLOW))
     
+    @_atomic
     def show_success(self, message: str):
         """
         성공 메시지 표시
@@ -158,14 +226,57 @@ class DisplayManager:
         """
         print(self._colorize(f"{self._get_timestamp()}✅ {message}", Fore.GREEN))
     
-    def show_summary(self):
-        """전체 실행 요약 표시"""
+    @_atomic
+    def show_summary(self, cache_stats: Optional[dict] = None,
+                     usage: Optional[dict] = None):
+        """
+        전체 실행 요약 표시
+        
+        Args:
+            cache_stats: 캐시 이름별 통계 딕셔너리 (hits, misses, entries, hit_rate)
+            usage: 세션 LLM 사용량 (UsageLedger.summary() 결과)
+        """
         if self.start_time:
             elapsed = (datetime.now() - self.start_time).total_seconds()
             print(f"\n{self._colorize('='*60, Fore.CYAN)}")
             print(self._colorize(f"⏱️  전체 소요 시간: {elapsed:.2f}초", Fore.CYAN))
+            for name, stats in (cache_stats or {}).items():
+                print(self._colorize(
+                    f"💾 {name}: 적중 {stats['hits']} / 미스 {stats['misses']} "
+                    f"(적중률 {stats['hit_rate']:.0%}, 항목 {stats['entries']}개)",
+                    Fore.CYAN
+                ))
+            if usage and usage.get('calls'):
+                self._show_usage(usage)
             print(self._colorize('='*60, Fore.CYAN))
     
+    def _show_usage(self, usage: dict):
+        """
+        세션 LLM 사용량 표시 (모델 로드 / 프롬프트 처리 / 생성 구간)
+        
+        Args:
+            usage: UsageLedger.summary() 결과
+        """
+        print(self._colorize(
+            f"📊 LLM 호출: {usage['calls']}회 (캐시/병합 {usage['replayed_calls']}회)",
+            Fore.CYAN
+        ))
+        prefill = f"  • 프롬프트 처리: {usage['prompt_eval_count']} 토큰"
+        if usage['prompt_eval_duration']:
+            prefill += f", {usage['prompt_eval_duration']:.2f}초"
+        if usage.get('prefill_tps') is not None:
+            prefill += f" ({usage['prefill_tps']:.1f} tokens/s)"
+        decode = f"  • 생성: {usage['eval_count']} 토큰"
+        if usage['eval_duration']:
+            decode += f", {usage['eval_duration']:.2f}초"
+        if usage.get('decode_tps') is not None:
+            decode += f" ({usage['decode_tps']:.1f} tokens/s)"
+        print(self._colorize(prefill, Fore.CYAN))
+        print(self._colorize(decode, Fore.CYAN))
+        if usage['load_duration']:
+            print(self._colorize(f"  • 모델 로드: {usage['load_duration']:.2f}초", Fore.CYAN))
+    
+    @_atomic
     def show_provider_info(self, provider_info: dict):
         """
         LLM 제공자 정보 표시
@@ -177,4 +288,11 @@ class DisplayManager:
         print(f"  • Provider: {provider_info.get('provider', 'N/A')}")
         print(f"  • Model: {provider_info.get('model', 'N/A')}")
         print(f"  • Base URL: {provider_info.get('base_url', 'N/A')}")
+        if provider_info.get('client', 'langchain') != 'langchain':
+            print(f"  • Client: {provider_info['client']}")
+        endpoints = provider_info.get('endpoints') or []
+        if len(endpoints) > 1:
+            print(f"  • Endpoints: {', '.join(endpoints)}")
+        for stage, model in (provider_info.get('stages') or {}).items():
+            print(f"  • Stage {stage}: {model}")
         print(f"  • Temperature: {provider_info.get('temperature', 'N/A')}")
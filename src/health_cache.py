@@ -0,0 +1,109 @@
+"""
+LLM 서비스 health check 결과 캐시 모듈
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "langchain-prompt-optimizer", "health.json"
+)
+
+
+class HealthCache:
+    """
+    health check 성공 결과 캐시
+    
+    성공한 검사 시각을 메모리와 작은 상태 파일에 함께 기록하여,
+    TTL 안에서는 같은 프로세스뿐 아니라 다음 CLI 실행에서도 네트워크 검사를 건너뜁니다.
+    실패한 결과는 캐시하지 않습니다.
+    """
+    
+    def __init__(self, ttl: float = 300.0, state_path: Optional[str] = DEFAULT_STATE_PATH):
+        """
+        Args:
+            ttl: 검사 결과 유효 시간 (초, 0이면 캐시 사용 안 함)
+            state_path: 상태 파일 경로 (None이면 메모리에만 저장)
+        """
+        self.ttl = ttl
+        self.state_path = state_path
+        self._checked: Dict[str, float] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        """상태 파일 로드 (최초 1회)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for url, checked_at in data.items():
+                self._checked.setdefault(url, float(checked_at))
+        except (OSError, ValueError, AttributeError):
+            # 손상된 상태 파일은 무시하고 다시 검사
+            pass
+    
+    def _save(self):
+        """상태 파일 저장 (실패해도 무시)"""
+        if not self.state_path:
+            return
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._checked, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+    
+    def is_fresh(self, url: str) -> bool:
+        """
+        TTL 안에 성공한 검사 결과가 있는지 확인
+        
+        Args:
+            url: 검사 대상 URL
+        
+        Returns:
+            캐시된 성공 결과가 유효한지 여부
+        """
+        if self.ttl <= 0:
+            return False
+        with self._lock:
+            self._load()
+            checked_at = self._checked.get(url)
+        return checked_at is not None and time.time() - checked_at <= self.ttl
+    
+    def mark_healthy(self, url: str):
+        """
+        검사 성공 기록
+        
+        Args:
+            url: 검사 대상 URL
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._load()
+            self._checked[url] = time.time()
+            self._save()
+    
+    def invalidate(self, url: str):
+        """
+        검사 결과 무효화 (호출 실패 시)
+        
+        Args:
+            url: 검사 대상 URL
+        """
+        with self._lock:
+            self._load()
+            if self._checked.pop(url, None) is not None:
+                self._save()
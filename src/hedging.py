@@ -0,0 +1,103 @@
+"""
+헤지(hedged) 요청 정책 모듈
+"""
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional
+
+
+class HedgePolicy:
+    """
+    지연 시간 백분위 기반 헤지 요청 정책
+    
+    최근 성공한 요청의 지연 시간을 기록해 두고, 요청이 그 백분위 값을
+    넘도록 끝나지 않으면 다른 백엔드로 같은 요청을 한 번 더 보내도록
+    대기 시간을 알려줍니다. 표본이 부족하면 헤지하지 않습니다.
+    
+    짧은 분석 요청과 긴 답변 요청이 섞이면 백분위 값이 긴 요청에 맞춰지므로,
+    표본은 요청 종류 키마다 따로 기록합니다.
+    """
+    
+    def __init__(self, percentile: float = 95.0, window: int = 200,
+                 min_samples: int = 20, min_delay: float = 0.05):
+        """
+        Args:
+            percentile: 헤지 기준 백분위 (0~100)
+            window: 요청 종류별로 기록할 최근 지연 시간 수
+            min_samples: 헤지를 시작하는 최소 표본 수 (요청 종류별)
+            min_delay: 최소 헤지 대기 시간 (초)
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile은 0보다 크고 100 이하여야 합니다.")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self._samples: Dict[Hashable, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    def record(self, latency: float, key: Hashable = None):
+        """
+        성공한 요청의 지연 시간 기록
+        
+        Args:
+            latency: 요청 소요 시간 (초)
+            key: 요청 종류 키
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency)
+    
+    def delay(self, key: Hashable = None) -> Optional[float]:
+        """
+        헤지 요청을 보내기까지 기다릴 시간
+        
+        Args:
+            key: 요청 종류 키
+        
+        Returns:
+            대기 시간 (초, 해당 요청 종류의 표본이 부족하면 None)
+        """
+        with self._lock:
+            samples = self._samples.get(key, ())
+            if len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+    
+    def record_hedge(self, won: bool):
+        """
+        헤지 요청 결과 기록
+        
+        Args:
+            won: 헤지 요청이 먼저 끝났는지 여부
+        """
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedge_wins += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        헤지 통계 반환
+        
+        Returns:
+            samples(전체 표본 수), delay(요청 종류별 대기 시간 중 가장 짧은 값, 초),
+            hedged, hedge_wins 딕셔너리
+        """
+        with self._lock:
+            keys = list(self._samples)
+        delays = [d for d in (self.delay(key) for key in keys) if d is not None]
+        with self._lock:
+            return {
+                'samples': sum(len(samples) for samples in self._samples.values()),
+                'delay': min(delays) if delays else None,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins
+            }
@@ -0,0 +1,207 @@
+"""
+실행 기록 저장소 모듈
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, TextIO
+
+# monotonic 시각을 벽시계 시각으로 바꾸는 기준 (프로세스마다 한 번 계산)
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def monotonic_ns() -> int:
+    """기록용 시각 (단조 증가 정수, 나노초)"""
+    return time.monotonic_ns()
+
+
+def to_datetime(timestamp: int) -> datetime:
+    """
+    기록 시각을 벽시계 시각으로 변환
+    
+    Args:
+        timestamp: monotonic_ns()로 얻은 시각
+    
+    Returns:
+        datetime
+    """
+    return datetime.fromtimestamp((timestamp + _WALL_OFFSET_NS) / 1e9)
+
+
+def wall_time_ns() -> int:
+    """저장했다가 다른 프로세스에서 읽을 시각 (벽시계 정수, 나노초)"""
+    return time.time_ns()
+
+
+def wall_to_datetime(timestamp: int) -> datetime:
+    """
+    wall_time_ns() 시각을 datetime으로 변환
+    
+    Args:
+        timestamp: wall_time_ns()로 얻은 시각
+    
+    Returns:
+        datetime
+    """
+    return datetime.fromtimestamp(timestamp / 1e9)
+
+
+class HistoryRecord:
+    """
+    워크플로우 단계 기록
+    
+    상태 전체를 복사하는 대신 노드가 만든 값만 보관합니다. 질의 문자열은
+    상태의 객체를 그대로 참조하므로 단계마다 복사되지 않습니다.
+    """
+    
+    __slots__ = ('run_id', 'query', 'node', 'timestamp', 'duration', 'output')
+    
+    def __init__(self, run_id: Optional[str], query: str, node: str,
+                 timestamp: int, duration: float, output: Any = None):
+        """
+        Args:
+            run_id: 실행 식별자
+            query: 원본 질의
+            node: 노드 이름
+            timestamp: 완료 시각 (monotonic_ns)
+            duration: 소요 시간 (초)
+            output: 노드 결과 (분석 결과, 최적화된 프롬프트, LLM 응답 등)
+        """
+        self.run_id = run_id
+        self.query = query
+        self.node = node
+        self.timestamp = timestamp
+        self.duration = duration
+        self.output = output
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """기록을 딕셔너리로 변환 (시각은 ISO 문자열 포함)"""
+        return {
+            'run_id': self.run_id,
+            'query': self.query,
+            'node': self.node,
+            'timestamp': self.timestamp,
+            'time': to_datetime(self.timestamp).isoformat(),
+            'duration': self.duration,
+            'output': self.output
+        }
+    
+    def __repr__(self) -> str:
+        return f"HistoryRecord(run_id={self.run_id!r}, node={self.node!r}, query={self.query!r})"
+
+
+class HistoryStore:
+    """
+    용량이 정해진 실행 기록 저장소 (링 버퍼)
+    
+    용량을 넘으면 가장 오래된 기록을 버리고, spill_path가 있으면 버린 기록을
+    JSON Lines 파일에 이어 씁니다. 기록은 as_dict()가 있으면 그 결과를 저장합니다.
+    여러 스레드에서 함께 사용할 수 있습니다.
+    """
+    
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        """
+        Args:
+            capacity: 메모리에 보관할 최대 기록 수 (0이면 보관하지 않음)
+            spill_path: 밀려난 기록을 저장할 JSON Lines 파일 경로 (None이면 버림)
+        """
+        if capacity < 0:
+            raise ValueError("capacity는 0 이상이어야 합니다.")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._records: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._spill_file: Optional[TextIO] = None
+        self.evicted = 0
+        self.spilled = 0
+    
+    def append(self, record: Any):
+        """
+        기록 추가 (용량을 넘으면 가장 오래된 기록을 밀어냄)
+        
+        Args:
+            record: 추가할 기록
+        """
+        with self._lock:
+            self._append(record)
+    
+    def extend(self, records: Iterable[Any]):
+        """
+        여러 기록을 순서대로 추가 (다른 스레드의 기록과 섞이지 않음)
+        
+        Args:
+            records: 추가할 기록 목록
+        """
+        with self._lock:
+            for record in records:
+                self._append(record)
+    
+    def _append(self, record: Any):
+        """기록 추가 (잠금 안에서 호출)"""
+        self._records.append(record)
+        while len(self._records) > self.capacity:
+            self._evict(self._records.popleft())
+    
+    def _evict(self, record: Any):
+        """밀려난 기록 처리 (잠금 안에서 호출)"""
+        self.evicted += 1
+        if self.spill_path is None:
+            return
+        if self._spill_file is None:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+        data = record.as_dict() if hasattr(record, 'as_dict') else record
+        self._spill_file.write(json.dumps(data, ensure_ascii=False, default=str) + '\n')
+        self.spilled += 1
+    
+    def records(self) -> List[Any]:
+        """
+        메모리에 있는 기록 목록 (오래된 순, 사본)
+        
+        Returns:
+            기록 리스트
+        """
+        with self._lock:
+            return list(self._records)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+    
+    def clear(self):
+        """메모리의 기록 삭제 (이미 저장한 파일은 유지)"""
+        with self._lock:
+            self._records.clear()
+    
+    def flush(self):
+        """저장 파일 버퍼 비우기"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+    
+    def close(self):
+        """저장 파일 닫기"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        저장소 통계 반환
+        
+        Returns:
+            entries, capacity, evicted, spilled 딕셔너리
+        """
+        with self._lock:
+            return {
+                'entries': len(self._records),
+                'capacity': self.capacity,
+                'evicted': self.evicted,
+                'spilled': self.spilled
+            }
@@ -0,0 +1,165 @@
+"""
+HTTP 연결 풀 관리 모듈
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+
+class HTTPConnectionPool:
+    """
+    LLM 서비스용 keep-alive HTTP 연결 풀
+    
+    동기 클라이언트는 모든 스레드가 공유하고, 비동기 클라이언트는
+    이벤트 루프마다 하나씩 생성합니다 (httpx 연결은 생성된 루프에 묶임).
+    
+    비동기 클라이언트마다 루프에 종료 대기 태스크를 두어, asyncio.run처럼 루프를
+    닫기 전에 남은 태스크를 취소하면 그 루프 안에서 클라이언트를 aclose합니다.
+    닫힌 루프에서는 연결을 닫을 수 없기 때문입니다.
+    """
+    
+    def __init__(self, pool_size: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 120.0, keepalive_expiry: float = 30.0):
+        """
+        Args:
+            pool_size: 호스트당 최대 연결 수
+            connect_timeout: 연결 타임아웃 (초)
+            read_timeout: 응답 읽기 타임아웃 (초)
+            keepalive_expiry: 유휴 연결 유지 시간 (초)
+        """
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_expiry = keepalive_expiry
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: Dict[
+            int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, asyncio.Task]
+        ] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def limits(self) -> httpx.Limits:
+        """연결 풀 제한"""
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_expiry
+        )
+    
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """요청 타임아웃"""
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+    
+    @property
+    def client(self) -> httpx.Client:
+        """공유 동기 클라이언트 (최초 사용 시 생성)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+        return self._client
+    
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프용 비동기 클라이언트 (최초 사용 시 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # 닫힌 루프의 클라이언트는 재사용할 수 없으므로 정리 (종료 대기 태스크가 이미 닫음)
+            for key in [k for k, entry in self._async_clients.items() if entry[0].is_closed()]:
+                del self._async_clients[key]
+            
+            entry = self._async_clients.get(id(loop))
+            if entry is None or entry[0] is not loop or entry[1].is_closed:
+                client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                entry = (loop, client, loop.create_task(self._close_with_loop(client)))
+                self._async_clients[id(loop)] = entry
+            return entry[1]
+    
+    @staticmethod
+    async def _close_with_loop(client: httpx.AsyncClient):
+        """루프가 끝나며 태스크가 취소될 때까지 기다렸다가 클라이언트 종료"""
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await client.aclose()
+    
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        GET 요청
+        
+        Args:
+            url: 요청 URL
+            **kwargs: httpx 요청 옵션
+        
+        Returns:
+            응답 객체
+        """
+        return self.client.get(url, **kwargs)
+    
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        POST 요청
+        
+        Args:
+            url: 요청 URL
+            **kwargs: httpx 요청 옵션
+        
+        Returns:
+            응답 객체
+        """
+        return self.client.post(url, **kwargs)
+    
+    async def aget(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        비동기 GET 요청
+        
+        Args:
+            url: 요청 URL
+            **kwargs: httpx 요청 옵션
+        
+        Returns:
+            응답 객체
+        """
+        return await self.async_client.get(url, **kwargs)
+    
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        비동기 POST 요청
+        
+        Args:
+            url: 요청 URL
+            **kwargs: httpx 요청 옵션
+        
+        Returns:
+            응답 객체
+        """
+        return await self.async_client.post(url, **kwargs)
+    
+    def close(self):
+        """동기 클라이언트 종료 및 실행 중인 루프의 비동기 클라이언트 종료 요청"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            entries = list(self._async_clients.values())
+            self._async_clients.clear()
+        for loop, _, closer in entries:
+            try:
+                loop.call_soon_threadsafe(closer.cancel)
+            except RuntimeError:
+                # 이미 닫힌 루프 (종료 대기 태스크가 닫았거나 닫을 수 없음)
+                pass
+    
+    async def aclose(self):
+        """현재 이벤트 루프의 비동기 클라이언트 종료"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.pop(id(loop), None)
+        if entry is not None:
+            entry[2].cancel()
+            await asyncio.gather(entry[2], return_exceptions=True)
+            # 시작하기 전에 취소된 태스크는 finally를 실행하지 않음
+            await entry[1].aclose()
@@ -1,8 +1,17 @@
 """
 LLM Provider 관리 모듈
 """
-import requests
-from typing import Optional, Any
+import asyncio
+import json
+import threading
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import Generation, LLMResult
+from langchain_core.runnables import RunnableLambda
+from contextlib import contextmanager, asynccontextmanager
+from typing import Optional, Any, Callable, Dict, Hashable, Iterator, AsyncIterator, List, Tuple, Union
 
 try:
     from langchain_ollama import OllamaLLM
@@ -11,102 +20,853 @@ except ImportError:
     from langchain_community.llms import Ollama
     OLLAMA_NEW_API = False
 
+try:
+    from .http_pool import HTTPConnectionPool
+    from .health_cache import HealthCache
+    from .backend_pool import Backend, BackendPool
+    from .single_flight import SingleFlight
+    from .concurrency_limiter import AdaptiveLimiter
+    from .hedging import HedgePolicy
+except ImportError:
+    from http_pool import HTTPConnectionPool
+    from health_cache import HealthCache
+    from backend_pool import Backend, BackendPool
+    from single_flight import SingleFlight
+    from concurrency_limiter import AdaptiveLimiter
+    from hedging import HedgePolicy
+
 
 class LLMConnectionError(Exception):
     """LLM 연결 오류"""
     pass
 
 
+class CallMeter:
+    """
+    단일 LLM 호출 측정
+    
+    스트리밍 호출에서는 토큰 콜백을 전달받아 청크마다 호출하고,
+    첫 토큰까지의 시간(TTFT)과 초당 토큰 수를 기록합니다.
+    """
+    
+    def __init__(self, on_token: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_token: 스트리밍 청크를 받을 콜백 (None이면 스트리밍하지 않음)
+        """
+        self.on_token = on_token
+        self.start_time: Optional[float] = None
+        self.first_token_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.token_count = 0
+        self.cached = False
+        self.coalesced = False
+        self.usage: Dict[str, Any] = {}
+        self.context: Optional[List[int]] = None
+    
+    @property
+    def streaming(self) -> bool:
+        """스트리밍 여부"""
+        return self.on_token is not None
+    
+    def start(self):
+        """측정 시작 (재시도 시 초기화)"""
+        self.start_time = time.perf_counter()
+        self.first_token_time = None
+        self.end_time = None
+        self.token_count = 0
+        self.cached = False
+        self.coalesced = False
+        self.usage = {}
+        self.context = None
+    
+    def record_token(self, chunk: str):
+        """
+        스트리밍 청크 기록
+        
+        Args:
+            chunk: 수신한 텍스트 청크
+        """
+        if not chunk:
+            return
+        if self.first_token_time is None:
+            self.first_token_time = time.perf_counter()
+        self.token_count += 1
+        if self.on_token is not None:
+            self.on_token(chunk)
+    
+    def record_usage(self, usage: Dict[str, Any]):
+        """
+        백엔드가 보고한 사용량 기록
+        
+        Args:
+            usage: 토큰 수와 단계별 소요 시간 딕셔너리 (USAGE_FIELDS 키)
+        """
+        self.usage.update(usage)
+    
+    def record_context(self, context: List[int]):
+        """
+        백엔드가 돌려준 생성 컨텍스트 기록 (Ollama, 다음 호출에서 prefill 재사용)
+        
+        Args:
+            context: 프롬프트와 응답의 토큰 ID 목록
+        """
+        self.context = list(context)
+    
+    def finish(self):
+        """측정 종료"""
+        self.end_time = time.perf_counter()
+    
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """
+        측정 결과 반환
+        
+        Returns:
+            ttft(초), tokens_per_sec, cached, coalesced, usage 딕셔너리 (측정할 수 없는 값은 None)
+        """
+        ttft = None
+        tokens_per_sec = None
+        if self.start_time is not None and self.first_token_time is not None:
+            ttft = self.first_token_time - self.start_time
+            if self.end_time is not None and self.end_time > self.first_token_time:
+                tokens_per_sec = self.token_count / (self.end_time - self.first_token_time)
+        return {
+            'ttft': ttft,
+            'tokens_per_sec': tokens_per_sec,
+            'cached': self.cached,
+            'coalesced': self.coalesced,
+            'usage': dict(self.usage) or None
+        }
+
+
+# 백엔드 사용량 필드 (토큰 수와 초 단위 소요 시간)
+USAGE_FIELDS = (
+    'load_duration',
+    'prompt_eval_count',
+    'prompt_eval_duration',
+    'eval_count',
+    'eval_duration',
+    'total_duration',
+)
+
+
+def _extract_usage(result: LLMResult) -> Dict[str, Any]:
+    """
+    LLM 실행 결과에서 백엔드 사용량 추출
+    
+    Ollama는 generation_info에 나노초 단위 시간과 토큰 수를,
+    OpenAI 호환 API(LM Studio)는 llm_output['token_usage']에 토큰 수를 보고합니다.
+    
+    Args:
+        result: LLM 실행 결과
+        
+    Returns:
+        USAGE_FIELDS 키를 가진 딕셔너리 (보고되지 않은 값은 제외)
+    """
+    usage: Dict[str, Any] = {}
+    for generations in result.generations:
+        for generation in generations:
+            info = generation.generation_info or {}
+            for key in USAGE_FIELDS:
+                value = info.get(key)
+                if value is None:
+                    continue
+                if key.endswith('_duration'):
+                    usage[key] = usage.get(key, 0.0) + value / 1e9
+                else:
+                    usage[key] = usage.get(key, 0) + int(value)
+    
+    token_usage = (result.llm_output or {}).get('token_usage') or {}
+    if token_usage.get('prompt_tokens') is not None:
+        usage['prompt_eval_count'] = token_usage['prompt_tokens']
+    if token_usage.get('completion_tokens') is not None:
+        usage['eval_count'] = token_usage['completion_tokens']
+    return usage
+
+
+class _UsageHandler(BaseCallbackHandler):
+    """LLM 실행이 끝나면 백엔드 사용량을 CallMeter에 기록"""
+    
+    run_inline = True
+    
+    def __init__(self, meter: CallMeter):
+        self.meter = meter
+    
+    def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        self.meter.record_usage(_extract_usage(response))
+        for generations in response.generations:
+            for generation in generations:
+                context = (generation.generation_info or {}).get('context')
+                if context:
+                    self.meter.record_context(context)
+
+
+class UsageLedger:
+    """세션 단위 LLM 사용량 집계"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.replayed_calls = 0
+        self.totals: Dict[str, float] = {key: 0 for key in USAGE_FIELDS}
+    
+    def record(self, meter: CallMeter):
+        """
+        호출 한 건 기록
+        
+        Args:
+            meter: 완료된 호출의 측정 객체
+        """
+        with self._lock:
+            self.calls += 1
+            if meter.cached or meter.coalesced:
+                # 캐시/병합 응답은 백엔드 사용량이 없음
+                self.replayed_calls += 1
+                return
+            for key, value in meter.usage.items():
+                if key in self.totals:
+                    self.totals[key] += value
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        집계 결과 반환
+        
+        Returns:
+            calls, replayed_calls, USAGE_FIELDS 합계,
+            prefill_tps, decode_tps(초당 토큰 수, 측정값이 없으면 None) 딕셔너리
+        """
+        with self._lock:
+            totals = dict(self.totals)
+            calls, replayed = self.calls, self.replayed_calls
+        
+        def rate(count_key: str, duration_key: str) -> Optional[float]:
+            if totals[duration_key] > 0:
+                return totals[count_key] / totals[duration_key]
+            return None
+        
+        return {
+            'calls': calls,
+            'replayed_calls': replayed,
+            **totals,
+            'prefill_tps': rate('prompt_eval_count', 'prompt_eval_duration'),
+            'decode_tps': rate('eval_count', 'eval_duration')
+        }
+
+
+class DirectHTTPLLM:
+    """
+    LangChain LLM 래퍼 없이 HTTP API를 직접 호출하는 LLM
+    
+    Ollama는 /api/generate, LM Studio는 OpenAI 호환 /v1/completions를 공유 연결 풀로
+    호출합니다. 요청 파라미터는 LangChain 래퍼와 같게 보내므로 같은 응답을 받으며,
+    invoke/ainvoke/stream/astream과 config의 callbacks(on_llm_end)를 지원합니다.
+    """
+    
+    def __init__(self, provider: str, model: str, base_url: str,
+                 http_pool: HTTPConnectionPool, temperature: float = 0.7,
+                 max_tokens: int = 2000, keep_alive: Optional[Union[str, int]] = None):
+        """
+        Args:
+            provider: LLM 제공자 ('ollama' 또는 'lmstudio')
+            model: 모델 이름
+            base_url: LLM 서비스 URL
+            http_pool: 공유 HTTP 연결 풀
+            temperature: 생성 temperature
+            max_tokens: 최대 토큰 수
+            keep_alive: Ollama 모델 메모리 유지 시간
+        """
+        if provider not in ('ollama', 'lmstudio'):
+            raise ValueError(f"지원하지 않는 provider: {provider}")
+        self.provider = provider
+        self.model = model
+        self.base_url = base_url
+        self.http_pool = http_pool
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.keep_alive = keep_alive
+    
+    def _request(self, prompt: str, stream: bool,
+                 options: Optional[Dict[str, Any]] = None,
+                 max_tokens: Optional[int] = None,
+                 stop: Optional[List[str]] = None,
+                 context: Optional[List[int]] = None,
+                 format: Optional[Union[str, Dict[str, Any]]] = None,
+                 extra_body: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        요청 URL과 본문 생성
+        
+        호출별 생성 옵션은 LangChain 래퍼와 같은 인자로 받습니다.
+        
+        Args:
+            prompt: 입력 프롬프트
+            stream: 스트리밍 여부
+            options: Ollama options (num_predict, num_ctx, stop 등, 기본값에 덮어씀)
+            max_tokens: 최대 토큰 수 (OpenAI 호환)
+            stop: 중단 시퀀스 (OpenAI 호환)
+            context: 이전 응답의 생성 컨텍스트 (Ollama, 프롬프트 앞에 이어 붙임)
+            format: 출력 형식 ('json' 또는 JSON 스키마, Ollama)
+            extra_body: 본문에 추가할 필드 (OpenAI 호환, 예: response_format)
+            
+        Returns:
+            (URL, JSON 본문)
+        """
+        if self.provider == 'ollama':
+            payload: Dict[str, Any] = {
+                'model': self.model,
+                'prompt': prompt,
+                'stream': stream,
+                'options': {
+                    'temperature': self.temperature,
+                    'num_predict': self.max_tokens,
+                    **(options or {}),
+                },
+            }
+            if self.keep_alive is not None:
+                payload['keep_alive'] = self.keep_alive
+            if context:
+                payload['context'] = list(context)
+            if format:
+                payload['format'] = format
+            return f"{self.base_url}/api/generate", payload
+        
+        # LangChain OpenAI 래퍼의 기본 파라미터와 동일
+        payload = {
+            'model': self.model,
+            'prompt': prompt,
+            'stream': stream,
+            'temperature': self.temperature,
+            'max_tokens': max_tokens or self.max_tokens,
+            'top_p': 1,
+            'frequency_penalty': 0,
+            'presence_penalty': 0,
+            'n': 1,
+            'logit_bias': {},
+        }
+        if stop:
+            payload['stop'] = list(stop)
+        payload.update(extra_body or {})
+        return f"{self.base_url}/v1/completions", payload
+    
+    def _check(self, response: httpx.Response):
+        """
+        오류 응답 확인
+        
+        Raises:
+            ValueError: 서비스가 오류를 반환한 경우
+        """
+        if response.status_code != 200:
+            raise ValueError(
+                f"{self.provider} 호출 실패 (status {response.status_code}): {response.text}"
+            )
+    
+    def _parse_chunk(self, line: str) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+        """
+        스트리밍 응답 한 줄 해석
+        
+        Args:
+            line: NDJSON(Ollama) 또는 SSE(OpenAI 호환) 한 줄
+            
+        Returns:
+            (텍스트, 완료 시 사용량 정보, 완료 여부)
+        """
+        if self.provider == 'ollama':
+            data = json.loads(line)
+            if 'error' in data:
+                raise ValueError(f"ollama 호출 실패: {data['error']}")
+            done = bool(data.get('done'))
+            return data.get('response', ''), (data if done else None), done
+        
+        if not line.startswith('data:'):
+            return '', None, False
+        body = line[len('data:'):].strip()
+        if body == '[DONE]':
+            return '', None, True
+        data = json.loads(body)
+        choice = (data.get('choices') or [{}])[0]
+        return choice.get('text') or '', None, False
+    
+    def _result(self, text: str, data: Optional[Dict[str, Any]]) -> LLMResult:
+        """응답 본문을 LangChain 실행 결과 형식으로 변환 (사용량 콜백용)"""
+        data = data or {}
+        if self.provider == 'ollama':
+            return LLMResult(generations=[[Generation(text=text, generation_info=data)]])
+        return LLMResult(
+            generations=[[Generation(text=text)]],
+            llm_output={'token_usage': data.get('usage') or {}}
+        )
+    
+    def _notify(self, config: Optional[Dict[str, Any]], result: LLMResult):
+        """config의 콜백에 실행 종료 전달"""
+        for handler in (config or {}).get('callbacks') or []:
+            handler.on_llm_end(result)
+    
+    def _text(self, data: Dict[str, Any]) -> str:
+        """비스트리밍 응답 본문에서 텍스트 추출"""
+        if self.provider == 'ollama':
+            return data.get('response', '')
+        return (data.get('choices') or [{}])[0].get('text') or ''
+    
+    def invoke(self, prompt: str, config: Optional[Dict[str, Any]] = None,
+               **kwargs: Any) -> str:
+        """
+        생성 요청
+        
+        Args:
+            prompt: 입력 프롬프트
+            config: 실행 설정 (callbacks)
+            **kwargs: 호출별 생성 옵션 (_request 참고)
+            
+        Returns:
+            생성된 텍스트
+        """
+        url, payload = self._request(prompt, stream=False, **kwargs)
+        response = self.http_pool.post(url, json=payload)
+        self._check(response)
+        data = response.json()
+        text = self._text(data)
+        self._notify(config, self._result(text, data))
+        return text
+    
+    async def ainvoke(self, prompt: str, config: Optional[Dict[str, Any]] = None,
+                      **kwargs: Any) -> str:
+        """
+        생성 요청 (비동기)
+        
+        Args:
+            prompt: 입력 프롬프트
+            config: 실행 설정 (callbacks)
+            **kwargs: 호출별 생성 옵션 (_request 참고)
+            
+        Returns:
+            생성된 텍스트
+        """
+        url, payload = self._request(prompt, stream=False, **kwargs)
+        response = await self.http_pool.apost(url, json=payload)
+        self._check(response)
+        data = response.json()
+        text = self._text(data)
+        self._notify(config, self._result(text, data))
+        return text
+    
+    def stream(self, prompt: str, config: Optional[Dict[str, Any]] = None,
+               **kwargs: Any) -> Iterator[str]:
+        """
+        스트리밍 생성 요청
+        
+        Args:
+            prompt: 입력 프롬프트
+            config: 실행 설정 (callbacks)
+            **kwargs: 호출별 생성 옵션 (_request 참고)
+            
+        Yields:
+            텍스트 청크
+        """
+        url, payload = self._request(prompt, stream=True, **kwargs)
+        chunks = []
+        final = None
+        with self.http_pool.client.stream('POST', url, json=payload) as response:
+            if response.status_code != 200:
+                response.read()
+                self._check(response)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                text, info, done = self._parse_chunk(line)
+                final = info or final
+                if text:
+                    chunks.append(text)
+                    yield text
+                if done:
+                    break
+        self._notify(config, self._result(''.join(chunks), final))
+    
+    async def astream(self, prompt: str, config: Optional[Dict[str, Any]] = None,
+                      **kwargs: Any) -> AsyncIterator[str]:
+        """
+        스트리밍 생성 요청 (비동기)
+        
+        Args:
+            prompt: 입력 프롬프트
+            config: 실행 설정 (callbacks)
+            **kwargs: 호출별 생성 옵션 (_request 참고)
+            
+        Yields:
+            텍스트 청크
+        """
+        url, payload = self._request(prompt, stream=True, **kwargs)
+        chunks = []
+        final = None
+        async with self.http_pool.async_client.stream('POST', url, json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                self._check(response)
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                text, info, done = self._parse_chunk(line)
+                final = info or final
+                if text:
+                    chunks.append(text)
+                    yield text
+                if done:
+                    break
+        self._notify(config, self._result(''.join(chunks), final))
+
+
 class LLMProviderManager:
     """로컬 LLM 제공자 관리"""
     
-    def __init__(self, provider: str, model: str, base_url: str, 
-                 temperature: float = 0.7, max_tokens: int = 2000):
+    def __init__(self, provider: str, model: str, base_url: Union[str, List[str]], 
+                 temperature: float = 0.7, max_tokens: int = 2000,
+                 cache: Optional[Any] = None,
+                 http_pool: Optional[HTTPConnectionPool] = None,
+                 lazy: bool = False,
+                 health_cache: Optional[HealthCache] = None,
+                 routing: Optional[Dict[str, Any]] = None,
+                 concurrency: Optional[Dict[str, Any]] = None,
+                 keep_alive: Optional[Union[str, int]] = None,
+                 hedging: Optional[Dict[str, Any]] = None,
+                 client: str = 'langchain',
+                 usage_ledger: Optional[UsageLedger] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Args:
             provider: LLM 제공자 ('ollama' 또는 'lmstudio')
             model: 모델 이름
-            base_url: LLM 서비스 URL
+            base_url: LLM 서비스 URL (여러 개면 백엔드 풀로 분산)
             temperature: 생성 temperature
             max_tokens: 최대 토큰 수
+            cache: ResponseCache 인스턴스 (None이면 캐시 사용 안 함)
+            http_pool: 공유 HTTP 연결 풀 (None이면 기본 설정으로 생성)
+            lazy: True면 연결 검증과 LLM 객체 생성을 첫 호출까지 미룸
+            health_cache: health check 결과 캐시 (None이면 매번 검사)
+            routing: BackendPool 옵션 (ewma_alpha, max_failures, probe_interval)
+            concurrency: 백엔드별 AdaptiveLimiter 옵션 (initial_limit, min_limit, max_limit 등)
+            keep_alive: Ollama 모델 메모리 유지 시간 (예: "30m", -1이면 계속 유지, None이면 서버 기본값)
+            hedging: 헤지 요청 옵션 (enabled, percentile, window, min_samples, min_delay)
+            client: LLM 호출 방식 ('langchain': LangChain 래퍼, 'direct': HTTP API 직접 호출)
+            usage_ledger: 공유 사용량 집계 (None이면 새로 생성, 단계별 제공자가 함께 사용)
+            single_flight: 공유 요청 병합 객체 (None이면 새로 생성)
         """
         self.provider = provider.lower()
         self.model = model
-        self.base_url = base_url
+        self.base_urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.base_url = self.base_urls[0]
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.llm: Optional[Any] = None
+        self.cache = cache
+        self.http_pool = http_pool or HTTPConnectionPool()
+        self.lazy = lazy
+        self.health_cache = health_cache
+        self.keep_alive = keep_alive
+        self.client = client
+        self._llm_lock = threading.Lock()
+        self._keep_warm_thread: Optional[threading.Thread] = None
+        self._keep_warm_stop = threading.Event()
+        hedging = dict(hedging or {})
+        self.hedge_policy = HedgePolicy(**hedging) if hedging.pop('enabled', False) else None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.single_flight = single_flight or SingleFlight()
+        self.usage_ledger = usage_ledger or UsageLedger()
+        self.backend_pool = BackendPool(
+            [Backend(url, limiter=AdaptiveLimiter(**(concurrency or {})))
+             for url in self.base_urls],
+            probe=lambda backend: self.validate_connection(backend.base_url),
+            **(routing or {})
+        )
+        
+        if not lazy:
+            # 연결 검증 및 LLM 초기화
+            self._connect_backends()
+    
+    @property
+    def llm(self) -> Optional[Any]:
+        """기본 백엔드의 LLM 객체 (지연 모드에서는 첫 접근 시 연결 검증 후 생성)"""
+        backend = self.backend_pool.primary
+        if backend.llm is None and self.lazy:
+            return self._backend_llm(backend)
+        return backend.llm
+    
+    @llm.setter
+    def llm(self, value: Optional[Any]):
+        self.backend_pool.primary.llm = value
+    
+    def _connect_backends(self):
+        """
+        모든 백엔드 연결 검증 및 LLM 초기화
+        
+        일부 백엔드만 실패하면 해당 백엔드를 풀에서 제외하고 계속 진행합니다.
+        
+        Raises:
+            LLMConnectionError: 모든 백엔드에 연결할 수 없는 경우
+        """
+        failed = []
+        for backend in self.backend_pool.backends:
+            try:
+                self.ensure_connection(backend.base_url)
+                backend.llm = self._initialize_llm(backend.base_url)
+            except LLMConnectionError as e:
+                failed.append((backend, e))
+        
+        if len(failed) == len(self.backend_pool.backends):
+            raise failed[0][1]
+        for backend, _ in failed:
+            self.backend_pool.mark_unhealthy(backend)
+    
+    def _backend_llm(self, backend: Backend) -> Any:
+        """
+        백엔드의 LLM 객체 반환 (없으면 연결 검증 후 생성)
+        
+        Args:
+            backend: 대상 백엔드
+            
+        Returns:
+            LLM 객체
+        """
+        if backend.llm is None:
+            with self._llm_lock:
+                if backend.llm is None:
+                    self.ensure_connection(backend.base_url)
+                    backend.llm = self._initialize_llm(backend.base_url)
+        return backend.llm
+    
+    @contextmanager
+    def _use_backend(self, exclude: List[Backend], key: Hashable = None,
+                     selected: Optional[List[Backend]] = None) -> Iterator[Backend]:
+        """
+        백엔드를 선택하여 요청 한 건에 사용
+        
+        백엔드의 동시 요청 한도에 여유가 생길 때까지 대기한 뒤 사용하고,
+        블록을 벗어나면 소요 시간과 성공 여부를 풀과 제한기에 기록합니다.
+        취소(BaseException)는 실패로 집계하지 않습니다.
+        
+        Args:
+            exclude: 제외할 백엔드 (직전에 실패한 백엔드)
+            key: 지연 시간 기준을 나누는 요청 종류 키 (_latency_key)
+            selected: 백엔드를 고르자마자 추가할 리스트 (동시 요청 한도 대기 전)
+            
+        Yields:
+            선택된 백엔드
+        """
+        backend = self.backend_pool.acquire(exclude)
+        if selected is not None:
+            selected.append(backend)
+        try:
+            backend.limiter.acquire()
+        except BaseException:
+            self.backend_pool.cancel(backend)
+            raise
+        
+        start_time = time.perf_counter()
+        try:
+            yield backend
+        except Exception:
+            self._release_backend(backend, start_time, success=False, key=key)
+            raise
+        except BaseException:
+            self._release_backend(backend, start_time, success=None, key=key)
+            raise
+        else:
+            self._release_backend(backend, start_time, success=True, key=key)
+    
+    @asynccontextmanager
+    async def _ause_backend(self, exclude: List[Backend], key: Hashable = None,
+                            selected: Optional[List[Backend]] = None) -> AsyncIterator[Backend]:
+        """
+        백엔드를 선택하여 요청 한 건에 사용 (비동기)
+        
+        Args:
+            exclude: 제외할 백엔드 (직전에 실패한 백엔드)
+            key: 지연 시간 기준을 나누는 요청 종류 키 (_latency_key)
+            selected: 백엔드를 고르자마자 추가할 리스트 (동시 요청 한도 대기 전)
+            
+        Yields:
+            선택된 백엔드
+        """
+        backend = self.backend_pool.acquire(exclude)
+        if selected is not None:
+            selected.append(backend)
+        try:
+            await backend.limiter.aacquire()
+        except BaseException:
+            self.backend_pool.cancel(backend)
+            raise
+        
+        start_time = time.perf_counter()
+        try:
+            yield backend
+        except Exception:
+            self._release_backend(backend, start_time, success=False, key=key)
+            raise
+        except BaseException:
+            self._release_backend(backend, start_time, success=None, key=key)
+            raise
+        else:
+            self._release_backend(backend, start_time, success=True, key=key)
+    
+    def _release_backend(self, backend: Backend, start_time: float,
+                         success: Optional[bool], key: Hashable = None):
+        """
+        요청 완료를 풀과 제한기에 기록
+        
+        Args:
+            backend: 사용한 백엔드
+            start_time: 요청 시작 시각 (perf_counter, 대기 시간 제외)
+            success: 성공 여부 (None이면 취소)
+            key: 요청 종류 키
+        """
+        latency = time.perf_counter() - start_time
+        backend.limiter.release(latency, success, key=key)
+        if success is None:
+            self.backend_pool.cancel(backend)
+            return
+        
+        if success and self.hedge_policy is not None:
+            self.hedge_policy.record(latency, key)
         
-        # 연결 검증
-        if not self.validate_connection():
+        ejected = self.backend_pool.release(backend, latency, success=success)
+        if ejected and self.health_cache is not None:
+            # 서비스 상태가 바뀌었으므로 다음 실행에서 다시 검사
+            self.health_cache.invalidate(self._health_url(backend.base_url))
+    
+    def ensure_connection(self, base_url: Optional[str] = None):
+        """
+        연결 검증 (캐시된 성공 결과가 유효하면 네트워크 검사 생략)
+        
+        Args:
+            base_url: 검사할 백엔드 URL (None이면 기본 백엔드)
+            
+        Raises:
+            LLMConnectionError: 서비스에 연결할 수 없는 경우
+        """
+        base_url = base_url or self.base_url
+        url = self._health_url(base_url)
+        if self.health_cache is not None and url and self.health_cache.is_fresh(url):
+            return
+        
+        if not self.validate_connection(base_url):
             raise LLMConnectionError(
                 f"{self.provider} 서비스에 연결할 수 없습니다. "
-                f"서비스가 실행 중인지 확인하세요: {self.base_url}"
+                f"서비스가 실행 중인지 확인하세요: {base_url}"
             )
         
-        # LLM 초기화
-        self.llm = self._initialize_llm()
+        if self.health_cache is not None:
+            self.health_cache.mark_healthy(url)
+    
+    def _health_url(self, base_url: Optional[str] = None) -> Optional[str]:
+        """provider별 health check URL 반환"""
+        base_url = base_url or self.base_url
+        if self.provider == 'ollama':
+            return f"{base_url}/api/tags"
+        elif self.provider == 'lmstudio':
+            return f"{base_url}/v1/models"
+        return None
     
-    def validate_connection(self) -> bool:
+    def validate_connection(self, base_url: Optional[str] = None) -> bool:
         """
         LLM 서비스 연결 검증
         
+        Args:
+            base_url: 검사할 백엔드 URL (None이면 기본 백엔드)
+            
         Returns:
             연결 성공 여부
         """
+        url = self._health_url(base_url)
+        if url is None:
+            return False
+        
         try:
-            if self.provider == 'ollama':
-                # Ollama health check
-                response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-                return response.status_code == 200
-            
-            elif self.provider == 'lmstudio':
-                # LM Studio health check
-                response = requests.get(f"{self.base_url}/v1/models", timeout=5)
-                return response.status_code == 200
+            response = self.http_pool.get(url, timeout=self.http_pool.connect_timeout)
+            return response.status_code == 200
+                
+        except httpx.HTTPError as e:
+            print(f"❌ 연결 오류: {e}")
+            return False
+    
+    async def avalidate_connection(self, base_url: Optional[str] = None) -> bool:
+        """
+        LLM 서비스 연결 검증 (비동기)
+        
+        Args:
+            base_url: 검사할 백엔드 URL (None이면 기본 백엔드)
             
-            else:
-                return False
+        Returns:
+            연결 성공 여부
+        """
+        url = self._health_url(base_url)
+        if url is None:
+            return False
+        
+        try:
+            response = await self.http_pool.aget(url, timeout=self.http_pool.connect_timeout)
+            return response.status_code == 200
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ 연결 오류: {e}")
             return False
     
-    def _initialize_llm(self) -> Any:
+    def _initialize_llm(self, base_url: Optional[str] = None) -> Any:
         """
         LLM 객체 초기화
         
+        Args:
+            base_url: 백엔드 URL (None이면 기본 백엔드)
+            
         Returns:
             초기화된 LLM 객체
         """
+        base_url = base_url or self.base_url
+        if self.client == 'direct':
+            return DirectHTTPLLM(
+                provider=self.provider,
+                model=self.model,
+                base_url=base_url,
+                http_pool=self.http_pool,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                keep_alive=self.keep_alive,
+            )
+        
         if self.provider == 'ollama':
             if OLLAMA_NEW_API:
                 # 새로운 langchain-ollama API 사용
                 return OllamaLLM(
                     model=self.model,
-                    base_url=self.base_url,
+                    base_url=base_url,
                     temperature=self.temperature,
                     num_predict=self.max_tokens,
+                    keep_alive=self.keep_alive,
+                    client_kwargs={
+                        'limits': self.http_pool.limits,
+                        'timeout': self.http_pool.timeout,
+                    },
                 )
             else:
                 # 구버전 API 사용
                 return Ollama(
                     model=self.model,
-                    base_url=self.base_url,
+                    base_url=base_url,
                     temperature=self.temperature,
                     num_predict=self.max_tokens,
                     format="",  # JSON 포맷 강제 해제
+                    timeout=int(self.http_pool.read_timeout),
+                    keep_alive=self.keep_alive,
                 )
         
         elif self.provider == 'lmstudio':
             # LM Studio는 OpenAI 호환 API 사용
+            # 래퍼는 동기 httpx 클라이언트만 받으므로 ainvoke/astream은 래퍼가 만든
+            # 자체 연결을 사용합니다 (비동기까지 공유 풀을 쓰려면 client: direct)
             from langchain_community.llms import OpenAI
             return OpenAI(
                 model=self.model,
-                base_url=f"{self.base_url}/v1",
+                base_url=f"{base_url}/v1",
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                api_key="lm-studio"  # LM Studio는 더미 키 필요
+                api_key="lm-studio",  # LM Studio는 더미 키 필요
+                http_client=self.http_pool.client,
+                request_timeout=self.http_pool.read_timeout,
             )
         
         else:
@@ -123,26 +883,63 @@ class LLMProviderManager:
             raise LLMConnectionError("LLM이 초기화되지 않았습니다.")
         return self.llm
     
-    def invoke(self, prompt: str, retry_count: int = 3) -> str:
+    def invoke(self, prompt: str, retry_count: int = 3,
+               meter: Optional[CallMeter] = None, use_cache: bool = True,
+               options: Optional[Dict[str, Any]] = None) -> str:
         """
         LLM 호출
         
         Args:
             prompt: 입력 프롬프트
             retry_count: 재시도 횟수
+            meter: 호출 측정 객체 (on_token이 있으면 스트리밍으로 호출,
+                   백엔드 사용량은 meter.usage에 기록)
+            use_cache: 응답 캐시 사용 여부
+            options: 호출별 생성 옵션 (max_tokens, num_ctx, stop, None이면 기본 설정)
             
         Returns:
             LLM 응답
         """
-        if self.llm is None:
-            raise LLMConnectionError("LLM이 초기화되지 않았습니다.")
+        meter = meter if meter is not None else CallMeter()
+        cache_key = self._cache_key(prompt, options) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._record_call(self._replay_cached(cached, meter), meter)
+        
+        # 같은 프롬프트가 이미 진행 중이면 그 결과를 함께 사용
+        response, shared = self.single_flight.do(
+            self._flight_key(prompt, options),
+            lambda: self._invoke_uncached(prompt, retry_count, meter, options)
+        )
+        if shared:
+            return self._record_call(self._replay_shared(response, meter), meter)
+        
+        if cache_key is not None and response:
+            self.cache.set(cache_key, response)
+        return self._record_call(response, meter)
+    
+    def _invoke_uncached(self, prompt: str, retry_count: int,
+                         meter: Optional[CallMeter],
+                         options: Optional[Dict[str, Any]] = None) -> str:
+        """캐시를 거치지 않는 LLM 호출"""
+        if meter is not None and meter.streaming:
+            response = ''.join(self.stream(prompt, retry_count, meter=meter, options=options))
+            meter.finish()
+            return response
         
+        failed: List[Backend] = []
         for attempt in range(retry_count):
+            used: List[Backend] = []
             try:
-                # 프롬프트 정리 (특수 문자 처리)
-                cleaned_prompt = prompt.strip()
+                delay = self._hedge_delay(self._latency_key(options))
+                if delay is None:
+                    response = self._invoke_on_backend(prompt, meter, failed, used, options)
+                else:
+                    response = self._invoke_hedged(prompt, meter, failed, used, delay, options)
                 
-                response = self.llm.invoke(cleaned_prompt)
+                if meter is not None:
+                    meter.finish()
                 
                 # 응답이 문자열인지 확인
                 if isinstance(response, str):
@@ -151,40 +948,836 @@ class LLMProviderManager:
                     return str(response)
             
             except Exception as e:
-                error_msg = str(e)
-                
-                # JSON 파싱 오류 감지
-                if "unmarshal" in error_msg or "invalid character" in error_msg:
-                    print(f"⚠️  JSON 파싱 오류 감지. 프롬프트를 단순화합니다...")
-                    # 프롬프트를 더 단순하게 만들어 재시도
-                    if attempt < retry_count - 1:
-                        import time
-                        time.sleep(1)  # 잠시 대기
-                        continue
-                
-                if attempt < retry_count - 1:
-                    print(f"⚠️  LLM 호출 실패 (시도 {attempt + 1}/{retry_count}): {error_msg}")
-                    print("재시도 중...")
-                    import time
-                    time.sleep(2)  # 재시도 전 대기
-                else:
-                    raise LLMConnectionError(
-                        f"LLM 호출 실패 ({retry_count}회 시도): {error_msg}"
-                    )
+                failed.extend(used)
+                time.sleep(self._retry_delay(e, attempt, retry_count))
         
         return ""
     
-    def get_provider_info(self) -> dict:
+    def _invoke_on_backend(self, prompt: str, meter: Optional[CallMeter],
+                           exclude: List[Backend], used: List[Backend],
+                           options: Optional[Dict[str, Any]] = None,
+                           selected: Optional[List[Backend]] = None) -> Any:
         """
-        제공자 정보 반환
+        백엔드 하나에 요청 한 번 전송
         
+        Args:
+            prompt: 입력 프롬프트
+            meter: 호출 측정 객체
+            exclude: 제외할 백엔드
+            used: 선택된 백엔드를 추가할 리스트
+            options: 호출별 생성 옵션
+            selected: 백엔드를 고르자마자 추가할 리스트 (헤지 요청의 제외 대상)
+            
         Returns:
-            제공자 정보 딕셔너리
+            LLM 응답
         """
-        return {
-            'provider': self.provider,
-            'model': self.model,
-            'base_url': self.base_url,
-            'temperature': self.temperature,
-            'max_tokens': self.max_tokens
-        }
+        with self._use_backend(exclude, self._latency_key(options), selected) as backend:
+            used.append(backend)
+            if meter is not None:
+                meter.start()
+            
+            # 프롬프트 정리 (특수 문자 처리)
+            cleaned_prompt = prompt.strip()
+            
+            return self._backend_llm(backend).invoke(
+                cleaned_prompt, config=self._usage_config(meter),
+                **self._generation_kwargs(options)
+            )
+    
+    def _invoke_hedged(self, prompt: str, meter: Optional[CallMeter],
+                       exclude: List[Backend], used: List[Backend], delay: float,
+                       options: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        헤지 요청: delay 안에 끝나지 않으면 다른 백엔드로 한 번 더 보내고 먼저 끝난 응답 사용
+        
+        동기 호출은 진행 중인 요청을 중단할 수 없으므로 늦게 끝난 요청의 결과는 버립니다.
+        
+        Args:
+            prompt: 입력 프롬프트
+            meter: 호출 측정 객체
+            exclude: 제외할 백엔드
+            used: 선택된 백엔드를 추가할 리스트
+            delay: 헤지 요청까지 대기 시간 (초)
+            options: 호출별 생성 옵션
+            
+        Returns:
+            먼저 성공한 LLM 응답
+        """
+        if meter is not None:
+            meter.start()
+        executor = self._get_hedge_executor()
+        meters = [CallMeter(), CallMeter()]
+        # 첫 요청이 동시 요청 한도를 기다리는 중이어도 헤지는 다른 백엔드로 보냄
+        primary: List[Backend] = []
+        started = threading.Event()
+        
+        def first_attempt() -> Any:
+            started.set()
+            return self._invoke_on_backend(prompt, meters[0], exclude, used, options, primary)
+        
+        futures = [executor.submit(first_attempt)]
+        # 실행기 대기열에서 기다린 시간은 백엔드 지연이 아니므로 첫 요청이 시작된 뒤부터 계산
+        started.wait()
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            futures.append(executor.submit(
+                self._invoke_on_backend, prompt, meters[1], exclude + primary, used, options
+            ))
+        
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                self._finish_hedge(futures, futures.index(future), meters, meter)
+                return future.result()
+        
+        if len(futures) > 1:
+            self.hedge_policy.record_hedge(won=False)
+        raise error
+    
+    def _finish_hedge(self, attempts: List[Any], winner: int,
+                      meters: List[CallMeter], meter: Optional[CallMeter]):
+        """헤지 결과를 통계와 호출 측정 객체에 반영"""
+        if len(attempts) > 1:
+            self.hedge_policy.record_hedge(won=winner == 1)
+        if meter is not None:
+            meter.record_usage(meters[winner].usage)
+            if meters[winner].context:
+                meter.record_context(meters[winner].context)
+    
+    def _hedge_delay(self, key: Hashable = None) -> Optional[float]:
+        """
+        헤지 요청 대기 시간 반환
+        
+        Args:
+            key: 요청 종류 키 (_latency_key)
+            
+        Returns:
+            대기 시간 (초, 헤지를 사용하지 않거나 다른 정상 백엔드가 없으면 None)
+        """
+        if self.hedge_policy is None:
+            return None
+        if sum(1 for b in self.backend_pool.backends if b.healthy) < 2:
+            return None
+        return self.hedge_policy.delay(key)
+    
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """동기 헤지 요청용 스레드 풀 반환 (최초 사용 시 생성)"""
+        if self._hedge_executor is None:
+            with self._llm_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.http_pool.pool_size,
+                        thread_name_prefix="llm-hedge"
+                    )
+        return self._hedge_executor
+    
+    async def ainvoke(self, prompt: str, retry_count: int = 3,
+                      meter: Optional[CallMeter] = None,
+                      use_cache: bool = True,
+                      options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        LLM 비동기 호출
+        
+        재시도 대기 중에도 이벤트 루프를 막지 않으므로 하나의 루프에서
+        여러 요청을 동시에 처리할 수 있습니다.
+        
+        Args:
+            prompt: 입력 프롬프트
+            retry_count: 재시도 횟수
+            meter: 호출 측정 객체 (on_token이 있으면 스트리밍으로 호출,
+                   백엔드 사용량은 meter.usage에 기록)
+            use_cache: 응답 캐시 사용 여부
+            options: 호출별 생성 옵션 (max_tokens, num_ctx, stop, None이면 기본 설정)
+            
+        Returns:
+            LLM 응답
+        """
+        meter = meter if meter is not None else CallMeter()
+        cache_key = self._cache_key(prompt, options) if use_cache else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._record_call(self._replay_cached(cached, meter), meter)
+        
+        response, shared = await self.single_flight.ado(
+            self._flight_key(prompt, options),
+            lambda: self._ainvoke_uncached(prompt, retry_count, meter, options)
+        )
+        if shared:
+            return self._record_call(self._replay_shared(response, meter), meter)
+        
+        if cache_key is not None and response:
+            self.cache.set(cache_key, response)
+        return self._record_call(response, meter)
+    
+    async def _ainvoke_uncached(self, prompt: str, retry_count: int,
+                                meter: Optional[CallMeter],
+                                options: Optional[Dict[str, Any]] = None) -> str:
+        """캐시를 거치지 않는 LLM 비동기 호출"""
+        if meter is not None and meter.streaming:
+            chunks = [
+                chunk async for chunk in
+                self.astream(prompt, retry_count, meter=meter, options=options)
+            ]
+            meter.finish()
+            return ''.join(chunks)
+        
+        failed: List[Backend] = []
+        for attempt in range(retry_count):
+            used: List[Backend] = []
+            try:
+                delay = self._hedge_delay(self._latency_key(options))
+                if delay is None:
+                    response = await self._ainvoke_on_backend(
+                        prompt, meter, failed, used, options
+                    )
+                else:
+                    response = await self._ainvoke_hedged(
+                        prompt, meter, failed, used, delay, options
+                    )
+                
+                if meter is not None:
+                    meter.finish()
+                
+                if isinstance(response, str):
+                    return response
+                else:
+                    return str(response)
+            
+            except Exception as e:
+                failed.extend(used)
+                await asyncio.sleep(self._retry_delay(e, attempt, retry_count))
+        
+        return ""
+    
+    async def _ainvoke_on_backend(self, prompt: str, meter: Optional[CallMeter],
+                                  exclude: List[Backend], used: List[Backend],
+                                  options: Optional[Dict[str, Any]] = None,
+                                  selected: Optional[List[Backend]] = None) -> Any:
+        """
+        백엔드 하나에 요청 한 번 전송 (비동기)
+        
+        Args:
+            prompt: 입력 프롬프트
+            meter: 호출 측정 객체
+            exclude: 제외할 백엔드
+            used: 선택된 백엔드를 추가할 리스트
+            options: 호출별 생성 옵션
+            selected: 백엔드를 고르자마자 추가할 리스트 (헤지 요청의 제외 대상)
+            
+        Returns:
+            LLM 응답
+        """
+        async with self._ause_backend(
+            exclude, self._latency_key(options), selected
+        ) as backend:
+            used.append(backend)
+            if meter is not None:
+                meter.start()
+            
+            cleaned_prompt = prompt.strip()
+            
+            return await self._backend_llm(backend).ainvoke(
+                cleaned_prompt, config=self._usage_config(meter),
+                **self._generation_kwargs(options)
+            )
+    
+    async def _ainvoke_hedged(self, prompt: str, meter: Optional[CallMeter],
+                              exclude: List[Backend], used: List[Backend],
+                              delay: float,
+                              options: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        헤지 요청 (비동기): 먼저 성공한 응답을 사용하고 나머지 요청은 취소
+        
+        Args:
+            prompt: 입력 프롬프트
+            meter: 호출 측정 객체
+            exclude: 제외할 백엔드
+            used: 선택된 백엔드를 추가할 리스트
+            delay: 헤지 요청까지 대기 시간 (초)
+            options: 호출별 생성 옵션
+            
+        Returns:
+            먼저 성공한 LLM 응답
+        """
+        if meter is not None:
+            meter.start()
+        meters = [CallMeter(), CallMeter()]
+        # 첫 요청이 동시 요청 한도를 기다리는 중이어도 헤지는 다른 백엔드로 보냄
+        primary: List[Backend] = []
+        tasks = [asyncio.ensure_future(
+            self._ainvoke_on_backend(prompt, meters[0], exclude, used, options, primary)
+        )]
+        
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.append(asyncio.ensure_future(
+                    self._ainvoke_on_backend(
+                        prompt, meters[1], exclude + primary, used, options
+                    )
+                ))
+            
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    self._finish_hedge(tasks, tasks.index(task), meters, meter)
+                    return task.result()
+            
+            if len(tasks) > 1:
+                self.hedge_policy.record_hedge(won=False)
+            raise error
+        
+        finally:
+            # 늦은 요청 취소 (백엔드 연결을 끊어 생성을 중단)
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+    
+    def invoke_batch(self, prompts: List[str], max_concurrency: Optional[int] = None,
+                     use_cache: bool = True) -> List[Union[str, Exception]]:
+        """
+        여러 프롬프트 일괄 호출
+        
+        실패한 항목은 예외 객체로 반환하므로 일부가 실패해도 나머지 결과를 받을 수 있습니다.
+        
+        Args:
+            prompts: 입력 프롬프트 리스트
+            max_concurrency: 최대 동시 호출 수 (None이면 LangChain 기본값)
+            use_cache: 응답 캐시 사용 여부
+            
+        Returns:
+            입력 순서대로 정렬된 응답 또는 예외 리스트
+        """
+        return self._batch_runnable(use_cache).batch(
+            list(prompts),
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+    
+    async def ainvoke_batch(self, prompts: List[str], max_concurrency: Optional[int] = None,
+                            use_cache: bool = True) -> List[Union[str, Exception]]:
+        """
+        여러 프롬프트 일괄 호출 (비동기)
+        
+        Args:
+            prompts: 입력 프롬프트 리스트
+            max_concurrency: 최대 동시 호출 수 (None이면 제한 없음)
+            use_cache: 응답 캐시 사용 여부
+            
+        Returns:
+            입력 순서대로 정렬된 응답 또는 예외 리스트
+        """
+        return await self._batch_runnable(use_cache).abatch(
+            list(prompts),
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+    
+    def _batch_runnable(self, use_cache: bool) -> RunnableLambda:
+        """일괄 호출용 Runnable 생성"""
+        def invoke_one(prompt: str) -> str:
+            return self.invoke(prompt, use_cache=use_cache)
+        
+        async def ainvoke_one(prompt: str) -> str:
+            return await self.ainvoke(prompt, use_cache=use_cache)
+        
+        return RunnableLambda(invoke_one, afunc=ainvoke_one)
+    
+    def stream(self, prompt: str, retry_count: int = 3,
+               meter: Optional[CallMeter] = None,
+               options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        LLM 스트리밍 호출
+        
+        첫 청크를 받기 전의 실패만 재시도합니다. 이미 출력된 청크를
+        중복으로 내보내지 않기 위해 이후의 실패는 바로 예외로 전달됩니다.
+        
+        Args:
+            prompt: 입력 프롬프트
+            retry_count: 재시도 횟수
+            meter: 호출 측정 객체
+            options: 호출별 생성 옵션 (max_tokens, num_ctx, stop)
+            
+        Yields:
+            응답 텍스트 청크
+        """
+        failed: List[Backend] = []
+        for attempt in range(retry_count):
+            received = False
+            # 백엔드를 얻기 전에 실패하면 실패한 백엔드로 기록하지 않음
+            backend = None
+            try:
+                with self._use_backend(failed, self._latency_key(options)) as backend:
+                    if meter is not None:
+                        meter.start()
+                    
+                    for chunk in self._backend_llm(backend).stream(
+                        prompt.strip(), config=self._usage_config(meter),
+                        **self._generation_kwargs(options)
+                    ):
+                        text = chunk if isinstance(chunk, str) else str(chunk)
+                        received = True
+                        if meter is not None:
+                            meter.record_token(text)
+                        yield text
+                return
+            
+            except Exception as e:
+                if received:
+                    raise LLMConnectionError(f"LLM 스트리밍 중단: {e}")
+                if backend is not None:
+                    failed.append(backend)
+                time.sleep(self._retry_delay(e, attempt, retry_count))
+    
+    async def astream(self, prompt: str, retry_count: int = 3,
+                      meter: Optional[CallMeter] = None,
+                      options: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        LLM 비동기 스트리밍 호출
+        
+        Args:
+            prompt: 입력 프롬프트
+            retry_count: 재시도 횟수
+            meter: 호출 측정 객체
+            options: 호출별 생성 옵션 (max_tokens, num_ctx, stop)
+            
+        Yields:
+            응답 텍스트 청크
+        """
+        failed: List[Backend] = []
+        for attempt in range(retry_count):
+            received = False
+            # 백엔드를 얻기 전에 실패하면 실패한 백엔드로 기록하지 않음
+            backend = None
+            try:
+                async with self._ause_backend(failed, self._latency_key(options)) as backend:
+                    if meter is not None:
+                        meter.start()
+                    
+                    async for chunk in self._backend_llm(backend).astream(
+                        prompt.strip(), config=self._usage_config(meter),
+                        **self._generation_kwargs(options)
+                    ):
+                        text = chunk if isinstance(chunk, str) else str(chunk)
+                        received = True
+                        if meter is not None:
+                            meter.record_token(text)
+                        yield text
+                return
+            
+            except Exception as e:
+                if received:
+                    raise LLMConnectionError(f"LLM 스트리밍 중단: {e}")
+                if backend is not None:
+                    failed.append(backend)
+                await asyncio.sleep(self._retry_delay(e, attempt, retry_count))
+    
+    def _usage_config(self, meter: Optional[CallMeter]) -> Optional[Dict[str, Any]]:
+        """백엔드 사용량을 meter에 기록하는 LangChain 실행 설정 반환"""
+        if meter is None:
+            return None
+        return {'callbacks': [_UsageHandler(meter)]}
+    
+    def _record_call(self, response: str, meter: CallMeter) -> str:
+        """완료된 호출을 세션 사용량에 기록하고 응답 반환"""
+        self.usage_ledger.record(meter)
+        return response
+    
+    def get_usage_summary(self) -> Dict[str, Any]:
+        """
+        세션 사용량 집계 반환
+        
+        Returns:
+            UsageLedger.summary() 딕셔너리
+        """
+        return self.usage_ledger.summary()
+    
+    def _cache_key(self, prompt: str,
+                   options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        응답 캐시 키 생성
+        
+        Args:
+            prompt: 입력 프롬프트
+            options: 호출별 생성 옵션
+            
+        Returns:
+            캐시 키 (캐시를 사용하지 않으면 None)
+        """
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self._request_params(options), prompt.strip())
+    
+    def _flight_key(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        동일 요청 병합 키 생성
+        
+        Args:
+            prompt: 입력 프롬프트
+            options: 호출별 생성 옵션
+            
+        Returns:
+            생성 파라미터와 프롬프트로 구성된 키
+        """
+        return (tuple(sorted(self._request_params(options).items())), prompt.strip())
+    
+    def config_fingerprint(self) -> Dict[str, Any]:
+        """
+        응답에 영향을 주는 제공자 설정 반환 (체크포인트 실행 식별자에 사용)
+        
+        Returns:
+            provider, model, base_urls, temperature, max_tokens 딕셔너리
+        """
+        return {
+            'provider': self.provider,
+            'model': self.model,
+            'base_urls': list(self.base_urls),
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens
+        }
+    
+    def _latency_key(self, options: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        지연 시간 기준을 나눌 요청 종류 키 반환
+        
+        짧은 분석 요청과 긴 답변 요청은 생성 옵션(max_tokens, stop, format)이 다르므로
+        요청 파라미터로 구분합니다. 호출마다 달라지는 생성 컨텍스트는 제외합니다.
+        
+        Args:
+            options: 호출별 생성 옵션
+            
+        Returns:
+            요청 종류 키
+        """
+        params = self._request_params(options)
+        params.pop('context', None)
+        return tuple(sorted(params.items()))
+    
+    def _request_params(self, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        응답을 결정하는 생성 파라미터 반환
+        
+        Args:
+            options: 호출별 생성 옵션 (설정된 값만 키에 추가되므로
+                     옵션 없는 호출의 기존 캐시 항목은 그대로 사용됨)
+            
+        Returns:
+            생성 파라미터 딕셔너리
+        """
+        options = options or {}
+        params = {
+            'provider': self.provider,
+            'model': self.model,
+            'temperature': self.temperature,
+            'max_tokens': options.get('max_tokens') or self.max_tokens
+        }
+        if options.get('num_ctx'):
+            params['num_ctx'] = options['num_ctx']
+        if options.get('stop'):
+            params['stop'] = tuple(options['stop'])
+        if options.get('context'):
+            params['context'] = tuple(options['context'])
+        if options.get('format'):
+            params['format'] = json.dumps(options['format'], sort_keys=True)
+        return params
+    
+    @property
+    def supports_context(self) -> bool:
+        """
+        이전 응답의 생성 컨텍스트를 다음 호출에 넘길 수 있는지 여부
+        
+        Ollama /api/generate를 직접 호출할 때만 context를 주고받을 수 있습니다.
+        """
+        return self.provider == 'ollama' and self.client == 'direct'
+    
+    def _generation_kwargs(self, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        호출별 생성 옵션을 LLM 객체 호출 인자로 변환
+        
+        Ollama는 options 전체를 넘기면 래퍼 기본값을 대체하므로 temperature도 함께 넣고,
+        중단 시퀀스도 options에 포함합니다. 생성 컨텍스트(context)는 직접 호출에서만
+        전달됩니다 (supports_context). LM Studio(OpenAI 호환)는 max_tokens와 stop만
+        지원하며 컨텍스트 길이는 모델 로드 시 정해지므로 num_ctx는 무시합니다.
+        출력 형식(format)은 Ollama에는 format으로, LM Studio에는 문법 제한 생성을 위한
+        response_format(json_schema)으로 전달합니다.
+        
+        Args:
+            options: 호출별 생성 옵션 (max_tokens, num_ctx, stop, context, format)
+            
+        Returns:
+            invoke/stream 키워드 인자 (옵션이 없으면 빈 딕셔너리)
+        """
+        if not options:
+            return {}
+        max_tokens = options.get('max_tokens') or self.max_tokens
+        stop = list(options.get('stop') or [])
+        
+        if self.provider == 'ollama':
+            ollama_options: Dict[str, Any] = {
+                'temperature': self.temperature,
+                'num_predict': max_tokens,
+            }
+            if options.get('num_ctx'):
+                ollama_options['num_ctx'] = options['num_ctx']
+            if stop:
+                ollama_options['stop'] = stop
+            kwargs: Dict[str, Any] = {'options': ollama_options}
+            if options.get('context') and self.supports_context:
+                kwargs['context'] = list(options['context'])
+            if options.get('format'):
+                kwargs['format'] = options['format']
+            return kwargs
+        
+        kwargs = {'max_tokens': max_tokens}
+        if stop:
+            kwargs['stop'] = stop
+        if isinstance(options.get('format'), dict):
+            kwargs['extra_body'] = {'response_format': {
+                'type': 'json_schema',
+                'json_schema': {'name': 'response', 'strict': True,
+                                'schema': options['format']},
+            }}
+        return kwargs
+    
+    def _replay_cached(self, response: str, meter: Optional[CallMeter]) -> str:
+        """
+        캐시된 응답 반환
+        
+        스트리밍 호출이면 응답 전체를 하나의 청크로 전달합니다.
+        
+        Args:
+            response: 캐시된 응답
+            meter: 호출 측정 객체
+            
+        Returns:
+            캐시된 응답
+        """
+        if meter is not None:
+            self._replay(response, meter)
+            meter.cached = True
+        return response
+    
+    def _replay_shared(self, response: str, meter: Optional[CallMeter]) -> str:
+        """
+        병합된 호출의 응답 반환
+        
+        Args:
+            response: 다른 호출이 받은 응답
+            meter: 호출 측정 객체
+            
+        Returns:
+            공유된 응답
+        """
+        if meter is not None:
+            self._replay(response, meter)
+            meter.coalesced = True
+        return response
+    
+    def _replay(self, response: str, meter: CallMeter):
+        """응답 전체를 하나의 청크로 측정 객체에 전달"""
+        meter.start()
+        if meter.streaming:
+            meter.record_token(response)
+        meter.finish()
+    
+    def _retry_delay(self, error: Exception, attempt: int, retry_count: int) -> float:
+        """
+        실패한 호출의 재시도 대기 시간 계산
+        
+        Args:
+            error: 발생한 예외
+            attempt: 현재 시도 번호 (0부터 시작)
+            retry_count: 전체 재시도 횟수
+            
+        Returns:
+            재시도 전 대기 시간 (초)
+            
+        Raises:
+            LLMConnectionError: 마지막 시도까지 실패한 경우
+        """
+        error_msg = str(error)
+        
+        # JSON 파싱 오류 감지
+        if "unmarshal" in error_msg or "invalid character" in error_msg:
+            print(f"⚠️  JSON 파싱 오류 감지. 프롬프트를 단순화합니다...")
+            if attempt < retry_count - 1:
+                return 1  # 잠시 대기
+        
+        if attempt < retry_count - 1:
+            print(f"⚠️  LLM 호출 실패 (시도 {attempt + 1}/{retry_count}): {error_msg}")
+            print("재시도 중...")
+            return 2  # 재시도 전 대기
+        
+        raise LLMConnectionError(
+            f"LLM 호출 실패 ({retry_count}회 시도): {error_msg}"
+        )
+    
+    def get_provider_info(self) -> dict:
+        """
+        제공자 정보 반환
+        
+        Returns:
+            제공자 정보 딕셔너리
+        """
+        return {
+            'provider': self.provider,
+            'model': self.model,
+            'base_url': self.base_url,
+            'endpoints': list(self.base_urls),
+            'client': self.client,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens
+        }
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        동일 요청 병합 통계 반환
+        
+        Returns:
+            hits(병합된 호출), misses(실제 호출), entries(진행 중), hit_rate 딕셔너리
+        """
+        return self.single_flight.get_stats()
+    
+    def get_concurrency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        백엔드별 동시 요청 제한 상태 반환
+        
+        Returns:
+            백엔드 URL별 limit, inflight, queued, avg_wait, max_wait 딕셔너리
+        """
+        return {
+            backend.base_url: backend.limiter.get_stats()
+            for backend in self.backend_pool.backends
+        }
+    
+    def get_backend_stats(self) -> List[Dict[str, Any]]:
+        """
+        백엔드별 라우팅 상태 반환
+        
+        Returns:
+            백엔드별 상태 딕셔너리 리스트
+        """
+        return self.backend_pool.get_stats()
+    
+    def warmup(self, wait: bool = True) -> Dict[str, bool]:
+        """
+        모델 미리 로드 (빈 생성 요청)
+        
+        Ollama는 빈 프롬프트로 /api/generate를 호출하면 모델만 메모리에 올리고
+        바로 응답하므로, 첫 질의에서 모델 로드 시간을 기다리지 않습니다.
+        
+        Args:
+            wait: False면 백그라운드 스레드에서 실행하고 바로 반환
+            
+        Returns:
+            "백엔드 URL 모델"별 성공 여부 (wait=False면 빈 딕셔너리)
+        """
+        if not wait:
+            threading.Thread(target=self.warmup, name="llm-warmup", daemon=True).start()
+            return {}
+        
+        results = {}
+        for backend in self.backend_pool.backends:
+            if not backend.healthy:
+                continue
+            for model in self._warmup_models():
+                results[f"{backend.base_url} {model}"] = self._warmup_request(
+                    backend.base_url, model
+                )
+        return results
+    
+    def _warmup_models(self) -> List[str]:
+        """미리 로드할 모델 목록"""
+        return [self.model]
+    
+    def _warmup_request(self, base_url: str, model: str) -> bool:
+        """
+        모델 로드 요청 전송
+        
+        Args:
+            base_url: 백엔드 URL
+            model: 모델 이름
+            
+        Returns:
+            성공 여부
+        """
+        if self.provider == 'ollama':
+            url = f"{base_url}/api/generate"
+            payload: Dict[str, Any] = {'model': model, 'prompt': '', 'stream': False}
+            if self.keep_alive is not None:
+                payload['keep_alive'] = self.keep_alive
+        elif self.provider == 'lmstudio':
+            # LM Studio는 첫 요청 시 모델을 로드하므로 1토큰만 생성
+            url = f"{base_url}/v1/completions"
+            payload = {'model': model, 'prompt': '', 'max_tokens': 1}
+        else:
+            return False
+        
+        try:
+            response = self.http_pool.post(url, json=payload)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+    
+    def start_keep_warm(self, interval: float):
+        """
+        주기적으로 모델 로드 요청을 보내 유휴 상태에서도 모델을 메모리에 유지
+        
+        대화형 모드나 서버처럼 오래 실행되는 프로세스에서 사용합니다.
+        
+        Args:
+            interval: 요청 주기 (초, keep_alive보다 짧게 설정)
+        """
+        if interval <= 0 or self._keep_warm_thread is not None:
+            return
+        self._keep_warm_stop.clear()
+        
+        def loop():
+            while not self._keep_warm_stop.wait(interval):
+                self.warmup()
+        
+        self._keep_warm_thread = threading.Thread(
+            target=loop, name="llm-keep-warm", daemon=True
+        )
+        self._keep_warm_thread.start()
+    
+    def stop_keep_warm(self):
+        """keep-warm 스레드 종료"""
+        self._keep_warm_stop.set()
+        thread, self._keep_warm_thread = self._keep_warm_thread, None
+        if thread is not None:
+            thread.join(timeout=1.0)
+    
+    def get_hedging_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        헤지 요청 통계 반환
+        
+        Returns:
+            HedgePolicy.get_stats() 딕셔너리 (헤지를 사용하지 않으면 None)
+        """
+        if self.hedge_policy is None:
+            return None
+        return self.hedge_policy.get_stats()
+    
+    def close(self):
+        """keep-warm·백엔드 재검사 스레드와 HTTP 연결 풀 종료"""
+        self.stop_keep_warm()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.backend_pool.close()
+        self.http_pool.close()
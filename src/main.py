@@ -3,11 +3,17 @@
 """
 import argparse
 import sys
-from typing import Optional
+from typing import Dict, Optional
 
-from config_manager import ConfigManager
-from llm_provider import LLMProviderManager, LLMConnectionError
+from config_manager import ConfigManager, LLMConfig, STAGE_NAMES
+from llm_provider import LLMProviderManager, LLMConnectionError, UsageLedger
+from single_flight import SingleFlight
+from http_pool import HTTPConnectionPool
+from health_cache import HealthCache
+from response_cache import ResponseCache
+from checkpoint_store import SqliteCheckpointSaver
 from prompt_optimizer import PromptOptimizer, OptimizationError
+from history_store import wall_to_datetime
 from workflow import PromptOptimizationWorkflow
 from display import DisplayManager
 
@@ -15,15 +21,20 @@ from display import DisplayManager
 class PromptOptimizerApp:
     """프롬프트 최적화 애플리케이션"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, no_cache: bool = False):
         """
         Args:
             config_path: 설정 파일 경로
+            no_cache: True면 응답 캐시 조회를 건너뜀 (응답은 캐시에 갱신)
         """
         # 설정 로드
         self.config_manager = ConfigManager(config_path)
         llm_config = self.config_manager.get_llm_config()
         display_config = self.config_manager.get_display_config()
+        optimization_config = self.config_manager.get_optimization_config()
+        cache_config = self.config_manager.get_cache_config()
+        history_config = self.config_manager.get_history_config()
+        checkpoint_config = self.config_manager.get_checkpoint_config()
         
         # 디스플레이 매니저 초기화
         self.display = DisplayManager(
@@ -34,34 +45,157 @@ class PromptOptimizerApp:
         # 헤더 표시
         self.display.show_header()
         
+        # 설정 오류는 네트워크에 접근하기 전에 종료
+        if self.config_manager.load_error:
+            self.display.show_error(
+                ValueError(self.config_manager.load_error),
+                f"설정 파일: {config_path}"
+            )
+            sys.exit(1)
+        
+        # 응답 캐시 초기화
+        self.response_cache = None
+        if cache_config.enabled:
+            self.response_cache = ResponseCache(
+                path=cache_config.path,
+                ttl=cache_config.ttl,
+                max_entries=cache_config.max_entries,
+                bypass=cache_config.bypass or no_cache
+            )
+        
+        # 워크플로우 체크포인트 저장소 초기화
+        self.checkpointer = None
+        if checkpoint_config.enabled:
+            self.checkpointer = SqliteCheckpointSaver(
+                path=checkpoint_config.path,
+                commit_every=checkpoint_config.commit_every,
+                commit_interval=checkpoint_config.commit_interval
+            )
+        
+        # HTTP 연결 풀 초기화
+        self.http_pool = HTTPConnectionPool(
+            pool_size=llm_config.http.pool_size,
+            connect_timeout=llm_config.http.connect_timeout,
+            read_timeout=llm_config.http.read_timeout,
+            keepalive_expiry=llm_config.http.keepalive_expiry
+        )
+        
         try:
             # LLM Provider 초기화
-            self.display.show_info("LLM 서비스 연결 중...")
-            self.llm_provider = LLMProviderManager(
-                provider=llm_config.provider,
-                model=llm_config.model,
-                base_url=llm_config.base_url,
-                temperature=llm_config.temperature,
-                max_tokens=llm_config.max_tokens
-            )
-            self.display.show_success("LLM 서비스 연결 성공!")
-            self.display.show_provider_info(self.llm_provider.get_provider_info())
+            if not llm_config.lazy:
+                self.display.show_info("LLM 서비스 연결 중...")
+            self.stage_providers = self._create_stage_providers(llm_config)
+            self.llm_provider = self.stage_providers['invoke_llm']
+            if not llm_config.lazy:
+                self.display.show_success("LLM 서비스 연결 성공!")
+            self.display.show_provider_info(self._provider_info())
+            if llm_config.warmup:
+                # 첫 질의를 입력하는 동안 백그라운드에서 모델 로드
+                for provider in self._unique_providers():
+                    provider.warmup(wait=False)
             
         except LLMConnectionError as e:
             self.display.show_error(e, "LLM 초기화")
             self._show_connection_help(llm_config.provider)
             sys.exit(1)
         
+        self.keep_warm_interval = llm_config.keep_warm_interval
+        
         # Prompt Optimizer 초기화
-        self.prompt_optimizer = PromptOptimizer(self.llm_provider)
+        self.prompt_optimizer = PromptOptimizer(
+            self.llm_provider,
+            memo_size=optimization_config.memo_size,
+            stage_providers=self.stage_providers,
+            generation=optimization_config.generation,
+            prefix_reuse=optimization_config.prefix_reuse,
+            mode=optimization_config.mode,
+            analysis_format=optimization_config.analysis_format,
+            history_size=history_config.capacity,
+            step_spill_path=history_config.step_spill_path
+        )
         
         # Workflow 초기화
         self.workflow = PromptOptimizationWorkflow(
             self.llm_provider,
             self.prompt_optimizer,
-            self.display
+            self.display,
+            streaming=display_config.streaming,
+            parallel=optimization_config.parallel,
+            history_size=history_config.capacity,
+            history_spill_path=history_config.spill_path,
+            checkpointer=self.checkpointer
         )
     
+    def _create_stage_providers(self, llm_config: LLMConfig) -> Dict[str, LLMProviderManager]:
+        """
+        단계별 LLM 제공자 생성
+        
+        설정이 같은 단계는 제공자 하나를 함께 사용하고, 모든 제공자가
+        HTTP 연결 풀·응답 캐시·health check 캐시·사용량 집계를 공유합니다.
+        
+        Args:
+            llm_config: LLM 설정
+            
+        Returns:
+            단계 이름별 LLMProviderManager 딕셔너리
+        """
+        health_cache = HealthCache(ttl=llm_config.health_check_ttl)
+        usage_ledger = UsageLedger()
+        single_flight = SingleFlight()
+        providers: Dict[tuple, LLMProviderManager] = {}
+        stage_providers = {}
+        
+        for stage in STAGE_NAMES:
+            settings = llm_config.for_stage(stage)
+            key = tuple(
+                tuple(value) if isinstance(value, list) else value
+                for value in settings.values()
+            )
+            if key not in providers:
+                providers[key] = LLMProviderManager(
+                    provider=llm_config.provider,
+                    model=settings['model'],
+                    base_url=settings['base_url'],
+                    temperature=settings['temperature'],
+                    max_tokens=settings['max_tokens'],
+                    cache=self.response_cache,
+                    http_pool=self.http_pool,
+                    lazy=llm_config.lazy,
+                    health_cache=health_cache,
+                    routing=llm_config.routing,
+                    concurrency=llm_config.concurrency,
+                    keep_alive=settings['keep_alive'],
+                    hedging=llm_config.hedging,
+                    client=settings['client'],
+                    usage_ledger=usage_ledger,
+                    single_flight=single_flight
+                )
+            stage_providers[stage] = providers[key]
+        return stage_providers
+    
+    def _unique_providers(self) -> list:
+        """중복을 제외한 단계별 LLM 제공자 목록"""
+        unique = []
+        for provider in self.stage_providers.values():
+            if all(provider is not other for other in unique):
+                unique.append(provider)
+        return unique
+    
+    def _provider_info(self) -> dict:
+        """
+        표시용 제공자 정보 (최종 응답 제공자 기준, 단계별 모델이 다르면 함께 표시)
+        
+        Returns:
+            제공자 정보 딕셔너리
+        """
+        info = self.llm_provider.get_provider_info()
+        if len(self._unique_providers()) > 1:
+            info['stages'] = {
+                stage: f"{provider.model} ({provider.base_url})"
+                for stage, provider in self.stage_providers.items()
+            }
+        return info
+    
     def _show_connection_help(self, provider: str):
         """
         연결 도움말 표시
@@ -83,6 +217,19 @@ class PromptOptimizerApp:
             print("   3. 'Local Server' 탭에서 서버 시작")
             print("   4. 포트 확인: 기본 포트는 1234")
     
+    def get_cache_stats(self) -> dict:
+        """
+        캐시 통계 수집
+        
+        Returns:
+            캐시 이름별 통계 딕셔너리
+        """
+        stats = {'단계 메모': self.prompt_optimizer.get_memo_stats()}
+        if self.response_cache is not None:
+            stats['응답 캐시'] = self.response_cache.get_stats()
+        stats['요청 병합'] = self.llm_provider.get_coalescing_stats()
+        return stats
+    
     def run(self, query: str) -> dict:
         """
         질의 실행
@@ -96,9 +243,16 @@ class PromptOptimizerApp:
         try:
             # 워크플로우 실행
             final_state = self.workflow.run(query)
+            self.workflow.state_history.flush()
+            self.prompt_optimizer.step_archive.flush()
+            if self.checkpointer is not None:
+                self.checkpointer.flush()
             
             # 요약 표시
-            self.display.show_summary()
+            self.display.show_summary(
+                self.get_cache_stats(),
+                self.llm_provider.get_usage_summary()
+            )
             
             # 오류 확인
             if final_state.get('error'):
@@ -116,7 +270,10 @@ class PromptOptimizerApp:
                 'optimized_prompt': final_state['optimized_prompt'],
                 'llm_response': final_state['llm_response'],
                 'analysis': final_state['analysis'],
-                'timestamps': final_state['timestamps']
+                'timestamps': {
+                    name: wall_to_datetime(timestamp).isoformat()
+                    for name, timestamp in final_state['timestamps'].items()
+                }
             }
             
         except OptimizationError as e:
@@ -131,6 +288,10 @@ class PromptOptimizerApp:
         """대화형 모드 실행"""
         self.display.show_info("대화형 모드 시작 (종료: 'quit' 또는 'exit')")
         
+        # 질의 사이에 모델이 언로드되지 않도록 유지
+        for provider in self._unique_providers():
+            provider.start_keep_warm(self.keep_warm_interval)
+        
         while True:
             try:
                 # 사용자 입력
@@ -157,6 +318,9 @@ class PromptOptimizerApp:
             
             except Exception as e:
                 self.display.show_error(e, "대화형 모드")
+        
+        for provider in self._unique_providers():
+            provider.stop_keep_warm()
 
 
 def main():
@@ -184,11 +348,17 @@ def main():
         help='대화형 모드 실행'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='응답 캐시 조회를 건너뛰고 LLM을 직접 호출'
+    )
+    
     args = parser.parse_args()
     
     try:
         # 앱 초기화
-        app = PromptOptimizerApp(config_path=args.config)
+        app = PromptOptimizerApp(config_path=args.config, no_cache=args.no_cache)
         
         # 실행 모드 결정
         if args.interactive:
@@ -1,19 +1,128 @@
 """
 프롬프트 최적화 모듈
 """
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+from langchain_core.runnables import RunnableLambda
+
+try:
+    from .llm_provider import CallMeter
+    from .run_context import RunContext
+    from .history_store import HistoryStore, monotonic_ns, to_datetime
+except ImportError:
+    from llm_provider import CallMeter
+    from run_context import RunContext
+    from history_store import HistoryStore, monotonic_ns, to_datetime
+
+
+# 단계 기록에 남길 입력/출력 미리보기 최대 길이 (전체 텍스트는 step_spill_path 파일에만 저장)
+STEP_PREVIEW_CHARS = 200
+
+
+def _preview(text: str) -> str:
+    """긴 텍스트를 STEP_PREVIEW_CHARS까지 자른 미리보기"""
+    if len(text) <= STEP_PREVIEW_CHARS:
+        return text
+    return text[:STEP_PREVIEW_CHARS] + "…"
 
 
-@dataclass
 class OptimizationStep:
-    """최적화 단계"""
-    name: str
-    description: str
-    timestamp: datetime
-    input_data: str
-    output_data: str
+    """
+    최적화 단계
+    
+    기록이 쌓여도 메모리가 늘지 않도록 입력/출력은 앞부분 미리보기와 전체 길이만 보관합니다.
+    """
+    
+    __slots__ = ('name', 'description', 'timestamp', 'input_data', 'output_data',
+                 'input_length', 'output_length', 'metrics')
+    
+    def __init__(self, name: str, description: str, timestamp: int,
+                 input_data: str, output_data: str,
+                 metrics: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: 단계 이름
+            description: 단계 설명
+            timestamp: 완료 시각 (monotonic_ns)
+            input_data: 단계 입력 (미리보기만 보관)
+            output_data: 단계 출력 (미리보기만 보관)
+            metrics: CallMeter 측정값 (ttft, usage 등)
+        """
+        self.name = name
+        self.description = description
+        self.timestamp = timestamp
+        self.input_data = _preview(input_data)
+        self.output_data = _preview(output_data)
+        self.input_length = len(input_data)
+        self.output_length = len(output_data)
+        self.metrics = metrics
+    
+    @property
+    def time(self) -> datetime:
+        """완료 시각 (벽시계)"""
+        return to_datetime(self.timestamp)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """단계를 딕셔너리로 변환"""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'timestamp': self.timestamp,
+            'time': self.time.isoformat(),
+            'input_data': self.input_data,
+            'output_data': self.output_data,
+            'input_length': self.input_length,
+            'output_length': self.output_length,
+            'metrics': self.metrics
+        }
+    
+    def __repr__(self) -> str:
+        return f"OptimizationStep(name={self.name!r}, input_data={self.input_data!r})"
+
+
+# 최적화 방식: 분석과 최적화를 각각 호출(staged) 또는 한 번에 호출(fused)
+OPTIMIZATION_MODES = ('staged', 'fused')
+
+# 통합 응답의 항목 이름 → 분석 결과 키
+FUSED_LABELS = {
+    '명확성': '명확성',
+    'clarity': '명확성',
+    '완전성': '완전성',
+    'completeness': '완전성',
+    '컨텍스트': '컨텍스트',
+    'context': '컨텍스트',
+}
+
+# 통합 응답에서 개선된 질의가 시작되는 항목 이름
+FUSED_QUERY_LABELS = ('개선된 질의', 'improved query')
+
+# 분석 응답 형식: 항목별 자유 텍스트(text) 또는 스키마로 제한한 JSON(json)
+ANALYSIS_FORMATS = ('text', 'json')
+
+# 구조화 분석 응답 스키마 (Ollama format / OpenAI 호환 response_format)
+ANALYSIS_SCHEMA: Dict[str, Any] = {
+    'type': 'object',
+    'properties': {
+        'clarity': {'type': 'integer', 'minimum': 1, 'maximum': 10},
+        'completeness': {'type': 'integer', 'minimum': 1, 'maximum': 10},
+        'context': {'type': 'string'},
+    },
+    'required': ['clarity', 'completeness', 'context'],
+    'additionalProperties': False,
+}
+
+# 구조화 분석 응답 필드 → 분석 결과 키
+ANALYSIS_FIELDS = {
+    'clarity': '명확성',
+    'completeness': '완전성',
+    'context': '컨텍스트',
+}
+
+# 분석 응답의 생성 컨텍스트를 보관할 최대 질의 수 (최적화 호출에서 꺼내 씀)
+MAX_PENDING_CONTEXTS = 32
 
 
 class OptimizationError(Exception):
@@ -24,13 +133,53 @@ class OptimizationError(Exception):
 class PromptOptimizer:
     """프롬프트 분석 및 최적화"""
     
-    def __init__(self, llm_provider):
+    def __init__(self, llm_provider, memo_size: int = 128,
+                 stage_providers: Optional[Dict[str, Any]] = None,
+                 generation: Optional[Dict[str, Dict[str, Any]]] = None,
+                 prefix_reuse: bool = False,
+                 mode: str = 'staged',
+                 analysis_format: str = 'text',
+                 history_size: int = 1000,
+                 step_spill_path: Optional[str] = None):
         """
         Args:
             llm_provider: LLMProviderManager 인스턴스
+            memo_size: 분석/최적화 결과 메모 최대 항목 수 (0이면 사용 안 함)
+            stage_providers: 단계별 LLMProviderManager ('analyze', 'optimize',
+                없는 단계는 llm_provider 사용)
+            generation: 단계별 생성 옵션 ('analyze', 'optimize'별
+                max_tokens, num_ctx, stop 딕셔너리, 없으면 제공자 기본값)
+            prefix_reuse: True면 분석/최적화 프롬프트를 질의로 시작하는 공통 접두사로
+                구성하고, 가능하면 분석 응답의 생성 컨텍스트를 최적화 호출에 재사용
+            mode: 'staged'(분석·최적화 각각 호출) 또는 'fused'(한 번의 호출로 함께 생성)
+            analysis_format: 'text'(항목별 자유 텍스트) 또는 'json'(스키마로 제한한
+                점수 JSON, staged 방식의 분석 단계에만 적용)
+            history_size: 실행 컨텍스트 없이 호출한 단계 기록의 최대 보관 수
+            step_spill_path: 모든 단계의 전체 입력/출력을 이어 쓸 JSON Lines 파일 경로
+                (None이면 미리보기만 남김)
         """
+        if mode not in OPTIMIZATION_MODES:
+            raise ValueError(f"지원하지 않는 최적화 방식: {mode}")
+        if analysis_format not in ANALYSIS_FORMATS:
+            raise ValueError(f"지원하지 않는 분석 형식: {analysis_format}")
         self.llm_provider = llm_provider
-        self.optimization_steps: List[OptimizationStep] = []
+        self.stage_providers = dict(stage_providers or {})
+        self.generation = {
+            stage: dict(options) for stage, options in (generation or {}).items() if options
+        }
+        # 실행 컨텍스트 없이 호출한 단계 기록 (공용, 오래된 기록부터 밀려남)
+        self.optimization_steps = HistoryStore(capacity=history_size)
+        # 전체 입력/출력 보관소 (메모리에 두지 않고 추가 즉시 파일로 씀)
+        self.step_archive = HistoryStore(capacity=0, spill_path=step_spill_path)
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.prefix_reuse = prefix_reuse
+        self.mode = mode
+        self.analysis_format = analysis_format
+        self._contexts: "OrderedDict[str, List[int]]" = OrderedDict()
     
     def _sanitize_text(self, text: str) -> str:
         """
@@ -38,7 +187,7 @@ class PromptOptimizer:
         
         Args:
             text: 원본 텍스트
-            
+        
         Returns:
             정리된 텍스트
         """
@@ -48,15 +197,221 @@ class PromptOptimizer:
         text = ' '.join(text.split())
         return text.strip()
     
-    def analyze_query(self, query: str) -> Dict[str, str]:
+    def _provider(self, stage: str):
         """
-        질의 분석
+        단계에 사용할 LLM 제공자 반환
+        
+        Args:
+            stage: 단계 이름 ('analyze' 또는 'optimize')
+        
+        Returns:
+            LLMProviderManager 인스턴스
+        """
+        return self.stage_providers.get(stage, self.llm_provider)
+    
+    def _invoke_kwargs(self, stage: str, meter: CallMeter,
+                       context: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        단계 LLM 호출 인자 (측정 객체와 생성 옵션)
+        
+        Args:
+            stage: 단계 이름 ('analyze' 또는 'optimize')
+            meter: 호출 측정 객체
+            context: 이어서 생성할 이전 응답의 생성 컨텍스트
+        
+        Returns:
+            invoke/ainvoke 키워드 인자
+        """
+        kwargs: Dict[str, Any] = {'meter': meter}
+        options = dict(self.generation.get(stage) or {})
+        if stage == 'analyze' and self.analysis_format == 'json':
+            # 스키마가 응답 끝을 정하므로 텍스트용 stop 시퀀스는 쓰지 않음
+            options.pop('stop', None)
+            options['format'] = ANALYSIS_SCHEMA
+        if context:
+            options['context'] = context
+        if options:
+            kwargs['options'] = options
+        return kwargs
+    
+    def _is_korean(self, text: str) -> bool:
+        """한글 포함 여부로 언어 감지 (간단한 방법)"""
+        return any(ord(char) >= 0xAC00 and ord(char) <= 0xD7A3 for char in text)
+    
+    def _memo_get(self, stage: str, query: str) -> Optional[Any]:
+        """
+        단계 결과 메모 조회
+        
+        Args:
+            stage: 단계 이름 ('analyze' 또는 'optimize')
+            query: 사용자 질의 (정리된 텍스트 기준으로 조회)
+        
+        Returns:
+            메모된 결과 (없으면 None)
+        """
+        if self.memo_size <= 0:
+            return None
+        key = (stage, self._sanitize_text(query))
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return self._memo[key]
+            self.memo_misses += 1
+            return None
+    
+    def _memo_set(self, stage: str, query: str, result: Any):
+        """
+        단계 결과 메모 저장 (LRU)
         
         Args:
+            stage: 단계 이름
             query: 사용자 질의
-            
+            result: 단계 결과
+        """
+        if self.memo_size <= 0:
+            return
+        key = (stage, self._sanitize_text(query))
+        with self._memo_lock:
+            self._memo[key] = result
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+    
+    def _replay_memo(self, text: str, meter: Optional[Any]):
+        """
+        메모 적중 결과를 측정 객체에 전달 (스트리밍이면 하나의 청크로 출력)
+        
+        Args:
+            text: 표시할 텍스트
+            meter: 호출 측정 객체
+        """
+        if meter is None:
+            return
+        meter.start()
+        if meter.streaming:
+            meter.record_token(text)
+        meter.finish()
+        meter.cached = True
+    
+    def config_fingerprint(self) -> Dict[str, Any]:
+        """
+        결과에 영향을 주는 최적화 설정 반환 (체크포인트 실행 식별자에 사용)
+        
         Returns:
-            분석 결과 딕셔너리
+            mode, analysis_format, prefix_reuse, generation, 단계별 제공자 설정 딕셔너리
+        """
+        stages = {}
+        for stage in ('analyze', 'optimize'):
+            fingerprint = getattr(self._provider(stage), 'config_fingerprint', None)
+            stages[stage] = fingerprint() if callable(fingerprint) else None
+        return {
+            'mode': self.mode,
+            'analysis_format': self.analysis_format,
+            'prefix_reuse': self.prefix_reuse,
+            'generation': self.generation,
+            'stages': stages
+        }
+    
+    def get_memo_stats(self) -> Dict[str, Any]:
+        """
+        단계 결과 메모 통계 반환
+        
+        Returns:
+            hits, misses, entries, hit_rate 딕셔너리
+        """
+        total = self.memo_hits + self.memo_misses
+        return {
+            'hits': self.memo_hits,
+            'misses': self.memo_misses,
+            'entries': len(self._memo),
+            'hit_rate': self.memo_hits / total if total else 0.0
+        }
+    
+    def clear_memo(self):
+        """단계 결과 메모 초기화"""
+        with self._memo_lock:
+            self._memo.clear()
+            self._contexts.clear()
+    
+    @property
+    def optimization_uses_analysis(self) -> bool:
+        """
+        최적화 호출이 분석 결과에 의존하는지 여부
+        
+        현재 최적화 프롬프트는 분석 결과를 사용하지 않으므로, 분석 응답의
+        생성 컨텍스트에 이어서 최적화하는 경우에만 True입니다. 분석 결과를 넣는
+        프롬프트로 바꾸면 여기서 True를 반환해야 워크플로우가 순차 실행됩니다.
+        """
+        return self._reuses_context()
+    
+    def _reuses_context(self) -> bool:
+        """
+        분석 응답의 생성 컨텍스트를 최적화 호출에 넘길 수 있는지 여부
+        
+        두 단계가 같은 제공자(같은 모델)를 사용하고 제공자가 context를
+        지원할 때만 재사용합니다.
+        """
+        provider = self._provider('analyze')
+        return (
+            self.prefix_reuse
+            and provider is self._provider('optimize')
+            and getattr(provider, 'supports_context', False) is True
+        )
+    
+    def _store_context(self, query: str, meter: CallMeter,
+                       run: Optional[RunContext] = None):
+        """
+        분석 호출의 생성 컨텍스트 보관
+        
+        실행 컨텍스트가 있으면 그 실행에만 보관하므로 같은 질의를 동시에
+        실행해도 다른 실행의 컨텍스트를 가져가지 않습니다.
+        
+        Args:
+            query: 사용자 질의
+            meter: 분석 호출 측정 객체
+            run: 실행 컨텍스트
+        """
+        if not self._reuses_context() or not meter.context:
+            return
+        if run is not None:
+            run.store_context(meter.context)
+            return
+        key = self._sanitize_text(query)
+        with self._memo_lock:
+            self._contexts[key] = meter.context
+            self._contexts.move_to_end(key)
+            while len(self._contexts) > MAX_PENDING_CONTEXTS:
+                self._contexts.popitem(last=False)
+    
+    def _take_context(self, query: str,
+                      run: Optional[RunContext] = None) -> Optional[List[int]]:
+        """
+        보관된 분석 컨텍스트 꺼내기 (한 번만 사용)
+        
+        Args:
+            query: 사용자 질의
+            run: 실행 컨텍스트
+        
+        Returns:
+            생성 컨텍스트 (없으면 None)
+        """
+        if not self._reuses_context():
+            return None
+        if run is not None:
+            return run.take_context()
+        with self._memo_lock:
+            return self._contexts.pop(self._sanitize_text(query), None)
+    
+    def _validate_query(self, query: str):
+        """
+        분석 가능한 질의인지 확인
+        
+        Args:
+            query: 사용자 질의
+        
+        Raises:
+            OptimizationError: 빈 질의이거나 너무 긴 경우
         """
         if not query or not query.strip():
             raise OptimizationError("빈 질의는 분석할 수 없습니다.")
@@ -65,16 +420,31 @@ class PromptOptimizer:
         query_length = len(query)
         if query_length > 5000:
             raise OptimizationError("질의가 너무 깁니다 (최대 5000자).")
+    
+    def _build_analysis_prompt(self, query: str) -> str:
+        """
+        질의 분석 프롬프트 생성
+        
+        Args:
+            query: 사용자 질의
+        
+        Returns:
+            분석 프롬프트
+        """
+        self._validate_query(query)
         
         # 텍스트 정리
         clean_query = self._sanitize_text(query)
         
-        # 언어 감지 (간단한 방법)
-        is_korean = any(ord(char) >= 0xAC00 and ord(char) <= 0xD7A3 for char in query)
+        if self.analysis_format == 'json':
+            return self._shared_prefix(clean_query) + self._json_analysis_instruction(query)
+        
+        if self.prefix_reuse:
+            return self._shared_prefix(clean_query) + self._analysis_instruction(query)
         
         # LLM을 사용한 질의 분석 (간단한 프롬프트)
-        if is_korean:
-            analysis_prompt = f"""질의를 분석하세요.
+        if self._is_korean(query):
+            return f"""질의를 분석하세요.
 
 질의: {clean_query}
 
@@ -85,7 +455,7 @@ class PromptOptimizer:
 
 각 항목을 한 줄로 답변하세요."""
         else:
-            analysis_prompt = f"""Analyze this query.
+            return f"""Analyze this query.
 
 Query: {clean_query}
 
@@ -95,94 +465,658 @@ Rate (1-10):
 3. Needed context
 
 Answer each in one line."""
-
+    
+    def _parse_analysis(self, analysis_response: str) -> Dict[str, str]:
+        """
+        분석 응답 파싱
+        
+        Args:
+            analysis_response: LLM 분석 응답
+        
+        Returns:
+            분석 결과 딕셔너리
+        """
+        # 분석 결과 파싱 (간단한 파싱)
+        analysis = {
+            '명확성': '분석 중',
+            '완전성': '분석 중',
+            '컨텍스트': '분석 중'
+        }
+        
+        # 응답에서 정보 추출 시도
+        lines = analysis_response.strip().split('\n')
+        for line in lines:
+            if '명확성' in line:
+                analysis['명확성'] = line.split(':', 1)[-1].strip() if ':' in line else line
+            elif '완전성' in line:
+                analysis['완전성'] = line.split(':', 1)[-1].strip() if ':' in line else line
+            elif '컨텍스트' in line:
+                analysis['컨텍스트'] = line.split(':', 1)[-1].strip() if ':' in line else line
+        
+        return analysis
+    
+    def _parse_response(self, analysis_response: str) -> Dict[str, Any]:
+        """설정된 분석 형식에 맞는 파서로 분석 응답 파싱"""
+        if self.analysis_format == 'json':
+            return self._parse_structured_analysis(analysis_response)
+        return self._parse_analysis(analysis_response)
+    
+    def _parse_structured_analysis(self, analysis_response: str) -> Dict[str, Any]:
+        """
+        구조화(JSON) 분석 응답 파싱
+        
+        응답 앞뒤에 붙은 텍스트는 무시하고 첫 '{'부터 마지막 '}'까지를
+        JSON으로 읽은 뒤, 점수는 1~10 정수, 컨텍스트는 문자열인지 확인합니다.
+        
+        Args:
+            analysis_response: LLM 분석 응답 (ANALYSIS_SCHEMA 형식)
+        
+        Returns:
+            분석 결과 딕셔너리 (명확성·완전성은 int, 컨텍스트는 str)
+        
+        Raises:
+            OptimizationError: JSON이 아니거나 스키마와 맞지 않는 경우
+        """
+        start = analysis_response.find('{')
+        end = analysis_response.rfind('}')
         try:
-            analysis_response = self.llm_provider.invoke(analysis_prompt)
-            
-            # 분석 결과 파싱 (간단한 파싱)
-            analysis = {
-                '명확성': '분석 중',
-                '완전성': '분석 중',
-                '컨텍스트': '분석 중'
-            }
-            
-            # 응답에서 정보 추출 시도
-            lines = analysis_response.strip().split('\n')
-            for line in lines:
-                if '명확성' in line:
-                    analysis['명확성'] = line.split(':', 1)[-1].strip() if ':' in line else line
-                elif '완전성' in line:
-                    analysis['완전성'] = line.split(':', 1)[-1].strip() if ':' in line else line
-                elif '컨텍스트' in line:
-                    analysis['컨텍스트'] = line.split(':', 1)[-1].strip() if ':' in line else line
-            
-            # 단계 기록
-            self.optimization_steps.append(OptimizationStep(
-                name="질의 분석",
-                description="사용자 질의의 명확성과 완전성 평가",
-                timestamp=datetime.now(),
-                input_data=query,
-                output_data=str(analysis)
+            if start < 0 or end < start:
+                raise ValueError("JSON 객체가 없습니다")
+            data = json.loads(analysis_response[start:end + 1])
+        except ValueError as e:
+            raise OptimizationError(f"분석 응답이 올바른 JSON이 아닙니다: {e}")
+        if not isinstance(data, dict):
+            raise OptimizationError("분석 응답이 JSON 객체가 아닙니다.")
+        
+        analysis: Dict[str, Any] = {}
+        for field, key in ANALYSIS_FIELDS.items():
+            value = data.get(field)
+            if field == 'context':
+                if not isinstance(value, str):
+                    raise OptimizationError(f"분석 응답의 {field} 값은 문자열이어야 합니다.")
+                analysis[key] = value.strip()
+            else:
+                # bool은 int의 하위 타입이므로 따로 제외
+                if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 10:
+                    raise OptimizationError(f"분석 응답의 {field} 값은 1~10 정수여야 합니다.")
+                analysis[key] = value
+        return analysis
+    
+    def _add_step(self, run: Optional[RunContext], name: str, description: str,
+                  input_data: str, output_data: str, metrics: Dict[str, Any]):
+        """
+        단계 기록 추가 (실행 컨텍스트가 있으면 그 실행에, 없으면 공용 기록에)
+        
+        step_spill_path가 있으면 전체 입력/출력을 파일에 함께 기록합니다.
+        
+        Args:
+            run: 실행 컨텍스트
+            name: 단계 이름
+            description: 단계 설명
+            input_data: 단계 입력
+            output_data: 단계 출력
+            metrics: CallMeter 측정값
+        """
+        step = OptimizationStep(name, description, monotonic_ns(),
+                                input_data, output_data, metrics)
+        if self.step_archive.spill_path is not None:
+            self.step_archive.append(dict(
+                step.as_dict(),
+                run_id=run.run_id if run is not None else None,
+                input_data=input_data,
+                output_data=output_data
             ))
-            
-            return analysis
-            
+        if run is not None:
+            run.add_step(step)
+            return
+        self.optimization_steps.append(step)
+    
+    def _record_analysis(self, query: str, analysis: Dict[str, str],
+                         meter: CallMeter,
+                         run: Optional[RunContext] = None) -> Dict[str, str]:
+        """
+        분석 단계 기록
+        
+        Args:
+            query: 사용자 질의
+            analysis: 분석 결과
+            meter: 분석 호출 측정 객체
+            run: 실행 컨텍스트
+        
+        Returns:
+            호출자에게 돌려줄 분석 결과 사본
+        """
+        self._add_step(
+            run,
+            name="질의 분석",
+            description="사용자 질의의 명확성과 완전성 평가",
+            input_data=query,
+            output_data=str(analysis),
+            metrics=meter.as_dict()
+        )
+        return dict(analysis)
+    
+    def analyze_query(self, query: str, meter: Optional[Any] = None,
+                      run: Optional[RunContext] = None) -> Dict[str, str]:
+        """
+        질의 분석
+        
+        Args:
+            query: 사용자 질의
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            분석 결과 딕셔너리
+        """
+        analysis_prompt = self._build_analysis_prompt(query)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._memo_get('analyze', query)
+        if memoized is not None:
+            self._replay_memo(self._format_analysis(memoized), meter)
+            return self._record_analysis(query, memoized, meter, run)
+        
+        try:
+            analysis_response = self._provider('analyze').invoke(
+                analysis_prompt, **self._invoke_kwargs('analyze', meter)
+            )
+            analysis = self._parse_response(analysis_response)
+            self._memo_set('analyze', query, analysis)
+            self._store_context(query, meter, run)
+            return self._record_analysis(query, analysis, meter, run)
+        
         except Exception as e:
             raise OptimizationError(f"질의 분석 실패: {e}")
     
-    def optimize_prompt(self, query: str, analysis: Dict[str, str]) -> str:
+    async def aanalyze_query(self, query: str, meter: Optional[Any] = None,
+                             run: Optional[RunContext] = None) -> Dict[str, str]:
         """
-        프롬프트 최적화
+        질의 분석 (비동기)
+        
+        Args:
+            query: 사용자 질의
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            분석 결과 딕셔너리
+        """
+        analysis_prompt = self._build_analysis_prompt(query)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._memo_get('analyze', query)
+        if memoized is not None:
+            self._replay_memo(self._format_analysis(memoized), meter)
+            return self._record_analysis(query, memoized, meter, run)
+        
+        try:
+            analysis_response = await self._provider('analyze').ainvoke(
+                analysis_prompt, **self._invoke_kwargs('analyze', meter)
+            )
+            analysis = self._parse_response(analysis_response)
+            self._memo_set('analyze', query, analysis)
+            self._store_context(query, meter, run)
+            return self._record_analysis(query, analysis, meter, run)
+        
+        except Exception as e:
+            raise OptimizationError(f"질의 분석 실패: {e}")
+    
+    def _shared_prefix(self, clean_query: str) -> str:
+        """
+        분석/최적화 프롬프트 공통 접두사
+        
+        질의를 프롬프트 맨 앞에 두어 두 호출의 앞부분이 같도록 하므로,
+        서버의 프롬프트 캐시가 질의 부분의 prefill을 재사용할 수 있습니다.
+        
+        Args:
+            clean_query: 정리된 질의
+        
+        Returns:
+            공통 접두사
+        """
+        if self._is_korean(clean_query):
+            return f"질의: {clean_query}\n\n"
+        return f"Query: {clean_query}\n\n"
+    
+    def _analysis_instruction(self, query: str) -> str:
+        """공통 접두사 뒤에 붙는 분석 지시문"""
+        if self._is_korean(query):
+            return """위 질의를 분석하세요.
+
+평가 (1-10점):
+1. 명확성
+2. 완전성
+3. 필요한 컨텍스트
+
+각 항목을 한 줄로 답변하세요."""
+        return """Analyze the query above.
+
+Rate (1-10):
+1. Clarity
+2. Completeness
+3. Needed context
+
+Answer each in one line."""
+    
+    def _json_analysis_instruction(self, query: str) -> str:
+        """공통 접두사 뒤에 붙는 구조화(JSON) 분석 지시문"""
+        if self._is_korean(query):
+            return """위 질의를 평가하여 JSON으로만 답하세요.
+clarity, completeness: 1-10 정수 점수
+context: 답변에 필요한 추가 컨텍스트 (짧은 한 문장)"""
+        return """Rate the query above and answer only in JSON.
+clarity, completeness: integer score 1-10
+context: additional context needed to answer (one short sentence)"""
+    
+    def _optimization_instruction(self, query: str) -> str:
+        """공통 접두사 뒤에 붙는 최적화 지시문 (컨텍스트 재사용 시 단독 프롬프트)"""
+        if self._is_korean(query):
+            return """위 질의를 개선하세요.
+더 구체적이고 명확하게 작성하세요.
+개선된 질의만 출력하세요."""
+        return """Improve the query above.
+Make it more specific and clear.
+Output only the improved query."""
+    
+    def _build_optimization_prompt(self, query: str, analysis: Dict[str, str]) -> str:
+        """
+        최적화 프롬프트 생성
         
         Args:
             query: 원본 질의
             analysis: 분석 결과
-            
+        
         Returns:
-            최적화된 프롬프트
+            최적화 프롬프트
         """
         # 텍스트 정리
         clean_query = self._sanitize_text(query)
         
-        # 언어 감지
-        is_korean = any(ord(char) >= 0xAC00 and ord(char) <= 0xD7A3 for char in query)
+        if self.prefix_reuse:
+            return self._shared_prefix(clean_query) + self._optimization_instruction(query)
         
         # 최적화 프롬프트 생성 (매우 단순화)
-        if is_korean:
-            optimization_prompt = f"""질의를 개선하세요.
+        if self._is_korean(query):
+            return f"""질의를 개선하세요.
 
 원본: {clean_query}
 
 더 구체적이고 명확하게 작성하세요.
 개선된 질의만 출력하세요."""
         else:
-            optimization_prompt = f"""Improve this query.
+            return f"""Improve this query.
 
 Original: {clean_query}
 
 Make it more specific and clear.
 Output only the improved query."""
-
+    
+    def _record_optimization(self, query: str, optimized: str, meter: CallMeter,
+                             run: Optional[RunContext] = None) -> str:
+        """
+        최적화 단계 기록
+        
+        Args:
+            query: 원본 질의
+            optimized: 최적화된 프롬프트
+            meter: 최적화 호출 측정 객체
+            run: 실행 컨텍스트
+        
+        Returns:
+            최적화된 프롬프트
+        """
+        self._add_step(
+            run,
+            name="프롬프트 최적화",
+            description="분석 결과를 바탕으로 프롬프트 개선",
+            input_data=query,
+            output_data=optimized,
+            metrics=meter.as_dict()
+        )
+        return optimized
+    
+    def optimize_prompt(self, query: str, analysis: Dict[str, str],
+                        meter: Optional[Any] = None,
+                        run: Optional[RunContext] = None) -> str:
+        """
+        프롬프트 최적화
+        
+        Args:
+            query: 원본 질의
+            analysis: 분석 결과
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            최적화된 프롬프트
+        """
+        optimization_prompt = self._build_optimization_prompt(query, analysis)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._memo_get('optimize', query)
+        if memoized is not None:
+            self._replay_memo(memoized, meter)
+            return self._record_optimization(query, memoized, meter, run)
+        
         try:
-            optimized = self.llm_provider.invoke(optimization_prompt)
+            # 분석 응답에 이어서 생성하면 질의 prefill을 다시 하지 않음
+            context = self._take_context(query, run)
+            if context:
+                optimization_prompt = self._optimization_instruction(query)
+            optimized = self._provider('optimize').invoke(
+                optimization_prompt, **self._invoke_kwargs('optimize', meter, context)
+            )
             
             # 최적화 결과 정리
             optimized = optimized.strip()
+            self._memo_set('optimize', query, optimized)
+            return self._record_optimization(query, optimized, meter, run)
+        
+        except Exception as e:
+            raise OptimizationError(f"프롬프트 최적화 실패: {e}")
+    
+    async def aoptimize_prompt(self, query: str, analysis: Dict[str, str],
+                               meter: Optional[Any] = None,
+                               run: Optional[RunContext] = None) -> str:
+        """
+        프롬프트 최적화 (비동기)
+        
+        Args:
+            query: 원본 질의
+            analysis: 분석 결과
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            최적화된 프롬프트
+        """
+        optimization_prompt = self._build_optimization_prompt(query, analysis)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._memo_get('optimize', query)
+        if memoized is not None:
+            self._replay_memo(memoized, meter)
+            return self._record_optimization(query, memoized, meter, run)
+        
+        try:
+            # 분석 응답에 이어서 생성하면 질의 prefill을 다시 하지 않음
+            context = self._take_context(query, run)
+            if context:
+                optimization_prompt = self._optimization_instruction(query)
+            optimized = await self._provider('optimize').ainvoke(
+                optimization_prompt, **self._invoke_kwargs('optimize', meter, context)
+            )
             
-            # 단계 기록
-            self.optimization_steps.append(OptimizationStep(
-                name="프롬프트 최적화",
-                description="분석 결과를 바탕으로 프롬프트 개선",
-                timestamp=datetime.now(),
-                input_data=query,
-                output_data=optimized
-            ))
-            
-            return optimized
-            
+            # 최적화 결과 정리
+            optimized = optimized.strip()
+            self._memo_set('optimize', query, optimized)
+            return self._record_optimization(query, optimized, meter, run)
+        
         except Exception as e:
             raise OptimizationError(f"프롬프트 최적화 실패: {e}")
     
+    def _build_fused_prompt(self, query: str) -> str:
+        """
+        분석과 최적화를 한 번에 요청하는 프롬프트 생성
+        
+        Args:
+            query: 사용자 질의
+        
+        Returns:
+            통합 프롬프트 (항목별 한 줄 형식의 응답 요청)
+        """
+        self._validate_query(query)
+        clean_query = self._sanitize_text(query)
+        
+        if self._is_korean(query):
+            return f"""질의를 분석하고 개선하세요.
+
+질의: {clean_query}
+
+아래 형식 그대로 답변하세요.
+명확성: <1-10점과 한 줄 설명>
+완전성: <1-10점과 한 줄 설명>
+컨텍스트: <필요한 컨텍스트>
+개선된 질의: <더 구체적이고 명확하게 다시 쓴 질의>"""
+        else:
+            return f"""Analyze and improve this query.
+
+Query: {clean_query}
+
+Answer in exactly this format.
+Clarity: <1-10 with a one-line reason>
+Completeness: <1-10 with a one-line reason>
+Context: <needed context>
+Improved query: <a more specific and clear rewrite of the query>"""
+    
+    def _parse_fused(self, response: str) -> Tuple[Dict[str, str], str]:
+        """
+        통합 응답 파싱
+        
+        Args:
+            response: LLM 통합 응답
+        
+        Returns:
+            (분석 결과 딕셔너리, 개선된 질의)
+        
+        Raises:
+            OptimizationError: 개선된 질의 항목이 없는 경우
+        """
+        analysis = {
+            '명확성': '분석 중',
+            '완전성': '분석 중',
+            '컨텍스트': '분석 중'
+        }
+        optimized_lines: Optional[List[str]] = None
+        
+        for line in response.strip().split('\n'):
+            label, sep, value = line.partition(':')
+            label = label.strip().strip('*#-0123456789. ').lower()
+            if optimized_lines is not None:
+                # 개선된 질의 이후의 줄은 질의의 일부
+                optimized_lines.append(line.strip())
+            elif sep and label in FUSED_QUERY_LABELS:
+                optimized_lines = [value.strip()]
+            elif sep and label in FUSED_LABELS:
+                analysis[FUSED_LABELS[label]] = value.strip()
+        
+        optimized = '\n'.join(optimized_lines or []).strip()
+        if not optimized:
+            raise OptimizationError("응답에서 개선된 질의를 찾을 수 없습니다.")
+        return analysis, optimized
+    
+    def _record_fused(self, query: str, analysis: Dict[str, str], optimized: str,
+                      meter: CallMeter,
+                      run: Optional[RunContext] = None) -> Tuple[Dict[str, str], str]:
+        """
+        통합 단계 기록
+        
+        Args:
+            query: 원본 질의
+            analysis: 분석 결과
+            optimized: 최적화된 프롬프트
+            meter: 통합 호출 측정 객체
+            run: 실행 컨텍스트
+        
+        Returns:
+            (분석 결과 사본, 최적화된 프롬프트)
+        """
+        self._add_step(
+            run,
+            name="질의 분석 및 최적화",
+            description="한 번의 호출로 질의를 평가하고 프롬프트 개선",
+            input_data=query,
+            output_data=f"{analysis}\n{optimized}",
+            metrics=meter.as_dict()
+        )
+        return dict(analysis), optimized
+    
+    def _fused_memo_get(self, query: str) -> Optional[Tuple[Dict[str, str], str]]:
+        """
+        분석과 최적화 결과가 모두 메모되어 있으면 반환
+        
+        통합 호출은 두 결과가 모두 있어야 건너뛸 수 있으므로, 두 키를 함께 조회한
+        뒤 조회 한 번을 적중 또는 누락 한 번으로 기록합니다.
+        
+        Args:
+            query: 사용자 질의 (정리된 텍스트 기준으로 조회)
+        
+        Returns:
+            (분석 결과, 최적화된 프롬프트) 튜플 (하나라도 없으면 None)
+        """
+        if self.memo_size <= 0:
+            return None
+        sanitized = self._sanitize_text(query)
+        analyze_key, optimize_key = ('analyze', sanitized), ('optimize', sanitized)
+        with self._memo_lock:
+            if analyze_key in self._memo and optimize_key in self._memo:
+                self._memo.move_to_end(analyze_key)
+                self._memo.move_to_end(optimize_key)
+                self.memo_hits += 1
+                return self._memo[analyze_key], self._memo[optimize_key]
+            self.memo_misses += 1
+            return None
+    
+    def _fused_memo_set(self, query: str, analysis: Dict[str, str], optimized: str):
+        """통합 결과를 단계별 메모에 저장"""
+        self._memo_set('analyze', query, analysis)
+        self._memo_set('optimize', query, optimized)
+    
+    def analyze_and_optimize(self, query: str, meter: Optional[Any] = None,
+                             run: Optional[RunContext] = None) -> Tuple[Dict[str, str], str]:
+        """
+        질의 분석과 프롬프트 최적화를 한 번의 LLM 호출로 수행
+        
+        분석 단계의 제공자와 'fused' 생성 옵션을 사용합니다.
+        
+        Args:
+            query: 사용자 질의
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            (분석 결과 딕셔너리, 최적화된 프롬프트)
+        """
+        fused_prompt = self._build_fused_prompt(query)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._fused_memo_get(query)
+        if memoized is not None:
+            analysis, optimized = memoized
+            self._replay_memo(f"{self._format_analysis(analysis)}\n{optimized}", meter)
+            return self._record_fused(query, analysis, optimized, meter, run)
+        
+        try:
+            response = self._provider('analyze').invoke(
+                fused_prompt, **self._invoke_kwargs('fused', meter)
+            )
+            analysis, optimized = self._parse_fused(response)
+            self._fused_memo_set(query, analysis, optimized)
+            return self._record_fused(query, analysis, optimized, meter, run)
+        
+        except Exception as e:
+            raise OptimizationError(f"질의 분석 및 최적화 실패: {e}")
+    
+    async def aanalyze_and_optimize(self, query: str, meter: Optional[Any] = None,
+                                    run: Optional[RunContext] = None
+                                    ) -> Tuple[Dict[str, str], str]:
+        """
+        질의 분석과 프롬프트 최적화를 한 번의 LLM 호출로 수행 (비동기)
+        
+        Args:
+            query: 사용자 질의
+            meter: 호출 측정 객체 (CallMeter, 스트리밍 시 토큰 콜백 포함)
+            run: 실행 컨텍스트 (RunContext, 단계 기록을 이 실행에 보관)
+        
+        Returns:
+            (분석 결과 딕셔너리, 최적화된 프롬프트)
+        """
+        fused_prompt = self._build_fused_prompt(query)
+        meter = meter if meter is not None else CallMeter()
+        
+        memoized = self._fused_memo_get(query)
+        if memoized is not None:
+            analysis, optimized = memoized
+            self._replay_memo(f"{self._format_analysis(analysis)}\n{optimized}", meter)
+            return self._record_fused(query, analysis, optimized, meter, run)
+        
+        try:
+            response = await self._provider('analyze').ainvoke(
+                fused_prompt, **self._invoke_kwargs('fused', meter)
+            )
+            analysis, optimized = self._parse_fused(response)
+            self._fused_memo_set(query, analysis, optimized)
+            return self._record_fused(query, analysis, optimized, meter, run)
+        
+        except Exception as e:
+            raise OptimizationError(f"질의 분석 및 최적화 실패: {e}")
+    
+    def optimize_many(self, queries: List[str],
+                      max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        여러 질의 일괄 분석 및 최적화
+        
+        Args:
+            queries: 원본 질의 리스트
+            max_concurrency: 최대 동시 처리 질의 수 (None이면 LangChain 기본값)
+        
+        Returns:
+            입력 순서대로 정렬된 결과 리스트
+            (query, analysis, optimized_prompt, error 키를 가진 딕셔너리)
+        """
+        results = self._batch_runnable().batch(
+            list(queries),
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+        return [self._batch_result(q, r) for q, r in zip(queries, results)]
+    
+    async def aoptimize_many(self, queries: List[str],
+                             max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        여러 질의 일괄 분석 및 최적화 (비동기)
+        
+        Args:
+            queries: 원본 질의 리스트
+            max_concurrency: 최대 동시 처리 질의 수 (None이면 제한 없음)
+        
+        Returns:
+            입력 순서대로 정렬된 결과 리스트
+            (query, analysis, optimized_prompt, error 키를 가진 딕셔너리)
+        """
+        results = await self._batch_runnable().abatch(
+            list(queries),
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+        return [self._batch_result(q, r) for q, r in zip(queries, results)]
+    
+    def _batch_runnable(self) -> RunnableLambda:
+        """질의 하나를 분석하고 최적화하는 Runnable 생성"""
+        def optimize_one(query: str) -> Tuple[Dict[str, str], str]:
+            if self.mode == 'fused':
+                return self.analyze_and_optimize(query)
+            analysis = self.analyze_query(query)
+            return analysis, self.optimize_prompt(query, analysis)
+        
+        async def aoptimize_one(query: str) -> Tuple[Dict[str, str], str]:
+            if self.mode == 'fused':
+                return await self.aanalyze_and_optimize(query)
+            analysis = await self.aanalyze_query(query)
+            return analysis, await self.aoptimize_prompt(query, analysis)
+        
+        return RunnableLambda(optimize_one, afunc=aoptimize_one)
+    
+    def _batch_result(self, query: str, result: Any) -> Dict[str, Any]:
+        """일괄 처리 결과를 딕셔너리로 변환"""
+        if isinstance(result, Exception):
+            return {'query': query, 'analysis': None, 'optimized_prompt': None,
+                    'error': str(result)}
+        analysis, optimized = result
+        return {'query': query, 'analysis': analysis, 'optimized_prompt': optimized,
+                'error': None}
+    
     def _format_analysis(self, analysis: Dict[str, str]) -> str:
         """분석 결과 포맷팅"""
         formatted = []
@@ -197,7 +1131,7 @@ Output only the improved query."""
         Args:
             original: 원본 질의
             optimized: 최적화된 프롬프트
-            
+        
         Returns:
             의도가 보존되었는지 여부
         """
@@ -224,7 +1158,7 @@ Output only the improved query."""
         
         Args:
             query: 질의
-            
+        
         Returns:
             잘 구성되었는지 여부
         """
@@ -247,11 +1181,14 @@ Output only the improved query."""
         """
         최적화 단계 목록 반환
         
+        실행 컨텍스트 없이 호출한 단계 중 최근 history_size개만 포함합니다
+        (실행별 기록은 RunContext.steps).
+        
         Returns:
             최적화 단계 리스트
         """
-        return self.optimization_steps
+        return self.optimization_steps.records()
     
     def clear_steps(self):
         """최적화 단계 초기화"""
-        self.optimization_steps = []
+        self.optimization_steps.clear()
@@ -0,0 +1,178 @@
+"""
+LLM 응답 캐시 모듈
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    SQLite 기반 영구 LLM 응답 캐시
+    
+    provider, 모델, 생성 파라미터, 프롬프트로 만든 해시를 키로 사용하므로
+    프로세스를 다시 시작해도 동일한 요청은 LLM을 호출하지 않습니다.
+    TTL이 지난 항목은 조회 시 삭제되고, 최대 항목 수를 넘으면
+    가장 오래 사용하지 않은 항목부터 제거합니다 (LRU).
+    """
+    
+    def __init__(self, path: str = ".cache/llm_responses.db",
+                 ttl: Optional[float] = None, max_entries: int = 10000,
+                 bypass: bool = False):
+        """
+        Args:
+            path: SQLite 파일 경로 (':memory:'이면 메모리 캐시)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+            max_entries: 최대 항목 수
+            bypass: True면 조회를 건너뛰고 새 응답으로 캐시를 갱신
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if path != ':memory:' and directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access "
+            "ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()[0]
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any], prompt: str) -> str:
+        """
+        캐시 키 생성
+        
+        Args:
+            params: provider, 모델, 생성 파라미터 딕셔너리
+            prompt: 프롬프트
+        
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = json.dumps([params, prompt], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회
+        
+        Args:
+            key: 캐시 키
+        
+        Returns:
+            캐시된 응답 (없거나 만료되었으면 None)
+        """
+        if self.bypass:
+            return None
+        
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            response, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._entries -= 1
+                self.misses += 1
+                return None
+            
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return response
+    
+    def set(self, key: str, response: str):
+        """
+        응답 저장
+        
+        Args:
+            key: 캐시 키
+            response: LLM 응답
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE responses SET response = ?, created_at = ?, last_access = ? "
+                "WHERE key = ?",
+                (response, now, now, key)
+            )
+            if cursor.rowcount == 0:
+                self._conn.execute(
+                    "INSERT INTO responses (key, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                self._entries += 1
+            
+            # LRU 제거
+            excess = self._entries - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (excess,)
+                )
+                self._entries -= excess
+            self._conn.commit()
+    
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._entries = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 반환
+        
+        Returns:
+            hits, misses, entries, hit_rate 딕셔너리
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': self._entries,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+    
+    def close(self):
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,83 @@
+"""
+실행 단위 컨텍스트 모듈
+"""
+import threading
+import uuid
+from typing import Any, List, Optional
+
+
+class RunContext:
+    """
+    질의 한 번의 실행 기록
+    
+    최적화 단계 기록, 워크플로우 단계 기록, 분석 응답의 생성 컨텍스트를
+    실행마다 따로 보관합니다. PromptOptimizer, 워크플로우, 제공자 인스턴스를
+    여러 스레드나 이벤트 루프 작업이 함께 사용해도 기록이 섞이지 않으며,
+    같은 실행의 병렬 노드가 동시에 기록할 수 있도록 잠금으로 보호합니다.
+    """
+    
+    def __init__(self, query: Optional[str] = None, run_id: Optional[str] = None):
+        """
+        Args:
+            query: 실행할 사용자 질의
+            run_id: 실행 식별자 (None이면 새로 생성)
+        """
+        self.run_id = run_id or uuid.uuid4().hex
+        self.query = query
+        self._steps: List[Any] = []
+        self._history: List[Any] = []
+        self._generation_context: Optional[List[int]] = None
+        self._lock = threading.Lock()
+    
+    def add_step(self, step: Any):
+        """
+        최적화 단계 기록 추가
+        
+        Args:
+            step: OptimizationStep
+        """
+        with self._lock:
+            self._steps.append(step)
+    
+    def add_record(self, record: Any):
+        """
+        워크플로우 단계 기록 추가
+        
+        Args:
+            record: HistoryRecord
+        """
+        with self._lock:
+            self._history.append(record)
+    
+    @property
+    def steps(self) -> List[Any]:
+        """최적화 단계 기록 (사본)"""
+        with self._lock:
+            return list(self._steps)
+    
+    @property
+    def history(self) -> List[Any]:
+        """워크플로우 단계 기록 (사본)"""
+        with self._lock:
+            return list(self._history)
+    
+    def store_context(self, context: List[int]):
+        """
+        분석 응답의 생성 컨텍스트 보관
+        
+        Args:
+            context: 생성 컨텍스트
+        """
+        with self._lock:
+            self._generation_context = list(context)
+    
+    def take_context(self) -> Optional[List[int]]:
+        """
+        보관된 생성 컨텍스트 꺼내기 (한 번만 사용)
+        
+        Returns:
+            생성 컨텍스트 (없으면 None)
+        """
+        with self._lock:
+            context, self._generation_context = self._generation_context, None
+            return context
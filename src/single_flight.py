@@ -0,0 +1,148 @@
+"""
+동일 요청 병합(single-flight) 모듈
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """진행 중인 동기 호출"""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    동일한 키의 진행 중인 호출 병합
+    
+    같은 키로 호출이 이미 진행 중이면 새로 실행하지 않고 그 결과를 기다려
+    함께 사용합니다. 동기 호출은 스레드 간에, 비동기 호출은 같은 이벤트 루프
+    안에서 병합됩니다. 호출이 끝나면 키를 바로 제거하므로 결과를 캐시하지는 않습니다.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        호출 실행 또는 진행 중인 호출에 합류
+        
+        Args:
+            key: 요청 키
+            fn: 실제 호출 함수
+        
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+    
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        비동기 호출 실행 또는 진행 중인 호출에 합류
+        
+        실행 중인 호출이 취소되면(헤지에서 진 요청, 파이프라인 종료 등) 대기 측은
+        취소를 이어받지 않고 다시 합류하며, 그중 하나가 새로 실행합니다.
+        
+        Args:
+            key: 요청 키
+            fn: 실제 호출 코루틴 함수
+        
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            with self._lock:
+                future = self._futures.get(flight_key)
+                leader = future is None
+                if leader:
+                    future = loop.create_future()
+                    self._futures[flight_key] = future
+                    self.leaders += 1
+                else:
+                    self.coalesced += 1
+            
+            if leader:
+                break
+            try:
+                # 대기 측이 취소되어도 진행 중인 호출은 유지
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled() or self._cancelling():
+                    raise
+                # 실행 측만 취소되었으므로 다시 시도
+        
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._futures[flight_key]
+    
+    @staticmethod
+    def _cancelling() -> bool:
+        """현재 태스크에 취소 요청이 남아 있는지 확인 (Python 3.11 미만은 항상 False)"""
+        task = asyncio.current_task()
+        cancelling = getattr(task, 'cancelling', None)
+        return bool(cancelling and cancelling())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        병합 통계 반환
+        
+        Returns:
+            hits(병합된 대기 호출), misses(실제 실행), entries(진행 중), hit_rate 딕셔너리
+        """
+        with self._lock:
+            entries = len(self._calls) + len(self._futures)
+        total = self.leaders + self.coalesced
+        return {
+            'hits': self.coalesced,
+            'misses': self.leaders,
+            'entries': entries,
+            'hit_rate': self.coalesced / total if total else 0.0
+        }
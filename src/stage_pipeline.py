@@ -0,0 +1,229 @@
+"""
+단계별 파이프라인 실행 모듈
+"""
+import asyncio
+import queue
+import threading
+import time
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator,
+    List, Tuple, Union
+)
+
+# 단계 작업자에게 입력이 끝났음을 알리는 표식
+_DONE = object()
+
+
+class StagePipeline:
+    """
+    단계마다 작업자 풀과 크기가 정해진 큐를 두는 파이프라인
+    
+    항목은 단계 순서대로 처리되지만, 단계마다 별도의 작업자가 있으므로 항목 N이
+    뒤 단계에 있는 동안 항목 N+1이 앞 단계를 처리합니다. 처리량은 모든 단계
+    소요 시간의 합이 아니라 가장 느린 단계(작업자 수 대비)에 맞춰집니다.
+    
+    단계 사이의 큐와 처리 중인 항목 수(max_in_flight)가 제한되어 있어, 결과를
+    꺼내지 않으면 입력도 더 읽지 않습니다 (backpressure). 단계 함수가 예외를
+    발생시키면 그 항목은 뒤 단계를 건너뛰고 예외 객체가 결과로 반환됩니다.
+    """
+    
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Awaitable[Any]]]],
+                 workers: Union[int, Dict[str, int]] = 1, queue_size: int = 8,
+                 ordered: bool = False):
+        """
+        Args:
+            stages: (단계 이름, 항목을 받아 다음 단계 항목을 반환하는 비동기 함수) 목록
+            workers: 단계별 작업자 수 (정수면 모든 단계에 적용, 딕셔너리에 없는 단계는 1)
+            queue_size: 단계 사이 큐의 최대 크기
+            ordered: True면 입력 순서대로, False면 끝난 순서대로 결과 반환
+        """
+        if not stages:
+            raise ValueError("단계가 최소 하나 필요합니다.")
+        if queue_size < 1:
+            raise ValueError("queue_size는 1 이상이어야 합니다.")
+        self.stages = stages
+        if isinstance(workers, int):
+            self.workers = {name: workers for name, _ in stages}
+        else:
+            self.workers = {name: workers.get(name, 1) for name, _ in stages}
+        if any(count < 1 for count in self.workers.values()):
+            raise ValueError("작업자 수는 1 이상이어야 합니다.")
+        self.queue_size = queue_size
+        self.ordered = ordered
+        # 입력을 읽은 뒤 결과로 반환되기 전까지 파이프라인 안에 있을 수 있는 최대 항목 수
+        self.max_in_flight = sum(self.workers.values()) + queue_size * (len(stages) + 1)
+        self._stats = {name: {'processed': 0, 'busy': 0.0} for name, _ in stages}
+    
+    async def astream(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+        """
+        항목을 파이프라인으로 처리하며 결과를 차례로 반환
+        
+        동기 반복자는 이벤트 루프에서 직접 읽으므로, 읽을 때 오래 막히는 입력은
+        비동기 반복자로 전달해야 합니다. 반환을 중단하면 진행 중인 작업은 취소됩니다.
+        
+        Args:
+            items: 입력 항목 (동기 또는 비동기 반복자)
+        
+        Returns:
+            단계를 모두 거친 결과의 비동기 반복자 (실패한 항목은 예외 객체)
+        """
+        names = [name for name, _ in self.stages]
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        remaining = [self.workers[name] for name in names]
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        
+        async def feed():
+            error = None
+            index = 0
+            try:
+                if isinstance(items, AsyncIterable):
+                    async for item in items:
+                        await in_flight.acquire()
+                        await queues[0].put((index, item))
+                        index += 1
+                else:
+                    for item in items:
+                        await in_flight.acquire()
+                        await queues[0].put((index, item))
+                        index += 1
+            except Exception as e:
+                # 이미 읽은 항목은 끝까지 처리한 뒤 오류 전달
+                error = e
+            for _ in range(remaining[0]):
+                await queues[0].put(_DONE)
+            if error is not None:
+                raise error
+        
+        async def work(position: int):
+            name, func = self.stages[position]
+            stats = self._stats[name]
+            source, target = queues[position], queues[position + 1]
+            while True:
+                entry = await source.get()
+                if entry is _DONE:
+                    break
+                index, value = entry
+                if not isinstance(value, Exception):
+                    start_time = time.perf_counter()
+                    try:
+                        value = await func(value)
+                    except Exception as e:
+                        value = e
+                    stats['busy'] += time.perf_counter() - start_time
+                    stats['processed'] += 1
+                await target.put((index, value))
+            
+            # 단계의 마지막 작업자가 다음 단계 작업자 수만큼 종료 표식 전달
+            remaining[position] -= 1
+            if remaining[position] == 0:
+                next_workers = remaining[position + 1] if position + 1 < len(remaining) else 1
+                for _ in range(next_workers):
+                    await target.put(_DONE)
+        
+        tasks = [asyncio.ensure_future(feed())]
+        for position, name in enumerate(names):
+            tasks.extend(
+                asyncio.ensure_future(work(position)) for _ in range(self.workers[name])
+            )
+        
+        try:
+            waiting: Dict[int, Any] = {}
+            next_index = 0
+            while True:
+                entry = await queues[-1].get()
+                if entry is _DONE:
+                    break
+                index, value = entry
+                if not self.ordered:
+                    yield value
+                    in_flight.release()
+                    continue
+                waiting[index] = value
+                while next_index in waiting:
+                    yield waiting.pop(next_index)
+                    in_flight.release()
+                    next_index += 1
+            # 입력 반복자의 오류 전달
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def stream(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> Iterator[Any]:
+        """
+        항목을 파이프라인으로 처리하며 결과를 차례로 반환 (동기 제너레이터)
+        
+        별도 스레드의 이벤트 루프에서 astream을 실행하고 결과를 크기가 정해진
+        큐로 넘겨받습니다. 반복을 중단하면 파이프라인도 종료됩니다.
+        
+        Args:
+            items: 입력 항목 (동기 또는 비동기 반복자)
+        
+        Returns:
+            단계를 모두 거친 결과의 반복자 (실패한 항목은 예외 객체)
+        """
+        handoff: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        running: Dict[str, Any] = {}
+        
+        def put(entry: Tuple[bool, Any]) -> bool:
+            while not stop.is_set():
+                try:
+                    handoff.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        async def drain():
+            running['loop'] = asyncio.get_running_loop()
+            running['task'] = asyncio.current_task()
+            results = self.astream(items)
+            try:
+                async for result in results:
+                    if not await asyncio.to_thread(put, (True, result)):
+                        break
+            finally:
+                await results.aclose()
+        
+        def run():
+            try:
+                asyncio.run(drain())
+                put((False, None))
+            except BaseException as e:
+                put((False, e))
+        
+        thread = threading.Thread(target=run, name="stage-pipeline", daemon=True)
+        thread.start()
+        try:
+            while True:
+                has_value, value = handoff.get()
+                if not has_value:
+                    if value is not None:
+                        raise value
+                    return
+                yield value
+        finally:
+            stop.set()
+            if 'task' in running:
+                # 진행 중인 단계 작업을 기다리지 않고 취소
+                try:
+                    running['loop'].call_soon_threadsafe(running['task'].cancel)
+                except RuntimeError:
+                    pass
+            thread.join()
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        단계별 처리 통계 반환
+        
+        busy를 workers로 나눈 값이 가장 큰 단계가 병목입니다.
+        
+        Returns:
+            단계 이름별 workers, processed, busy(초) 딕셔너리
+        """
+        return {
+            name: {'workers': self.workers[name], **self._stats[name]}
+            for name, _ in self.stages
+        }
@@ -1,48 +1,202 @@
 """
 LangGraph 워크플로우 모듈
 """
-from typing import TypedDict, List, Dict, Any, Optional
-from datetime import datetime
+import hashlib
+import json
+import operator
+from typing import (
+    Annotated, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator,
+    TypedDict, List, Dict, Any, Optional, Tuple, Union
+)
 import time
-from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import StateSnapshot
+
+try:
+    from .llm_provider import CallMeter
+    from .run_context import RunContext
+    from .history_store import HistoryRecord, HistoryStore, monotonic_ns, wall_time_ns
+    from .stage_pipeline import StagePipeline
+except ImportError:
+    from llm_provider import CallMeter
+    from run_context import RunContext
+    from history_store import HistoryRecord, HistoryStore, monotonic_ns, wall_time_ns
+    from stage_pipeline import StagePipeline
+
+
+def _merge_timestamps(current: Dict[str, int], update: Dict[str, int]) -> Dict[str, int]:
+    """단계별 타임스탬프 병합 (병렬 노드의 갱신을 함께 반영)"""
+    return {**current, **update}
+
+
+def _first_error(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """먼저 발생한 오류 유지 (병렬 노드가 동시에 실패해도 충돌하지 않음)"""
+    return current or update
 
 
 class WorkflowState(TypedDict):
-    """워크플로우 상태"""
+    """
+    워크플로우 상태
+    
+    steps, timestamps, error는 리듀서로 병합되므로 노드는 바뀐 키만 반환하면 되고,
+    병렬로 실행되는 노드도 같은 키를 함께 갱신할 수 있습니다.
+    timestamps와 steps의 timestamp는 wall_time_ns() 정수이며, 표시할 때만
+    wall_to_datetime으로 바꿉니다. 체크포인트로 저장되어 재시작한 프로세스에서도
+    읽히므로 프로세스마다 기준이 달라지는 monotonic_ns()는 쓰지 않습니다.
+    """
     original_query: str
     analysis: Optional[Dict[str, str]]
     optimized_prompt: Optional[str]
     llm_response: Optional[str]
-    steps: List[Dict[str, Any]]
-    timestamps: Dict[str, str]
-    error: Optional[str]
+    steps: Annotated[List[Dict[str, Any]], operator.add]
+    timestamps: Annotated[Dict[str, int], _merge_timestamps]
+    error: Annotated[Optional[str], _first_error]
+
+
+# 노드 결과에서 그대로 전달하는 상태 키 (steps, timestamps는 새 항목만 전달)
+_VALUE_KEYS = ('analysis', 'optimized_prompt', 'llm_response', 'error')
 
 
 class PromptOptimizationWorkflow:
-    """프롬프트 최적화 워크플로우"""
+    """
+    프롬프트 최적화 워크플로우
+    
+    실행마다 RunContext를 만들어 그래프 설정(configurable)으로 노드에 전달하므로,
+    하나의 인스턴스를 여러 스레드나 이벤트 루프 작업에서 동시에 실행해도
+    단계 기록과 상태 히스토리가 실행별로 분리됩니다.
+    
+    checkpointer를 지정하면 노드가 끝날 때마다 상태를 실행 식별자(기본값은 질의와
+    그래프 구성으로 만든 해시)별로 저장합니다. 같은 질의를 다시 실행하면 완료된
+    질의는 저장된 결과를 그대로 반환하고, 중단된 질의는 마지막으로 완료된 노드
+    다음부터 이어서 실행하며, 오류로 끝난 질의는 처음부터 다시 실행합니다.
+    """
     
-    def __init__(self, llm_provider, prompt_optimizer, display_manager):
+    def __init__(self, llm_provider, prompt_optimizer, display_manager,
+                 streaming: bool = False, parallel: bool = False,
+                 history_size: int = 1000, history_spill_path: Optional[str] = None,
+                 checkpointer=None):
         """
         Args:
-            llm_provider: LLMProviderManager 인스턴스
+            llm_provider: 최종 응답(invoke_llm 단계)에 사용할 LLMProviderManager 인스턴스
             prompt_optimizer: PromptOptimizer 인스턴스
             display_manager: DisplayManager 인스턴스
+            streaming: 각 단계의 LLM 출력을 토큰 단위로 표시할지 여부
+            parallel: 최적화가 분석 결과를 사용하지 않으면 분석과 최적화를 병렬 실행
+            history_size: 메모리에 보관할 최대 단계 기록 수
+            history_spill_path: 밀려난 단계 기록을 저장할 JSON Lines 파일 경로 (None이면 버림)
+            checkpointer: 실행 상태를 저장할 LangGraph 체크포인트 저장소
+                (예: SqliteCheckpointSaver, None이면 저장하지 않음)
         """
         self.llm_provider = llm_provider
         self.prompt_optimizer = prompt_optimizer
         self.display = display_manager
+        self.streaming = streaming
+        self.fused = getattr(prompt_optimizer, 'mode', 'staged') == 'fused'
+        self.parallel = parallel and self._can_run_parallel()
+        self.checkpointer = checkpointer
         self.workflow = self._build_workflow()
-        self.state_history: List[WorkflowState] = []
+        # 완료된 실행의 단계 기록 (실행 단위로 이어 붙이며 오래된 기록부터 밀려남)
+        self.state_history = HistoryStore(capacity=history_size, spill_path=history_spill_path)
+    
+    def _can_run_parallel(self) -> bool:
+        """
+        분석과 최적화를 병렬로 실행할 수 있는지 확인
+        
+        최적화가 분석 결과에 의존하거나, 통합 모드이거나, 스트리밍 출력이
+        섞일 수 있는 경우에는 순차 실행합니다.
+        """
+        if self.fused or self.streaming:
+            return False
+        depends = getattr(self.prompt_optimizer, 'optimization_uses_analysis', True)
+        return depends is False
+    
+    def _state_update(self, state: WorkflowState, result: WorkflowState) -> Dict[str, Any]:
+        """
+        노드가 반환한 전체 상태에서 바뀐 키만 추린 부분 갱신 생성
+        
+        Args:
+            state: 노드에 전달된 상태
+            result: 노드가 반환한 상태
+            
+        Returns:
+            부분 갱신 딕셔너리 (steps, timestamps는 새 항목만)
+        """
+        update: Dict[str, Any] = {
+            key: result.get(key) for key in _VALUE_KEYS
+            if result.get(key) is not state.get(key)
+        }
+        update['steps'] = result['steps'][len(state['steps']):]
+        update['timestamps'] = {
+            key: value for key, value in result['timestamps'].items()
+            if state['timestamps'].get(key) != value
+        }
+        return update
+    
+    def _working_copy(self, state: WorkflowState) -> WorkflowState:
+        """노드가 수정할 상태 사본 (그래프 상태의 리스트/딕셔너리는 건드리지 않음)"""
+        working = dict(state)
+        working['steps'] = list(state['steps'])
+        working['timestamps'] = dict(state['timestamps'])
+        return working
+    
+    def _run_context(self, config: Optional[RunnableConfig]) -> Optional[RunContext]:
+        """그래프 설정에서 실행 컨텍스트 꺼내기"""
+        return ((config or {}).get('configurable') or {}).get('run_context')
+    
+    def _as_update(self, node: Callable[..., WorkflowState],
+                   anode: Callable[..., Awaitable[WorkflowState]]) -> RunnableLambda:
+        """
+        전체 상태를 반환하는 노드를 바뀐 키만 반환하는 그래프 노드로 변환
+        
+        그래프를 invoke로 실행하면 동기 노드를, ainvoke/abatch로 실행하면
+        비동기 노드를 사용합니다.
+        
+        Args:
+            node: 상태와 실행 컨텍스트를 받아 갱신된 상태를 반환하는 노드 함수
+            anode: node의 비동기 버전
+            
+        Returns:
+            부분 갱신 딕셔너리를 반환하는 Runnable
+        """
+        def run(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+            result = node(self._working_copy(state), self._run_context(config))
+            return self._state_update(state, result)
+        
+        async def arun(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+            result = await anode(self._working_copy(state), self._run_context(config))
+            return self._state_update(state, result)
+        
+        return RunnableLambda(run, afunc=arun, name=node.__name__.strip('_'))
     
     def _build_workflow(self) -> StateGraph:
         """워크플로우 그래프 구성"""
         # StateGraph 생성
         workflow = StateGraph(WorkflowState)
         
+        if self.fused:
+            # 분석과 최적화를 한 번의 호출로 처리
+            workflow.add_node("analyze_optimize", self._as_update(
+                self._analyze_optimize_node, self._aanalyze_optimize_node))
+            workflow.add_node("invoke_llm", self._as_update(
+                self._invoke_llm_node, self._ainvoke_llm_node))
+            workflow.add_edge("analyze_optimize", "invoke_llm")
+            workflow.add_edge("invoke_llm", END)
+            workflow.set_entry_point("analyze_optimize")
+            return workflow.compile(checkpointer=self.checkpointer)
+        
         # 노드 추가
-        workflow.add_node("analyze", self._analyze_node)
-        workflow.add_node("optimize", self._optimize_node)
-        workflow.add_node("invoke_llm", self._invoke_llm_node)
+        workflow.add_node("analyze", self._as_update(self._analyze_node, self._aanalyze_node))
+        workflow.add_node("optimize", self._as_update(self._optimize_node, self._aoptimize_node))
+        workflow.add_node("invoke_llm", self._as_update(self._invoke_llm_node, self._ainvoke_llm_node))
+        
+        if self.parallel:
+            # 분석과 최적화를 동시에 실행하고 둘 다 끝나면 LLM 호출
+            workflow.add_edge(START, "analyze")
+            workflow.add_edge(START, "optimize")
+            workflow.add_edge(["analyze", "optimize"], "invoke_llm")
+            workflow.add_edge("invoke_llm", END)
+            return workflow.compile(checkpointer=self.checkpointer)
         
         # 엣지 추가
         workflow.add_edge("analyze", "optimize")
@@ -52,41 +206,173 @@ class PromptOptimizationWorkflow:
         # 시작점 설정
         workflow.set_entry_point("analyze")
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
     
-    def _analyze_node(self, state: WorkflowState) -> WorkflowState:
+    def _create_meter(self, title: str) -> CallMeter:
+        """
+        단계별 호출 측정 객체 생성
+        
+        스트리밍 모드에서는 스트리밍 블록을 열고 청크를 디스플레이로 전달합니다.
+        
+        Args:
+            title: 스트리밍 블록 제목
+            
+        Returns:
+            CallMeter 인스턴스
+        """
+        if not self.streaming:
+            return CallMeter()
+        self.display.show_stream_start(title)
+        return CallMeter(on_token=self.display.show_stream_chunk)
+    
+    def _begin_step(self, title: str, description: str, stream_title: str) -> CallMeter:
+        """
+        단계 시작 표시 및 호출 측정 객체 생성
+        
+        Args:
+            title: 단계 제목
+            description: 단계 설명
+            stream_title: 스트리밍 블록 제목
+            
+        Returns:
+            CallMeter 인스턴스
+        """
+        self.display.show_step(title, description)
+        return self._create_meter(stream_title)
+    
+    def _record_step(self, state: WorkflowState, name: str, meter: CallMeter,
+                     duration: float, run: Optional[RunContext], output: Any, **fields):
+        """
+        완료된 단계를 상태에 기록하고 히스토리에 저장
+        
+        히스토리에는 상태 사본 대신 노드 결과만 담은 HistoryRecord를 저장합니다.
+        
+        Args:
+            state: 현재 상태
+            name: 단계 이름
+            meter: 단계 호출 측정 객체
+            duration: 소요 시간 (초)
+            run: 실행 컨텍스트 (없으면 인스턴스 히스토리에 바로 저장)
+            output: 노드 결과
+            **fields: 단계 기록에 추가할 항목
+        """
+        now = wall_time_ns()
+        state['timestamps'][name] = now
+        state['steps'].append({
+            'name': name,
+            'timestamp': now,
+            'status': 'completed',
+            **fields,
+            'duration': duration,
+            **meter.as_dict()
+        })
+        
+        # 상태 히스토리 저장
+        record = HistoryRecord(
+            run.run_id if run is not None else None,
+            state['original_query'],
+            name,
+            monotonic_ns(),
+            duration,
+            output
+        )
+        if run is not None:
+            run.add_record(record)
+        else:
+            self.state_history.append(record)
+    
+    def _check_intent(self, state: WorkflowState, optimized: str) -> bool:
+        """
+        의도 보존 검증 (변경되었으면 경고 표시)
+        
+        Args:
+            state: 현재 상태
+            optimized: 최적화된 프롬프트
+            
+        Returns:
+            의도 보존 여부
+        """
+        intent_preserved = self.prompt_optimizer.check_intent_preservation(
+            state['original_query'],
+            optimized
+        )
+        
+        if not intent_preserved:
+            self.display.show_warning(
+                "원본 질의의 의도가 일부 변경되었을 수 있습니다."
+            )
+        return intent_preserved
+    
+    def _begin_analyze(self) -> CallMeter:
+        """질의 분석 단계 시작"""
+        return self._begin_step(
+            "1단계: 질의 분석",
+            "사용자 질의의 명확성과 완전성을 분석합니다...",
+            "🧠 분석 응답"
+        )
+    
+    def _complete_analyze(self, state: WorkflowState, analysis: Dict[str, Any],
+                          meter: CallMeter, duration: float, run: Optional[RunContext]):
+        """질의 분석 결과 표시 및 상태 갱신"""
+        if meter.streaming:
+            self.display.show_stream_end(duration, meter.as_dict())
+        
+        # 분석 결과 표시
+        self.display.show_analysis_result(analysis)
+        
+        # 상태 업데이트
+        state['analysis'] = analysis
+        self._record_step(state, 'analyze', meter, duration, run, analysis)
+    
+    def _analyze_node(self, state: WorkflowState,
+                      run: Optional[RunContext] = None) -> WorkflowState:
         """
         질의 분석 노드
         
         Args:
             state: 현재 상태
+            run: 실행 컨텍스트
             
         Returns:
             업데이트된 상태
         """
         try:
-            self.display.show_step(
-                "1단계: 질의 분석",
-                "사용자 질의의 명확성과 완전성을 분석합니다..."
+            meter = self._begin_analyze()
+            start_time = time.time()
+            analysis = self.prompt_optimizer.analyze_query(
+                state['original_query'],
+                meter=meter,
+                run=run
             )
+            self._complete_analyze(state, analysis, meter, time.time() - start_time, run)
             
-            # 질의 분석
-            analysis = self.prompt_optimizer.analyze_query(state['original_query'])
-            
-            # 분석 결과 표시
-            self.display.show_analysis_result(analysis)
-            
-            # 상태 업데이트
-            state['analysis'] = analysis
-            state['timestamps']['analyze'] = datetime.now().isoformat()
-            state['steps'].append({
-                'name': 'analyze',
-                'timestamp': datetime.now().isoformat(),
-                'status': 'completed'
-            })
+        except Exception as e:
+            state['error'] = f"분석 오류: {str(e)}"
+            self.display.show_error(e, "질의 분석")
+        
+        return state
+    
+    async def _aanalyze_node(self, state: WorkflowState,
+                             run: Optional[RunContext] = None) -> WorkflowState:
+        """
+        질의 분석 노드 (비동기)
+        
+        Args:
+            state: 현재 상태
+            run: 실행 컨텍스트
             
-            # 상태 히스토리 저장
-            self.state_history.append(state.copy())
+        Returns:
+            업데이트된 상태
+        """
+        try:
+            meter = self._begin_analyze()
+            start_time = time.time()
+            analysis = await self.prompt_optimizer.aanalyze_query(
+                state['original_query'],
+                meter=meter,
+                run=run
+            )
+            self._complete_analyze(state, analysis, meter, time.time() - start_time, run)
             
         except Exception as e:
             state['error'] = f"분석 오류: {str(e)}"
@@ -94,12 +380,39 @@ class PromptOptimizationWorkflow:
         
         return state
     
-    def _optimize_node(self, state: WorkflowState) -> WorkflowState:
+    def _begin_optimize(self) -> CallMeter:
+        """프롬프트 최적화 단계 시작"""
+        return self._begin_step(
+            "2단계: 프롬프트 최적화",
+            "분석 결과를 바탕으로 프롬프트를 개선합니다...",
+            "✨ 최적화된 프롬프트"
+        )
+    
+    def _complete_optimize(self, state: WorkflowState, optimized: str,
+                           meter: CallMeter, duration: float, run: Optional[RunContext]):
+        """최적화 결과 검증·표시 및 상태 갱신"""
+        if meter.streaming:
+            self.display.show_stream_end(duration, meter.as_dict())
+        
+        intent_preserved = self._check_intent(state, optimized)
+        
+        # 최적화된 프롬프트 표시 (스트리밍 시 이미 출력됨)
+        if not meter.streaming:
+            self.display.show_optimized_prompt(optimized)
+        
+        # 상태 업데이트
+        state['optimized_prompt'] = optimized
+        self._record_step(state, 'optimize', meter, duration, run, optimized,
+                          intent_preserved=intent_preserved)
+    
+    def _optimize_node(self, state: WorkflowState,
+                       run: Optional[RunContext] = None) -> WorkflowState:
         """
         프롬프트 최적화 노드
         
         Args:
             state: 현재 상태
+            run: 실행 컨텍스트
             
         Returns:
             업데이트된 상태
@@ -109,56 +422,169 @@ class PromptOptimizationWorkflow:
             if state.get('error'):
                 return state
             
-            self.display.show_step(
-                "2단계: 프롬프트 최적화",
-                "분석 결과를 바탕으로 프롬프트를 개선합니다..."
-            )
-            
-            # 프롬프트 최적화
+            meter = self._begin_optimize()
+            start_time = time.time()
             optimized = self.prompt_optimizer.optimize_prompt(
                 state['original_query'],
-                state['analysis']
+                state['analysis'],
+                meter=meter,
+                run=run
             )
+            self._complete_optimize(state, optimized, meter, time.time() - start_time, run)
+            
+        except Exception as e:
+            state['error'] = f"최적화 오류: {str(e)}"
+            self.display.show_error(e, "프롬프트 최적화")
+        
+        return state
+    
+    async def _aoptimize_node(self, state: WorkflowState,
+                              run: Optional[RunContext] = None) -> WorkflowState:
+        """
+        프롬프트 최적화 노드 (비동기)
+        
+        Args:
+            state: 현재 상태
+            run: 실행 컨텍스트
+            
+        Returns:
+            업데이트된 상태
+        """
+        try:
+            # 이전 단계에서 오류가 있으면 스킵
+            if state.get('error'):
+                return state
             
-            # 의도 보존 검증
-            intent_preserved = self.prompt_optimizer.check_intent_preservation(
+            meter = self._begin_optimize()
+            start_time = time.time()
+            optimized = await self.prompt_optimizer.aoptimize_prompt(
                 state['original_query'],
-                optimized
+                state['analysis'],
+                meter=meter,
+                run=run
             )
+            self._complete_optimize(state, optimized, meter, time.time() - start_time, run)
             
-            if not intent_preserved:
-                self.display.show_warning(
-                    "원본 질의의 의도가 일부 변경되었을 수 있습니다."
-                )
+        except Exception as e:
+            state['error'] = f"최적화 오류: {str(e)}"
+            self.display.show_error(e, "프롬프트 최적화")
+        
+        return state
+    
+    def _begin_analyze_optimize(self) -> CallMeter:
+        """질의 분석 및 최적화 통합 단계 시작"""
+        return self._begin_step(
+            "1단계: 질의 분석 및 최적화",
+            "한 번의 호출로 질의를 분석하고 프롬프트를 개선합니다...",
+            "🧠 분석 및 최적화 응답"
+        )
+    
+    def _complete_analyze_optimize(self, state: WorkflowState, analysis: Dict[str, Any],
+                                   optimized: str, meter: CallMeter, duration: float,
+                                   run: Optional[RunContext]):
+        """통합 결과 검증·표시 및 상태 갱신"""
+        if meter.streaming:
+            self.display.show_stream_end(duration, meter.as_dict())
+        
+        intent_preserved = self._check_intent(state, optimized)
+        
+        self.display.show_analysis_result(analysis)
+        self.display.show_optimized_prompt(optimized)
+        
+        # 상태 업데이트
+        state['analysis'] = analysis
+        state['optimized_prompt'] = optimized
+        self._record_step(state, 'analyze_optimize', meter, duration, run,
+                          {'analysis': analysis, 'optimized_prompt': optimized},
+                          intent_preserved=intent_preserved)
+    
+    def _analyze_optimize_node(self, state: WorkflowState,
+                               run: Optional[RunContext] = None) -> WorkflowState:
+        """
+        질의 분석 및 최적화 통합 노드 (fused 모드)
+        
+        Args:
+            state: 현재 상태
+            run: 실행 컨텍스트
             
-            # 최적화된 프롬프트 표시
-            self.display.show_optimized_prompt(optimized)
+        Returns:
+            업데이트된 상태
+        """
+        try:
+            meter = self._begin_analyze_optimize()
+            start_time = time.time()
+            analysis, optimized = self.prompt_optimizer.analyze_and_optimize(
+                state['original_query'],
+                meter=meter,
+                run=run
+            )
+            self._complete_analyze_optimize(state, analysis, optimized, meter,
+                                            time.time() - start_time, run)
             
-            # 상태 업데이트
-            state['optimized_prompt'] = optimized
-            state['timestamps']['optimize'] = datetime.now().isoformat()
-            state['steps'].append({
-                'name': 'optimize',
-                'timestamp': datetime.now().isoformat(),
-                'status': 'completed',
-                'intent_preserved': intent_preserved
-            })
+        except Exception as e:
+            state['error'] = f"분석 및 최적화 오류: {str(e)}"
+            self.display.show_error(e, "질의 분석 및 최적화")
+        
+        return state
+    
+    async def _aanalyze_optimize_node(self, state: WorkflowState,
+                                      run: Optional[RunContext] = None) -> WorkflowState:
+        """
+        질의 분석 및 최적화 통합 노드 (fused 모드, 비동기)
+        
+        Args:
+            state: 현재 상태
+            run: 실행 컨텍스트
             
-            # 상태 히스토리 저장
-            self.state_history.append(state.copy())
+        Returns:
+            업데이트된 상태
+        """
+        try:
+            meter = self._begin_analyze_optimize()
+            start_time = time.time()
+            analysis, optimized = await self.prompt_optimizer.aanalyze_and_optimize(
+                state['original_query'],
+                meter=meter,
+                run=run
+            )
+            self._complete_analyze_optimize(state, analysis, optimized, meter,
+                                            time.time() - start_time, run)
             
         except Exception as e:
-            state['error'] = f"최적화 오류: {str(e)}"
-            self.display.show_error(e, "프롬프트 최적화")
+            state['error'] = f"분석 및 최적화 오류: {str(e)}"
+            self.display.show_error(e, "질의 분석 및 최적화")
         
         return state
     
-    def _invoke_llm_node(self, state: WorkflowState) -> WorkflowState:
+    def _begin_invoke_llm(self) -> CallMeter:
+        """LLM 호출 단계 시작"""
+        return self._begin_step(
+            f"{2 if self.fused else 3}단계: LLM 호출",
+            "최적화된 프롬프트로 LLM에 질의합니다...",
+            "🤖 LLM 응답"
+        )
+    
+    def _complete_invoke_llm(self, state: WorkflowState, response: str,
+                             meter: CallMeter, duration: float, run: Optional[RunContext]):
+        """LLM 응답 표시 및 상태 갱신"""
+        # 응답 표시
+        if meter.streaming:
+            self.display.show_stream_end(duration, meter.as_dict())
+        else:
+            self.display.show_llm_response(response, duration)
+        
+        # 상태 업데이트
+        state['llm_response'] = response
+        self._record_step(state, 'invoke_llm', meter, duration, run, response)
+    
+    def _invoke_llm_node(self, state: WorkflowState,
+                         run: Optional[RunContext] = None) -> WorkflowState:
         """
         LLM 호출 노드
         
         Args:
             state: 현재 상태
+            run: 실행 컨텍스트
             
         Returns:
             업데이트된 상태
@@ -168,31 +594,40 @@ class PromptOptimizationWorkflow:
             if state.get('error'):
                 return state
             
-            self.display.show_step(
-                "3단계: LLM 호출",
-                "최적화된 프롬프트로 LLM에 질의합니다..."
-            )
-            
             # LLM 호출 시간 측정
+            meter = self._begin_invoke_llm()
             start_time = time.time()
-            response = self.llm_provider.invoke(state['optimized_prompt'])
-            duration = time.time() - start_time
+            response = self.llm_provider.invoke(state['optimized_prompt'], meter=meter)
+            self._complete_invoke_llm(state, response, meter, time.time() - start_time, run)
             
-            # 응답 표시
-            self.display.show_llm_response(response, duration)
+        except Exception as e:
+            state['error'] = f"LLM 호출 오류: {str(e)}"
+            self.display.show_error(e, "LLM 호출")
+        
+        return state
+    
+    async def _ainvoke_llm_node(self, state: WorkflowState,
+                                run: Optional[RunContext] = None) -> WorkflowState:
+        """
+        LLM 호출 노드 (비동기)
+        
+        Args:
+            state: 현재 상태
+            run: 실행 컨텍스트
             
-            # 상태 업데이트
-            state['llm_response'] = response
-            state['timestamps']['invoke_llm'] = datetime.now().isoformat()
-            state['steps'].append({
-                'name': 'invoke_llm',
-                'timestamp': datetime.now().isoformat(),
-                'status': 'completed',
-                'duration': duration
-            })
+        Returns:
+            업데이트된 상태
+        """
+        try:
+            # 이전 단계에서 오류가 있으면 스킵
+            if state.get('error'):
+                return state
             
-            # 상태 히스토리 저장
-            self.state_history.append(state.copy())
+            # LLM 호출 시간 측정
+            meter = self._begin_invoke_llm()
+            start_time = time.time()
+            response = await self.llm_provider.ainvoke(state['optimized_prompt'], meter=meter)
+            self._complete_invoke_llm(state, response, meter, time.time() - start_time, run)
             
         except Exception as e:
             state['error'] = f"LLM 호출 오류: {str(e)}"
@@ -200,47 +635,359 @@ class PromptOptimizationWorkflow:
         
         return state
     
-    def run(self, query: str) -> WorkflowState:
+    def _initial_state(self, query: str) -> WorkflowState:
         """
-        워크플로우 실행
+        질의별 초기 상태 생성
         
         Args:
             query: 사용자 질의
             
         Returns:
-            최종 상태
+            초기 상태
         """
-        # 초기 상태 생성
-        initial_state: WorkflowState = {
+        return {
             'original_query': query,
             'analysis': None,
             'optimized_prompt': None,
             'llm_response': None,
             'steps': [],
-            'timestamps': {'start': datetime.now().isoformat()},
+            'timestamps': {'start': wall_time_ns()},
             'error': None
         }
+    
+    def run_id_for(self, query: str) -> str:
+        """
+        체크포인트용 실행 식별자 (같은 질의, 그래프 구성, 모델·생성 설정이면 항상 같은 값)
+        
+        모델, 서버, 생성 옵션, 분석 형식 등이 바뀌면 식별자도 바뀌므로 이전 설정으로
+        저장된 결과를 재사용하지 않습니다.
+        
+        Args:
+            query: 사용자 질의
+            
+        Returns:
+            SHA-256 해시 문자열
+        """
+        mode = 'fused' if self.fused else 'parallel' if self.parallel else 'staged'
+        key = f"{mode}\0{self._config_fingerprint()}\0{query}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def _config_fingerprint(self) -> str:
+        """최종 응답 제공자와 최적화 설정을 직렬화한 문자열 (config_fingerprint가 없으면 제외)"""
+        parts = {}
+        for name, component in (('invoke_llm', self.llm_provider),
+                                ('optimizer', self.prompt_optimizer)):
+            fingerprint = getattr(component, 'config_fingerprint', None)
+            parts[name] = fingerprint() if callable(fingerprint) else None
+        return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    
+    def _new_run_context(self, query: str) -> RunContext:
+        """질의별 실행 컨텍스트 생성 (체크포인트 사용 시 질의로 실행 식별자 결정)"""
+        if self.checkpointer is None:
+            return RunContext(query)
+        return RunContext(query, run_id=self.run_id_for(query))
+    
+    def _run_config(self, run_context: RunContext) -> RunnableConfig:
+        """실행 컨텍스트를 노드에 전달하는 그래프 설정 (체크포인트 사용 시 thread_id 포함)"""
+        configurable: Dict[str, Any] = {'run_context': run_context}
+        if self.checkpointer is not None:
+            configurable['thread_id'] = run_context.run_id
+        return {'configurable': configurable}
+    
+    def _resume_plan(self, snapshot: StateSnapshot,
+                     initial_state: WorkflowState) -> Tuple[str, Optional[WorkflowState]]:
+        """
+        저장된 체크포인트로 실행 방법 결정
+        
+        Args:
+            snapshot: 실행 식별자의 마지막 그래프 상태
+            initial_state: 처음부터 실행할 때의 초기 상태
+            
+        Returns:
+            (방법, 값) 튜플. 방법은 'new'(저장된 상태 없음), 'retry'(오류로 끝나 처음부터),
+            'resume'(다음 노드부터), 'done'(완료) 중 하나이고, 값은 그래프 입력
+            (resume이면 None) 또는 완료된 상태입니다.
+        """
+        values = snapshot.values
+        if not values:
+            return 'new', initial_state
+        if values.get('error'):
+            self.display.show_info("이전 실행이 오류로 끝나 처음부터 다시 실행합니다.")
+            return 'retry', initial_state
+        if snapshot.next:
+            self.display.show_info(
+                f"중단된 실행을 이어서 진행합니다 (다음 단계: {', '.join(snapshot.next)})"
+            )
+            return 'resume', None
+        self.display.show_info("이미 완료된 질의입니다. 저장된 결과를 사용합니다.")
+        return 'done', {**values, 'timestamps': dict(values['timestamps'])}
+    
+    def _finish_run(self, final_state: WorkflowState, run_context: RunContext) -> WorkflowState:
+        """
+        실행 종료 처리 (종료 타임스탬프 추가, 실행 히스토리를 인스턴스 히스토리에 반영)
+        
+        Args:
+            final_state: 그래프 실행 결과 상태
+            run_context: 실행 컨텍스트
+            
+        Returns:
+            최종 상태
+        """
+        final_state['timestamps']['end'] = wall_time_ns()
+        self.state_history.extend(run_context.history)
+        return final_state
+    
+    def run(self, query: str, run_context: Optional[RunContext] = None) -> WorkflowState:
+        """
+        워크플로우 실행
+        
+        Args:
+            query: 사용자 질의
+            run_context: 실행 기록을 받을 RunContext (None이면 새로 생성,
+                체크포인트 사용 시 run_id가 실행 식별자)
+            
+        Returns:
+            최종 상태
+        """
+        run_context = run_context if run_context is not None else self._new_run_context(query)
+        config = self._run_config(run_context)
+        
+        # 초기 상태 생성
+        initial_state = self._initial_state(query)
         
         # 원본 질의 표시
         self.display.show_original_query(query)
         
-        # 워크플로우 실행
-        final_state = self.workflow.invoke(initial_state)
+        # 워크플로우 실행 (체크포인트가 있으면 이어서 실행하거나 저장된 결과 사용)
+        if self.checkpointer is None:
+            final_state = self.workflow.invoke(initial_state, config=config)
+        else:
+            plan, value = self._resume_plan(self.workflow.get_state(config), initial_state)
+            if plan == 'done':
+                final_state = value
+            else:
+                if plan == 'retry':
+                    self.checkpointer.delete_thread(run_context.run_id)
+                final_state = self.workflow.invoke(value, config=config)
         
-        # 종료 타임스탬프 추가
-        final_state['timestamps']['end'] = datetime.now().isoformat()
+        # 종료 처리
+        return self._finish_run(final_state, run_context)
+    
+    async def arun(self, query: str,
+                   run_context: Optional[RunContext] = None) -> WorkflowState:
+        """
+        워크플로우 실행 (비동기)
         
-        return final_state
+        Args:
+            query: 사용자 질의
+            run_context: 실행 기록을 받을 RunContext (None이면 새로 생성,
+                체크포인트 사용 시 run_id가 실행 식별자)
+            
+        Returns:
+            최종 상태
+        """
+        run_context = run_context if run_context is not None else self._new_run_context(query)
+        config = self._run_config(run_context)
+        initial_state = self._initial_state(query)
+        self.display.show_original_query(query)
+        
+        if self.checkpointer is None:
+            final_state = await self.workflow.ainvoke(initial_state, config=config)
+        else:
+            plan, value = self._resume_plan(await self.workflow.aget_state(config), initial_state)
+            if plan == 'done':
+                final_state = value
+            else:
+                if plan == 'retry':
+                    await self.checkpointer.adelete_thread(run_context.run_id)
+                final_state = await self.workflow.ainvoke(value, config=config)
+        return self._finish_run(final_state, run_context)
+    
+    async def arun_many(self, queries: List[str],
+                        max_concurrency: Optional[int] = None) -> List[WorkflowState]:
+        """
+        여러 질의를 하나의 이벤트 루프에서 동시에 실행
+        
+        질의마다 별도의 그래프 상태와 RunContext로 실행되며, 실제 LLM 동시 요청 수는
+        제공자의 동시 요청 제한을 따릅니다. 스트리밍 출력은 질의별로 섞일 수 있습니다.
+        체크포인트를 사용하면 중단된 배치를 다시 실행할 때 완료된 질의는 건너뛰고
+        중단된 질의는 이어서 실행하며, 같은 질의가 여러 번 있으면 한 번만 실행합니다.
+        
+        Args:
+            queries: 사용자 질의 목록
+            max_concurrency: 동시에 실행할 최대 질의 수 (None이면 제한 없음)
+            
+        Returns:
+            질의 순서대로 정렬된 최종 상태 목록 (예상하지 못한 오류는 error 항목에 기록)
+        """
+        if not queries:
+            return []
+        
+        states = [self._initial_state(query) for query in queries]
+        run_contexts = [self._new_run_context(query) for query in queries]
+        for query in queries:
+            self.display.show_original_query(query)
+        
+        configs = [
+            {**self._run_config(run_context), 'max_concurrency': max_concurrency}
+            for run_context in run_contexts
+        ]
+        inputs: List[Optional[WorkflowState]] = list(states)
+        results: List[Any] = [None] * len(queries)
+        pending = list(range(len(queries)))
+        duplicates: Dict[int, int] = {}
+        
+        if self.checkpointer is not None:
+            pending = []
+            first_index: Dict[str, int] = {}
+            for i, run_context in enumerate(run_contexts):
+                if run_context.run_id in first_index:
+                    duplicates[i] = first_index[run_context.run_id]
+                    continue
+                first_index[run_context.run_id] = i
+                plan, value = self._resume_plan(
+                    await self.workflow.aget_state(configs[i]), states[i]
+                )
+                if plan == 'done':
+                    results[i] = value
+                    continue
+                if plan == 'retry':
+                    await self.checkpointer.adelete_thread(run_context.run_id)
+                inputs[i] = value
+                pending.append(i)
+        
+        if pending:
+            batch = await self.workflow.abatch(
+                [inputs[i] for i in pending],
+                config=[configs[i] for i in pending],
+                return_exceptions=True
+            )
+            for i, result in zip(pending, batch):
+                results[i] = result
+        
+        final_states = []
+        for i, (state, run_context) in enumerate(zip(states, run_contexts)):
+            result = results[duplicates.get(i, i)]
+            if isinstance(result, Exception):
+                result = {**state, 'error': f"워크플로우 오류: {result}"}
+            elif i in duplicates:
+                result = {**result, 'timestamps': dict(result['timestamps'])}
+            final_states.append(self._finish_run(result, run_context))
+        return final_states
+    
+    def _pipeline(self, workers: Union[int, Dict[str, int]], queue_size: int,
+                  ordered: bool) -> StagePipeline:
+        """
+        질의를 노드 단위 단계로 처리하는 파이프라인 구성
+        
+        각 단계는 (상태, RunContext)를 받아 비동기 노드를 실행합니다. 분석과 최적화는
+        parallel 설정과 관계없이 별도 단계로 나뉘며, 질의 사이에서 겹쳐 실행됩니다.
+        
+        Args:
+            workers: 단계별 작업자 수
+            queue_size: 단계 사이 큐의 최대 크기
+            ordered: 입력 순서대로 결과를 반환할지 여부
+            
+        Returns:
+            StagePipeline 인스턴스
+        """
+        async def start(query: str) -> Tuple[WorkflowState, RunContext]:
+            self.display.show_original_query(query)
+            return self._initial_state(query), self._new_run_context(query)
+        
+        def stage(anode: Callable[..., Awaitable[WorkflowState]]):
+            async def run(item: Tuple[WorkflowState, RunContext]):
+                state, run_context = item
+                try:
+                    state = await anode(state, run_context)
+                except Exception as e:
+                    state['error'] = state['error'] or f"워크플로우 오류: {e}"
+                return state, run_context
+            return run
+        
+        if self.fused:
+            nodes = [
+                ('analyze_optimize', self._aanalyze_optimize_node),
+                ('invoke_llm', self._ainvoke_llm_node)
+            ]
+        else:
+            nodes = [
+                ('analyze', self._aanalyze_node),
+                ('optimize', self._aoptimize_node),
+                ('invoke_llm', self._ainvoke_llm_node)
+            ]
+        return StagePipeline(
+            [('start', start)] + [(name, stage(anode)) for name, anode in nodes],
+            workers=workers,
+            queue_size=queue_size,
+            ordered=ordered
+        )
     
-    def get_state_history(self) -> List[WorkflowState]:
+    async def astream_many(self, queries: Union[Iterable[str], AsyncIterable[str]],
+                           workers: Union[int, Dict[str, int]] = 1, queue_size: int = 8,
+                           ordered: bool = False) -> AsyncIterator[WorkflowState]:
+        """
+        여러 질의를 단계별 파이프라인으로 실행하며 끝난 결과를 차례로 반환
+        
+        단계(analyze, optimize, invoke_llm 또는 analyze_optimize, invoke_llm)마다
+        작업자와 크기가 정해진 큐가 있어, 한 질의의 LLM 호출과 다음 질의의 분석이
+        동시에 진행됩니다. 처리량은 가장 느린 단계에 맞춰지며, 결과를 꺼내지 않으면
+        질의도 더 읽지 않습니다. 그래프와 체크포인트를 거치지 않고 노드를 직접 실행합니다.
+        
+        Args:
+            queries: 사용자 질의 (동기 또는 비동기 반복자)
+            workers: 단계별 작업자 수 (정수 또는 {단계 이름: 작업자 수})
+            queue_size: 단계 사이 큐의 최대 크기
+            ordered: True면 입력 순서대로, False면 끝난 순서대로 반환
+            
+        Returns:
+            최종 상태의 비동기 반복자
+        """
+        results = self._pipeline(workers, queue_size, ordered).astream(queries)
+        try:
+            async for result in results:
+                if isinstance(result, Exception):
+                    raise result
+                yield self._finish_run(*result)
+        finally:
+            await results.aclose()
+    
+    def stream_many(self, queries: Union[Iterable[str], AsyncIterable[str]],
+                    workers: Union[int, Dict[str, int]] = 1, queue_size: int = 8,
+                    ordered: bool = False) -> Iterator[WorkflowState]:
+        """
+        astream_many의 동기 버전 (파이프라인은 별도 스레드의 이벤트 루프에서 실행)
+        
+        Args:
+            queries: 사용자 질의 (동기 또는 비동기 반복자)
+            workers: 단계별 작업자 수 (정수 또는 {단계 이름: 작업자 수})
+            queue_size: 단계 사이 큐의 최대 크기
+            ordered: True면 입력 순서대로, False면 끝난 순서대로 반환
+            
+        Returns:
+            최종 상태의 반복자
+        """
+        results = self._pipeline(workers, queue_size, ordered).stream(queries)
+        try:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+                yield self._finish_run(*result)
+        finally:
+            results.close()
+    
+    def get_state_history(self) -> List[HistoryRecord]:
         """
         상태 히스토리 반환
         
+        완료된 실행의 단계 기록을 실행 단위로 이어 붙인 목록 중 최근 history_size개입니다
+        (진행 중인 실행의 기록은 RunContext.history).
+        
         Returns:
-            상태 히스토리 리스트
+            HistoryRecord 리스트 (오래된 순)
         """
-        return self.state_history
+        return self.state_history.records()
     
     def clear_history(self):
         """상태 히스토리 초기화"""
-        self.state_history = []
+        self.state_history.clear()
@@ -0,0 +1,86 @@
+"""
+BackendPool 테스트
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend_pool import Backend, BackendPool
+
+
+class TestBackendPool:
+    """BackendPool 테스트 클래스"""
+    
+    def test_requires_backend(self):
+        """백엔드가 없으면 오류가 발생하는지 테스트"""
+        with pytest.raises(ValueError):
+            BackendPool([])
+    
+    def test_least_outstanding_requests(self):
+        """진행 중인 요청이 적은 백엔드를 선택하는지 테스트"""
+        a, b = Backend("http://a"), Backend("http://b")
+        pool = BackendPool([a, b])
+        a.ewma_latency = b.ewma_latency = 1.0
+        
+        first = pool.acquire()
+        second = pool.acquire()
+        
+        assert {first, second} == {a, b}
+        assert a.inflight == 1 and b.inflight == 1
+    
+    def test_prefers_lower_latency(self):
+        """지연 시간 EWMA가 낮은 백엔드를 선택하는지 테스트"""
+        slow, fast = Backend("http://slow"), Backend("http://fast")
+        pool = BackendPool([slow, fast])
+        
+        pool.release(pool.acquire([fast]), 2.0, success=True)
+        pool.release(pool.acquire([slow]), 0.5, success=True)
+        
+        assert pool.acquire() is fast
+    
+    def test_ewma_update(self):
+        """지연 시간 EWMA 계산 테스트"""
+        backend = Backend("http://a")
+        pool = BackendPool([backend], ewma_alpha=0.5)
+        
+        pool.release(pool.acquire(), 1.0, success=True)
+        pool.release(pool.acquire(), 3.0, success=True)
+        
+        assert backend.ewma_latency == pytest.approx(2.0)
+        assert backend.inflight == 0
+    
+    def test_ejection_after_consecutive_failures(self):
+        """연속 실패 시 풀에서 제외되는지 테스트"""
+        a, b = Backend("http://a"), Backend("http://b")
+        pool = BackendPool([a, b], max_failures=2)
+        
+        assert pool.release(pool.acquire([b]), 0.1, success=False) is False
+        assert pool.release(pool.acquire([b]), 0.1, success=False) is True
+        
+        assert a.healthy is False
+        for _ in range(3):
+            backend = pool.acquire()
+            assert backend is b
+            pool.cancel(backend)
+    
+    def test_all_unhealthy_still_routes(self):
+        """모든 백엔드가 제외되어도 요청을 보낼 수 있는지 테스트"""
+        backend = Backend("http://a")
+        pool = BackendPool([backend])
+        pool.mark_unhealthy(backend)
+        
+        assert pool.acquire() is backend
+    
+    def test_probe_restores_backend(self):
+        """재검사가 성공하면 백엔드가 복구되는지 테스트"""
+        a, b = Backend("http://a"), Backend("http://b")
+        pool = BackendPool([a, b], probe_interval=0.01, probe=lambda backend: True)
+        
+        pool.mark_unhealthy(a)
+        pool._probe_thread.join(timeout=1.0)
+        
+        assert a.healthy is True
+        assert pool.get_stats()[0]['healthy'] is True
+        pool.close()
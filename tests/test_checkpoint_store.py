@@ -0,0 +1,101 @@
+"""
+SqliteCheckpointSaver 테스트
+"""
+import sqlite3
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from src.checkpoint_store import SqliteCheckpointSaver
+
+
+def _config(thread_id: str, checkpoint_id: str = None) -> dict:
+    """테스트용 그래프 설정 생성"""
+    configurable = {'thread_id': thread_id, 'checkpoint_ns': ''}
+    if checkpoint_id:
+        configurable['checkpoint_id'] = checkpoint_id
+    return {'configurable': configurable}
+
+
+def _checkpoint(checkpoint_id: str, query: str) -> dict:
+    """테스트용 체크포인트 생성"""
+    checkpoint = empty_checkpoint()
+    checkpoint['id'] = checkpoint_id
+    checkpoint['channel_values'] = {'original_query': query}
+    return checkpoint
+
+
+class TestSqliteCheckpointSaver:
+    """SqliteCheckpointSaver 테스트 클래스"""
+    
+    def test_put_and_get_tuple(self):
+        """체크포인트와 노드 쓰기를 저장하고 조회하는지 테스트"""
+        saver = SqliteCheckpointSaver(path=':memory:')
+        first = saver.put(_config('run-1'), _checkpoint('0001', '질의'), {'step': 0}, {})
+        second = saver.put(first, _checkpoint('0002', '질의'), {'step': 1}, {})
+        saver.put_writes(second, [('analysis', {'명확성': '7/10'})], 'task-1')
+        
+        latest = saver.get_tuple(_config('run-1'))
+        assert latest.config['configurable']['checkpoint_id'] == '0002'
+        assert latest.checkpoint['channel_values'] == {'original_query': '질의'}
+        assert latest.metadata['step'] == 1
+        assert latest.parent_config['configurable']['checkpoint_id'] == '0001'
+        assert latest.pending_writes == [('task-1', 'analysis', {'명확성': '7/10'})]
+        
+        assert saver.get_tuple(_config('run-1', '0001')).parent_config is None
+        assert saver.get_tuple(_config('run-2')) is None
+        assert [t.config['configurable']['checkpoint_id']
+                for t in saver.list(_config('run-1'))] == ['0002', '0001']
+        assert len(list(saver.list(_config('run-1'), filter={'step': 0}))) == 1
+        assert len(list(saver.list(None, limit=1))) == 1
+    
+    def test_batched_commits(self, tmp_path):
+        """쓰기를 commit_every개 단위로 커밋하고 flush로 남은 쓰기를 커밋하는지 테스트"""
+        path = str(tmp_path / "checkpoints.db")
+        saver = SqliteCheckpointSaver(path=path, commit_every=3, commit_interval=3600)
+        
+        def committed() -> int:
+            conn = sqlite3.connect(path)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            finally:
+                conn.close()
+        
+        for i in range(5):
+            saver.put(_config(f"run-{i}"), _checkpoint(f"{i:04}", f"질의 {i}"), {}, {})
+        
+        # 커밋 전이라도 같은 저장소에서는 바로 조회
+        assert saver.get_tuple(_config('run-4')) is not None
+        assert saver.get_stats() == {'threads': 5, 'checkpoints': 5, 'pending': 2, 'commits': 1}
+        assert committed() == 3
+        
+        saver.flush()
+        assert committed() == 5
+        assert saver.commits == 2
+        saver.close()
+    
+    def test_persistence_and_delete_thread(self, tmp_path):
+        """다시 열어도 체크포인트가 남고 delete_thread로 삭제되는지 테스트"""
+        path = str(tmp_path / "nested" / "checkpoints.db")
+        saver = SqliteCheckpointSaver(path=path)
+        config = saver.put(_config('run-1'), _checkpoint('0001', '질의'), {}, {})
+        saver.put_writes(config, [('llm_response', '응답')], 'task-1')
+        saver.close()
+        
+        reopened = SqliteCheckpointSaver(path=path)
+        assert reopened.get_tuple(_config('run-1')).pending_writes == [
+            ('task-1', 'llm_response', '응답')
+        ]
+        
+        reopened.delete_thread('run-1')
+        assert reopened.get_tuple(_config('run-1')) is None
+        reopened.close()
+    
+    def test_invalid_commit_every(self):
+        """commit_every가 1보다 작으면 오류가 발생하는지 테스트"""
+        with pytest.raises(ValueError):
+            SqliteCheckpointSaver(path=':memory:', commit_every=0)
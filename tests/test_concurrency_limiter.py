@@ -0,0 +1,171 @@
+"""
+AdaptiveLimiter 테스트
+"""
+import asyncio
+import threading
+import time
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.concurrency_limiter import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter:
+    """AdaptiveLimiter 테스트 클래스"""
+    
+    def test_invalid_bounds(self):
+        """잘못된 한도 범위 테스트"""
+        with pytest.raises(ValueError):
+            AdaptiveLimiter(min_limit=4, max_limit=2)
+    
+    def test_additive_increase_when_saturated(self):
+        """한도가 찬 상태에서 지연 시간이 안정적이면 한도가 늘어나는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=8)
+        
+        for _ in range(20):
+            limiter.acquire()
+            limiter.acquire()
+            limiter.release(1.0, success=True)
+            limiter.release(1.0, success=True)
+        
+        assert limiter.limit > 2
+    
+    def test_no_increase_when_idle(self):
+        """한도를 다 쓰지 않으면 늘리지 않는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=4)
+        
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(1.0, success=True)
+        
+        assert limiter.limit == 4
+    
+    def test_multiplicative_decrease(self):
+        """오류와 지연 시간 급증 시 한도가 줄어드는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=8, backoff=0.5, tolerance=2.0)
+        
+        limiter.acquire()
+        limiter.release(1.0, success=True)
+        limiter.acquire()
+        limiter.release(5.0, success=True)
+        assert limiter.limit == 4
+        
+        limiter.acquire()
+        limiter.release(1.0, success=False)
+        assert limiter.limit == 2
+        
+        # 취소는 한도에 영향 없음
+        limiter.acquire()
+        limiter.release(None, success=None)
+        assert limiter.limit == 2
+        
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(1.0, success=False)
+        assert limiter.limit == 1
+    
+    def test_mixed_latency_keys(self):
+        """짧은 요청과 긴 요청이 섞여도 요청 종류별 기준선으로 한도를 유지하는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=8)
+        
+        for _ in range(50):
+            for key, latency in (('analyze', 1.0), ('optimize', 1.2), ('answer', 20.0)):
+                limiter.acquire()
+                limiter.release(latency, success=True, key=key)
+        
+        stats = limiter.get_stats()
+        assert limiter.limit == 4
+        assert stats['baselines'] == 3
+        assert stats['baseline_latency'] == pytest.approx(1.0)
+    
+    def test_spike_moves_baseline_slowly(self):
+        """급증한 지연 시간이 계속되면 기준선이 천천히 따라가는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=8, min_limit=1, tolerance=2.0,
+                                  baseline_alpha=0.05, spike_alpha=0.1)
+        limiter.acquire()
+        limiter.release(1.0, success=True)
+        
+        spikes = 0
+        while limiter.get_stats()['baseline_latency'] * 2.0 < 5.0:
+            limiter.acquire()
+            limiter.release(5.0, success=True)
+            spikes += 1
+            assert spikes < 100
+        
+        assert limiter.limit == 1
+        
+        # 기준선이 따라온 뒤에는 같은 지연 시간을 급증으로 보지 않고 한도를 다시 늘림
+        limiter.acquire()
+        limiter.release(5.0, success=True)
+        assert limiter.limit == 2
+    
+    def test_blocks_at_limit(self):
+        """한도를 넘는 요청이 대기하는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        acquired = threading.Event()
+        
+        limiter.acquire()
+        
+        def worker():
+            limiter.acquire()
+            acquired.set()
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        while limiter.get_stats()['queued'] < 1:
+            time.sleep(0.001)
+        assert not acquired.is_set()
+        
+        limiter.release(0.1, success=True)
+        thread.join(timeout=5)
+        
+        assert acquired.is_set()
+        stats = limiter.get_stats()
+        assert stats['inflight'] == 1
+        assert stats['queued'] == 0
+        assert stats['max_wait'] > 0
+    
+    def test_async_limit(self):
+        """비동기 요청이 한도 안에서만 동시에 실행되는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        running = 0
+        peak = 0
+        
+        async def task():
+            nonlocal running, peak
+            await limiter.aacquire()
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            limiter.release(0.01, success=True)
+        
+        async def run():
+            await asyncio.gather(*[task() for _ in range(6)])
+        
+        asyncio.run(run())
+        
+        assert peak == 2
+        assert limiter.get_stats()['inflight'] == 0
+    
+    def test_async_cancel_while_queued(self):
+        """대기 중 취소된 요청이 허가를 잃지 않는지 테스트"""
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        
+        async def run():
+            await limiter.aacquire()
+            waiter = asyncio.ensure_future(limiter.aacquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            limiter.release(0.01, success=True)
+        
+        asyncio.run(run())
+        
+        stats = limiter.get_stats()
+        assert stats['inflight'] == 0
+        assert stats['queued'] == 0
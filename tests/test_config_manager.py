@@ -112,6 +112,101 @@ class TestConfigManager:
         assert isinstance(display_config.show_timestamps, bool)
         assert isinstance(display_config.color_output, bool)
     
+    def test_stage_overrides(self):
+        """단계별 LLM 설정 테스트"""
+        config = ConfigManager().get_default_config()
+        config['llm']['stages'] = {
+            'analyze': {'model': 'small', 'base_url': 'http://gpu-2:11434'}
+        }
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            yaml.dump(config, f)
+            temp_path = f.name
+        
+        try:
+            llm_config = ConfigManager(temp_path).get_llm_config()
+            
+            analyze = llm_config.for_stage('analyze')
+            assert analyze['model'] == 'small'
+            assert analyze['base_url'] == 'http://gpu-2:11434'
+            assert analyze['temperature'] == llm_config.temperature
+            assert llm_config.for_stage('invoke_llm')['model'] == llm_config.model
+        finally:
+            os.unlink(temp_path)
+    
+    def test_validate_config_invalid_stage(self):
+        """잘못된 단계 설정 검증 테스트"""
+        config_manager = ConfigManager()
+        
+        config = config_manager.get_default_config()
+        config['llm']['stages'] = {'summarize': {'model': 'small'}}
+        assert not config_manager.validate_config(config)
+        
+        config['llm']['stages'] = {'analyze': {'provider': 'lmstudio'}}
+        assert not config_manager.validate_config(config)
+    
+    def test_generation_options(self):
+        """단계별 생성 옵션 설정 테스트"""
+        config_manager = ConfigManager()
+        opt_config = config_manager.get_optimization_config()
+        
+        assert opt_config.generation['analyze']['max_tokens'] > 0
+        assert opt_config.generation['optimize']['max_tokens'] > 0
+        # 머리말 뒤 빈 줄에서 개선된 질의가 잘리지 않도록 stop을 쓰지 않음
+        assert 'stop' not in opt_config.generation['optimize']
+        
+        config = config_manager.get_default_config()
+        config['optimization']['generation'] = {'analyze': {'stop': '\n'}}
+        assert not config_manager.validate_config(config)
+        
+        config['optimization']['generation'] = {'invoke_llm': {'max_tokens': 10}}
+        assert not config_manager.validate_config(config)
+    
+    def test_history_config(self):
+        """실행 기록 보관 설정 테스트"""
+        config_manager = ConfigManager()
+        history_config = config_manager.get_history_config()
+        assert history_config.capacity == 1000
+        assert history_config.spill_path is None
+        
+        config = config_manager.get_default_config()
+        config['history']['capacity'] = -1
+        assert not config_manager.validate_config(config)
+    
+    def test_checkpoint_config(self):
+        """워크플로우 체크포인트 설정 테스트"""
+        config_manager = ConfigManager()
+        checkpoint_config = config_manager.get_checkpoint_config()
+        assert checkpoint_config.enabled is False
+        assert checkpoint_config.path == '.cache/checkpoints.db'
+        assert checkpoint_config.commit_every == 100
+        
+        config = config_manager.get_default_config()
+        config['checkpoint']['commit_every'] = 0
+        assert not config_manager.validate_config(config)
+    
+    def test_analysis_format(self):
+        """분석 응답 형식 설정 테스트"""
+        config_manager = ConfigManager()
+        assert config_manager.get_optimization_config().analysis_format == 'text'
+        
+        config = config_manager.get_default_config()
+        config['optimization']['analysis_format'] = 'json'
+        assert config_manager.validate_config(config)
+        
+        config['optimization']['analysis_format'] = 'xml'
+        assert not config_manager.validate_config(config)
+    
+    def test_load_invalid_file_sets_error(self, tmp_path, capsys):
+        """잘못된 설정 파일은 출력 없이 load_error로 알리는지 테스트"""
+        path = tmp_path / "broken.yaml"
+        path.write_text("llm: [unclosed", encoding='utf-8')
+        
+        config_manager = ConfigManager(str(path))
+        
+        assert config_manager.load_error.startswith("설정 파일 로드 실패")
+        assert capsys.readouterr().out == ""
+    
     def test_load_nonexistent_file(self):
         """존재하지 않는 파일 로드 테스트"""
         config_manager = ConfigManager('nonexistent_file.yaml')
@@ -0,0 +1,41 @@
+"""
+DisplayManager 테스트
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.display import DisplayManager
+
+
+class TestDisplayManager:
+    """DisplayManager 테스트 클래스"""
+    
+    def test_blocks_do_not_interleave(self):
+        """여러 스레드가 함께 출력해도 단계 블록이 섞이지 않는지 테스트"""
+        display = DisplayManager(show_timestamps=False, color_output=False)
+        lines = []
+        
+        def slow_print(*args, **kwargs):
+            lines.append((threading.current_thread().name, ' '.join(map(str, args))))
+            time.sleep(0.001)
+        
+        def worker():
+            for _ in range(5):
+                display.show_step(threading.current_thread().name, "설명")
+        
+        with patch('builtins.print', side_effect=slow_print):
+            threads = [threading.Thread(target=worker, name=f"node-{i}") for i in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=5)
+        
+        # show_step은 네 줄을 출력하므로 네 줄씩 같은 스레드의 출력이어야 함
+        assert len(lines) == 40
+        for start in range(0, len(lines), 4):
+            assert len({name for name, _ in lines[start:start + 4]}) == 1
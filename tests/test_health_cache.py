@@ -0,0 +1,67 @@
+"""
+HealthCache 테스트
+"""
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.health_cache import HealthCache
+
+
+class TestHealthCache:
+    """HealthCache 테스트 클래스"""
+    
+    def test_fresh_within_ttl(self, tmp_path):
+        """TTL 안에서는 캐시된 결과가 유효한지 테스트"""
+        cache = HealthCache(ttl=60, state_path=str(tmp_path / "health.json"))
+        url = "http://localhost:11434/api/tags"
+        
+        assert cache.is_fresh(url) is False
+        
+        with patch('src.health_cache.time.time', return_value=1000.0):
+            cache.mark_healthy(url)
+        with patch('src.health_cache.time.time', return_value=1030.0):
+            assert cache.is_fresh(url) is True
+        with patch('src.health_cache.time.time', return_value=1100.0):
+            assert cache.is_fresh(url) is False
+    
+    def test_state_file_shared_between_instances(self, tmp_path):
+        """상태 파일을 통해 다음 실행에서도 결과가 유지되는지 테스트"""
+        path = str(tmp_path / "state" / "health.json")
+        url = "http://localhost:1234/v1/models"
+        
+        HealthCache(ttl=60, state_path=path).mark_healthy(url)
+        
+        assert HealthCache(ttl=60, state_path=path).is_fresh(url) is True
+    
+    def test_invalidate(self, tmp_path):
+        """무효화 후에는 다시 검사하는지 테스트"""
+        path = str(tmp_path / "health.json")
+        url = "http://localhost:11434/api/tags"
+        cache = HealthCache(ttl=60, state_path=path)
+        
+        cache.mark_healthy(url)
+        cache.invalidate(url)
+        
+        assert cache.is_fresh(url) is False
+        assert HealthCache(ttl=60, state_path=path).is_fresh(url) is False
+    
+    def test_corrupt_state_file_ignored(self, tmp_path):
+        """손상된 상태 파일은 무시하는지 테스트"""
+        path = tmp_path / "health.json"
+        path.write_text("not json")
+        
+        cache = HealthCache(ttl=60, state_path=str(path))
+        
+        assert cache.is_fresh("http://localhost:11434/api/tags") is False
+    
+    def test_zero_ttl_disables_cache(self):
+        """ttl=0이면 캐시하지 않는지 테스트"""
+        cache = HealthCache(ttl=0, state_path=None)
+        url = "http://localhost:11434/api/tags"
+        
+        cache.mark_healthy(url)
+        
+        assert cache.is_fresh(url) is False
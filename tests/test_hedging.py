@@ -0,0 +1,68 @@
+"""
+HedgePolicy 테스트
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.hedging import HedgePolicy
+
+
+class TestHedgePolicy:
+    """HedgePolicy 테스트 클래스"""
+    
+    def test_invalid_percentile(self):
+        """잘못된 백분위 테스트"""
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=0)
+    
+    def test_no_delay_without_samples(self):
+        """표본이 부족하면 헤지하지 않는지 테스트"""
+        policy = HedgePolicy(min_samples=5)
+        for _ in range(4):
+            policy.record(1.0)
+        
+        assert policy.delay() is None
+    
+    def test_percentile_delay(self):
+        """백분위 지연 시간 계산 테스트"""
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0.0)
+        for i in range(1, 11):
+            policy.record(float(i))
+        
+        assert policy.delay() == 9.0
+    
+    def test_min_delay_and_window(self):
+        """최소 대기 시간과 표본 창 크기 테스트"""
+        policy = HedgePolicy(percentile=50, window=3, min_samples=3, min_delay=0.5)
+        for latency in [10.0, 0.1, 0.1, 0.1]:
+            policy.record(latency)
+        
+        assert policy.delay() == 0.5
+        assert policy.get_stats()['samples'] == 3
+    
+    def test_samples_per_key(self):
+        """요청 종류별로 표본을 따로 기록하는지 테스트"""
+        policy = HedgePolicy(percentile=95, min_samples=3, min_delay=0.0)
+        for _ in range(3):
+            policy.record(1.0, key='analyze')
+            policy.record(20.0, key='answer')
+        
+        assert policy.delay('analyze') == 1.0
+        assert policy.delay('answer') == 20.0
+        assert policy.delay('optimize') is None
+        stats = policy.get_stats()
+        assert stats['samples'] == 6
+        assert stats['delay'] == 1.0
+    
+    def test_hedge_stats(self):
+        """헤지 결과 통계 테스트"""
+        policy = HedgePolicy()
+        policy.record_hedge(won=True)
+        policy.record_hedge(won=False)
+        
+        stats = policy.get_stats()
+        assert stats['hedged'] == 2
+        assert stats['hedge_wins'] == 1
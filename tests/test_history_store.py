@@ -0,0 +1,100 @@
+"""
+HistoryStore 테스트
+"""
+import json
+import threading
+import tracemalloc
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.history_store import HistoryRecord, HistoryStore, monotonic_ns, to_datetime
+
+
+def _record(i: int, query: str = "질의") -> HistoryRecord:
+    """테스트용 단계 기록 생성"""
+    return HistoryRecord(f"run-{i}", query, 'analyze', monotonic_ns(), 0.1, {'명확성': i})
+
+
+class TestHistoryStore:
+    """HistoryStore 테스트 클래스"""
+    
+    def test_ring_buffer_evicts_oldest(self):
+        """용량을 넘으면 가장 오래된 기록부터 밀려나는지 테스트"""
+        store = HistoryStore(capacity=3)
+        for i in range(5):
+            store.append(_record(i))
+        
+        assert [record.run_id for record in store.records()] == ['run-2', 'run-3', 'run-4']
+        assert store.get_stats() == {'entries': 3, 'capacity': 3, 'evicted': 2, 'spilled': 0}
+        
+        store.clear()
+        assert len(store) == 0
+    
+    def test_spill_to_disk(self, tmp_path):
+        """밀려난 기록을 JSON Lines 파일에 이어 쓰는지 테스트"""
+        path = tmp_path / "history" / "spill.jsonl"
+        store = HistoryStore(capacity=2, spill_path=str(path))
+        store.extend(_record(i) for i in range(5))
+        store.close()
+        
+        lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [line['run_id'] for line in lines] == ['run-0', 'run-1', 'run-2']
+        assert lines[0]['output'] == {'명확성': 0}
+        assert lines[0]['time'] == to_datetime(lines[0]['timestamp']).isoformat()
+        assert store.get_stats()['spilled'] == 3
+    
+    def test_zero_capacity(self):
+        """용량이 0이면 기록을 보관하지 않는지 테스트"""
+        store = HistoryStore(capacity=0)
+        store.append(_record(0))
+        assert store.records() == []
+        
+        with pytest.raises(ValueError):
+            HistoryStore(capacity=-1)
+    
+    def test_extend_keeps_runs_contiguous(self):
+        """여러 스레드가 실행 단위로 추가해도 기록이 섞이지 않는지 테스트"""
+        store = HistoryStore(capacity=3000)
+        
+        def worker(i):
+            store.extend(HistoryRecord(f"run-{i}", "질의", node, monotonic_ns(), 0.0)
+                         for node in ('analyze', 'optimize', 'invoke_llm'))
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        records = store.records()
+        assert len(records) == 600
+        for i in range(0, len(records), 3):
+            assert len({record.run_id for record in records[i:i + 3]}) == 1
+    
+    def test_memory_stays_flat(self):
+        """기록이 계속 쌓여도 메모리 사용량이 용량에 묶여 있는지 테스트"""
+        store = HistoryStore(capacity=100)
+        query = "긴 질의 " * 50
+        
+        tracemalloc.start()
+        try:
+            for i in range(10000):
+                store.append(_record(i, query))
+            first, _ = tracemalloc.get_traced_memory()
+            for i in range(100000):
+                store.append(_record(i, query))
+            second, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        assert len(store) == 100
+        assert second - first < 64 * 1024
+    
+    def test_record_slots(self):
+        """기록이 __slots__로 정의되어 인스턴스 딕셔너리가 없는지 테스트"""
+        record = _record(0)
+        assert not hasattr(record, '__dict__')
+        assert record.as_dict()['node'] == 'analyze'
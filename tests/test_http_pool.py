@@ -0,0 +1,69 @@
+"""
+HTTPConnectionPool 테스트
+"""
+import asyncio
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.http_pool import HTTPConnectionPool
+
+
+class TestHTTPConnectionPool:
+    """HTTPConnectionPool 테스트 클래스"""
+    
+    def test_limits_and_timeout(self):
+        """설정값이 연결 풀 제한과 타임아웃에 반영되는지 테스트"""
+        pool = HTTPConnectionPool(
+            pool_size=4,
+            connect_timeout=2.0,
+            read_timeout=30.0,
+            keepalive_expiry=15.0
+        )
+        
+        assert pool.limits.max_connections == 4
+        assert pool.limits.max_keepalive_connections == 4
+        assert pool.limits.keepalive_expiry == 15.0
+        assert pool.timeout.connect == 2.0
+        assert pool.timeout.read == 30.0
+    
+    def test_sync_client_is_shared(self):
+        """동기 클라이언트가 재사용되는지 테스트"""
+        pool = HTTPConnectionPool()
+        
+        assert pool.client is pool.client
+        
+        pool.close()
+        assert pool._client is None
+    
+    def test_async_client_per_event_loop(self):
+        """비동기 클라이언트가 이벤트 루프별로 생성되는지 테스트"""
+        pool = HTTPConnectionPool()
+        
+        async def get_clients():
+            return pool.async_client, pool.async_client
+        
+        first_a, first_b = asyncio.run(get_clients())
+        second_a, _ = asyncio.run(get_clients())
+        
+        assert first_a is first_b
+        assert first_a is not second_a
+    
+    def test_async_client_closed_with_loop(self):
+        """asyncio.run이 끝나면 그 루프의 비동기 클라이언트가 닫히는지 테스트"""
+        pool = HTTPConnectionPool()
+        
+        async def get_client():
+            return pool.async_client
+        
+        client = asyncio.run(get_client())
+        assert client.is_closed
+        
+        async def close_explicitly():
+            client = pool.async_client
+            await pool.aclose()
+            return client
+        
+        assert asyncio.run(close_explicitly()).is_closed
+        assert pool._async_clients == {}
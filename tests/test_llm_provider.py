@@ -1,20 +1,33 @@
 """
 LLMProviderManager 테스트
 """
+import asyncio
+import json
+import threading
+import time
+import httpx
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.llm_provider import LLMProviderManager, LLMConnectionError
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import Generation, LLMResult
+
+from src.llm_provider import (
+    LLMProviderManager, LLMConnectionError, CallMeter, UsageLedger, DirectHTTPLLM
+)
+from src.response_cache import ResponseCache
+from src.http_pool import HTTPConnectionPool
+from src.health_cache import HealthCache
 
 
 class TestLLMProviderManager:
     """LLMProviderManager 테스트 클래스"""
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_validate_connection_ollama_success(self, mock_get):
         """Ollama 연결 검증 성공 테스트"""
         # Mock 응답 설정
@@ -32,7 +45,7 @@ class TestLLMProviderManager:
             
             assert provider.validate_connection() == True
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_validate_connection_ollama_failure(self, mock_get):
         """Ollama 연결 검증 실패 테스트"""
         # Mock 응답 설정 (연결 실패)
@@ -46,7 +59,7 @@ class TestLLMProviderManager:
                 base_url='http://localhost:11434'
             )
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_validate_connection_lmstudio_success(self, mock_get):
         """LM Studio 연결 검증 성공 테스트"""
         mock_response = Mock()
@@ -62,7 +75,7 @@ class TestLLMProviderManager:
             
             assert provider.validate_connection() == True
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     @patch('src.llm_provider.Ollama')
     def test_initialize_llm_ollama(self, mock_ollama, mock_get):
         """Ollama LLM 초기화 테스트"""
@@ -83,7 +96,7 @@ class TestLLMProviderManager:
         assert provider.llm is not None
         mock_ollama.assert_called_once()
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_get_provider_info(self, mock_get):
         """제공자 정보 반환 테스트"""
         mock_response = Mock()
@@ -107,7 +120,7 @@ class TestLLMProviderManager:
             assert info['temperature'] == 0.5
             assert info['max_tokens'] == 1000
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_invoke_with_retry(self, mock_get):
         """재시도 로직 테스트"""
         mock_response = Mock()
@@ -134,7 +147,7 @@ class TestLLMProviderManager:
             assert result == "Success on second attempt"
             assert mock_llm.invoke.call_count == 2
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_invoke_all_retries_failed(self, mock_get):
         """모든 재시도 실패 테스트"""
         mock_response = Mock()
@@ -156,3 +169,939 @@ class TestLLMProviderManager:
             # 모든 재시도 실패 시 예외 발생
             with pytest.raises(LLMConnectionError):
                 provider.invoke("test prompt", retry_count=2)
+    
+    @patch('src.llm_provider.asyncio.sleep', new_callable=AsyncMock)
+    @patch('src.http_pool.httpx.Client.get')
+    def test_ainvoke_with_retry(self, mock_get, mock_sleep):
+        """비동기 호출 재시도 로직 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+            
+            mock_llm = Mock()
+            mock_llm.ainvoke = AsyncMock(side_effect=[
+                Exception("First attempt failed"),
+                "Success on second attempt"
+            ])
+            provider.llm = mock_llm
+            
+            result = asyncio.run(provider.ainvoke("test prompt", retry_count=3))
+            assert result == "Success on second attempt"
+            assert mock_llm.ainvoke.call_count == 2
+            mock_sleep.assert_awaited_once_with(2)
+    
+    @patch('src.llm_provider.asyncio.sleep', new_callable=AsyncMock)
+    @patch('src.http_pool.httpx.Client.get')
+    def test_ainvoke_all_retries_failed(self, mock_get, mock_sleep):
+        """비동기 호출 모든 재시도 실패 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+            
+            mock_llm = Mock()
+            mock_llm.ainvoke = AsyncMock(side_effect=Exception("Always fails"))
+            provider.llm = mock_llm
+            
+            with pytest.raises(LLMConnectionError):
+                asyncio.run(provider.ainvoke("test prompt", retry_count=2))
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_invoke_streaming_with_meter(self, mock_get):
+        """스트리밍 호출 및 TTFT 측정 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+            
+            mock_llm = Mock()
+            mock_llm.stream.return_value = iter(["안녕", "하세요", "!"])
+            provider.llm = mock_llm
+            
+            received = []
+            meter = CallMeter(on_token=received.append)
+            result = provider.invoke("test prompt", meter=meter)
+            
+            assert result == "안녕하세요!"
+            assert received == ["안녕", "하세요", "!"]
+            mock_llm.invoke.assert_not_called()
+            
+            metrics = meter.as_dict()
+            assert metrics['ttft'] is not None
+            assert meter.token_count == 3
+    
+    @patch('src.llm_provider.time.sleep')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_stream_no_retry_after_first_chunk(self, mock_get, mock_sleep):
+        """첫 청크 이후 실패 시 재시도하지 않는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        def broken_stream(prompt, config=None):
+            yield "부분 응답"
+            raise Exception("connection reset")
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+            
+            mock_llm = Mock()
+            mock_llm.stream.side_effect = broken_stream
+            provider.llm = mock_llm
+            
+            with pytest.raises(LLMConnectionError, match="스트리밍 중단"):
+                list(provider.stream("test prompt"))
+            assert mock_llm.stream.call_count == 1
+            mock_sleep.assert_not_called()
+    
+    @patch('src.llm_provider.time.sleep')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_stream_backend_acquire_failure(self, mock_get, mock_sleep):
+        """백엔드를 얻기 전에 실패해도 이전 백엔드를 실패로 기록하지 않는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        
+        excluded = []
+        
+        def failing_use_backend(exclude, key=None):
+            excluded.append(list(exclude))
+            raise RuntimeError("limiter closed")
+        
+        with patch.object(provider, '_use_backend', side_effect=failing_use_backend):
+            with pytest.raises(LLMConnectionError, match="limiter closed"):
+                list(provider.stream("test prompt", retry_count=2))
+        
+        assert excluded == [[], []]
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_astream(self, mock_get):
+        """비동기 스트리밍 호출 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        async def fake_astream(prompt, config=None):
+            for chunk in ["a", "b"]:
+                yield chunk
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+            
+            mock_llm = Mock()
+            mock_llm.astream = fake_astream
+            provider.llm = mock_llm
+            
+            meter = CallMeter(on_token=lambda chunk: None)
+            result = asyncio.run(provider.ainvoke("test prompt", meter=meter))
+            
+            assert result == "ab"
+            assert meter.token_count == 2
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_invoke_uses_response_cache(self, mock_get):
+        """응답 캐시 적중 시 LLM을 호출하지 않는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434',
+                cache=ResponseCache(path=':memory:')
+            )
+            
+            mock_llm = Mock()
+            mock_llm.invoke.return_value = "캐시될 응답"
+            provider.llm = mock_llm
+            
+            assert provider.invoke("test prompt") == "캐시될 응답"
+            
+            meter = CallMeter()
+            assert provider.invoke("  test prompt  ", meter=meter) == "캐시될 응답"
+            assert mock_llm.invoke.call_count == 1
+            assert meter.as_dict()['cached'] is True
+            
+            # 캐시 사용 안 함
+            provider.invoke("test prompt", use_cache=False)
+            assert mock_llm.invoke.call_count == 2
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_invoke_passes_generation_options(self, mock_get):
+        """호출별 생성 옵션이 LLM 호출 인자와 캐시 키에 반영되는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434',
+                temperature=0.3,
+                cache=ResponseCache(path=':memory:')
+            )
+            
+            mock_llm = Mock()
+            mock_llm.invoke.return_value = "짧은 응답"
+            provider.llm = mock_llm
+            
+            options = {'max_tokens': 64, 'num_ctx': 2048, 'stop': ['\n\n']}
+            provider.invoke("test prompt", options=options)
+            
+            kwargs = mock_llm.invoke.call_args[1]
+            assert kwargs['options'] == {
+                'temperature': 0.3,
+                'num_predict': 64,
+                'num_ctx': 2048,
+                'stop': ['\n\n']
+            }
+            
+            # 옵션이 다르면 캐시를 공유하지 않음
+            provider.invoke("test prompt")
+            assert mock_llm.invoke.call_count == 2
+            assert 'options' not in mock_llm.invoke.call_args[1]
+            provider.invoke("test prompt", options=options)
+            assert mock_llm.invoke.call_count == 2
+    
+    def test_generation_kwargs_context(self):
+        """생성 컨텍스트는 Ollama 직접 호출에서만 전달하는지 테스트"""
+        options = {'context': [1, 2, 3]}
+        
+        direct = LLMProviderManager(provider='ollama', model='test-model',
+                                    base_url='http://localhost:11434',
+                                    lazy=True, client='direct')
+        assert direct.supports_context
+        assert direct._generation_kwargs(options)['context'] == [1, 2, 3]
+        
+        wrapper = LLMProviderManager(provider='ollama', model='test-model',
+                                     base_url='http://localhost:11434', lazy=True)
+        assert not wrapper.supports_context
+        assert 'context' not in wrapper._generation_kwargs(options)
+    
+    def test_generation_kwargs_openai_compatible(self):
+        """LM Studio에서는 max_tokens와 stop만 전달하는지 테스트"""
+        provider = LLMProviderManager(
+            provider='lmstudio',
+            model='test-model',
+            base_url='http://localhost:1234',
+            lazy=True
+        )
+        
+        assert provider._generation_kwargs(None) == {}
+        assert provider._generation_kwargs(
+            {'max_tokens': 32, 'num_ctx': 4096, 'stop': ['\n']}
+        ) == {'max_tokens': 32, 'stop': ['\n']}
+    
+    def test_generation_kwargs_format(self):
+        """출력 형식이 Ollama format / LM Studio response_format으로 전달되는지 테스트"""
+        schema = {'type': 'object', 'properties': {'clarity': {'type': 'integer'}}}
+        
+        ollama = LLMProviderManager(provider='ollama', model='test-model',
+                                    base_url='http://localhost:11434', lazy=True)
+        assert ollama._generation_kwargs({'format': schema})['format'] == schema
+        
+        lmstudio = LLMProviderManager(provider='lmstudio', model='test-model',
+                                      base_url='http://localhost:1234', lazy=True)
+        response_format = lmstudio._generation_kwargs({'format': schema})['extra_body']['response_format']
+        assert response_format['type'] == 'json_schema'
+        assert response_format['json_schema']['schema'] == schema
+        
+        # 형식이 다르면 요청 키도 다름
+        assert ollama._flight_key("질의", {'format': schema}) != ollama._flight_key("질의", None)
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_validate_connection_uses_shared_pool(self, mock_get):
+        """health check가 공유 연결 풀과 연결 타임아웃을 사용하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        pool = HTTPConnectionPool(connect_timeout=1.5)
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='lmstudio',
+                model='test-model',
+                base_url='http://localhost:1234',
+                http_pool=pool
+            )
+        
+        assert provider.http_pool is pool
+        mock_get.assert_called_with('http://localhost:1234/v1/models', timeout=1.5)
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_validate_connection_http_error(self, mock_get):
+        """HTTP 오류 시 연결 실패로 처리되는지 테스트"""
+        mock_get.side_effect = httpx.ConnectError("Connection refused")
+        
+        with pytest.raises(LLMConnectionError):
+            LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_lazy_initialization(self, mock_get):
+        """지연 모드에서는 첫 사용 시에만 연결을 검증하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm') as mock_init:
+            mock_init.return_value.invoke.return_value = "응답"
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434',
+                lazy=True
+            )
+            
+            mock_get.assert_not_called()
+            mock_init.assert_not_called()
+            
+            assert provider.invoke("test prompt") == "응답"
+            assert provider.invoke("test prompt") == "응답"
+            
+            assert mock_get.call_count == 1
+            assert mock_init.call_count == 1
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_health_cache_skips_probe(self, mock_get, tmp_path):
+        """health check 결과가 캐시되어 있으면 네트워크 검사를 생략하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        state_path = str(tmp_path / "health.json")
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            for _ in range(3):
+                LLMProviderManager(
+                    provider='ollama',
+                    model='test-model',
+                    base_url='http://localhost:11434',
+                    health_cache=HealthCache(ttl=60, state_path=state_path)
+                )
+        
+        assert mock_get.call_count == 1
+    
+    @patch('src.llm_provider.time.sleep')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_failover_to_other_backend(self, mock_get, mock_sleep):
+        """실패한 백엔드 대신 다른 백엔드로 재시도하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url=['http://gpu-1:11434', 'http://gpu-2:11434'],
+                routing={'max_failures': 1, 'probe_interval': 60.0}
+            )
+        
+        first, second = provider.backend_pool.backends
+        first.llm = Mock()
+        first.llm.invoke.side_effect = Exception("connection refused")
+        second.llm = Mock()
+        second.llm.invoke.return_value = "두 번째 응답"
+        
+        assert provider.invoke("test prompt") == "두 번째 응답"
+        assert first.llm.invoke.call_count == 1
+        assert first.healthy is False
+        
+        # 제외된 백엔드로는 더 이상 보내지 않음
+        assert provider.invoke("다른 프롬프트") == "두 번째 응답"
+        assert first.llm.invoke.call_count == 1
+        assert provider.get_provider_info()['endpoints'] == [
+            'http://gpu-1:11434', 'http://gpu-2:11434'
+        ]
+        provider.close()
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_ainvoke_coalesces_identical_prompts(self, mock_get):
+        """동시에 들어온 동일 프롬프트가 한 번만 호출되는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        
+        async def slow_ainvoke(prompt, config=None):
+            await asyncio.sleep(0.01)
+            return f"응답: {prompt}"
+        
+        mock_llm = Mock()
+        mock_llm.ainvoke = AsyncMock(side_effect=slow_ainvoke)
+        provider.llm = mock_llm
+        meters = [CallMeter() for _ in range(3)]
+        
+        async def run():
+            return await asyncio.gather(
+                provider.ainvoke("같은 질의", meter=meters[0]),
+                provider.ainvoke("  같은 질의 ", meter=meters[1]),
+                provider.ainvoke("다른 질의", meter=meters[2])
+            )
+        
+        results = asyncio.run(run())
+        
+        assert results == ["응답: 같은 질의", "응답: 같은 질의", "응답: 다른 질의"]
+        assert mock_llm.ainvoke.call_count == 2
+        assert [m.coalesced for m in meters] == [False, True, False]
+        
+        stats = provider.get_coalescing_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_concurrency_limiter_per_backend(self, mock_get):
+        """백엔드별 동시 요청 제한 상태가 노출되는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434',
+                concurrency={'initial_limit': 2, 'max_limit': 4}
+            )
+        
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = "응답"
+        provider.llm = mock_llm
+        provider.invoke("test prompt")
+        
+        stats = provider.get_concurrency_stats()['http://localhost:11434']
+        assert stats['limit'] == 2
+        assert stats['inflight'] == 0
+        assert stats['queued'] == 0
+        assert stats['baseline_latency'] is not None
+    
+    @patch('src.llm_provider.time.sleep')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_invoke_batch(self, mock_get, mock_sleep):
+        """일괄 호출이 입력 순서를 유지하고 항목별 오류를 반환하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        
+        def fake_invoke(prompt, config=None):
+            if prompt == "실패":
+                raise Exception("생성 오류")
+            return f"응답: {prompt}"
+        
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = fake_invoke
+        provider.llm = mock_llm
+        
+        results = provider.invoke_batch(["하나", "실패", "셋"], max_concurrency=2)
+        
+        assert results[0] == "응답: 하나"
+        assert isinstance(results[1], LLMConnectionError)
+        assert results[2] == "응답: 셋"
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_ainvoke_batch(self, mock_get):
+        """비동기 일괄 호출 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        
+        async def fake_ainvoke(prompt, config=None):
+            return f"응답: {prompt}"
+        
+        mock_llm = Mock()
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+        provider.llm = mock_llm
+        
+        results = asyncio.run(provider.ainvoke_batch(["하나", "둘", "셋"]))
+        
+        assert results == ["응답: 하나", "응답: 둘", "응답: 셋"]
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_backend_usage_recorded(self, mock_get):
+        """백엔드가 보고한 시간과 토큰 수가 meter와 세션 집계에 기록되는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        class OllamaLikeLLM(LLM):
+            """Ollama 형식의 generation_info를 반환하는 테스트용 LLM"""
+            
+            @property
+            def _llm_type(self) -> str:
+                return "ollama-like"
+            
+            def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+                return "응답"
+            
+            def _generate(self, prompts, stop=None, run_manager=None, **kwargs):
+                info = {
+                    'load_duration': 2_000_000_000,
+                    'prompt_eval_count': 20,
+                    'prompt_eval_duration': 500_000_000,
+                    'eval_count': 50,
+                    'eval_duration': 1_000_000_000,
+                }
+                return LLMResult(generations=[[Generation(text="응답", generation_info=info)]])
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        provider.llm = OllamaLikeLLM()
+        
+        meter = CallMeter()
+        assert provider.invoke("test prompt", meter=meter) == "응답"
+        
+        usage = meter.as_dict()['usage']
+        assert usage['load_duration'] == pytest.approx(2.0)
+        assert usage['prompt_eval_count'] == 20
+        assert usage['eval_count'] == 50
+        
+        provider.invoke("다른 프롬프트")
+        summary = provider.get_usage_summary()
+        assert summary['calls'] == 2
+        assert summary['eval_count'] == 100
+        assert summary['decode_tps'] == pytest.approx(50.0)
+        assert summary['prefill_tps'] == pytest.approx(40.0)
+
+    
+    @patch('src.http_pool.httpx.Client.post')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_warmup_sends_empty_generate(self, mock_get, mock_post):
+        """warmup이 keep_alive를 포함한 빈 생성 요청을 보내는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        mock_post.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434',
+                keep_alive='30m'
+            )
+        
+        results = provider.warmup()
+        
+        assert results == {'http://localhost:11434 test-model': True}
+        args, kwargs = mock_post.call_args
+        assert args[0] == 'http://localhost:11434/api/generate'
+        assert kwargs['json'] == {
+            'model': 'test-model', 'prompt': '', 'stream': False, 'keep_alive': '30m'
+        }
+    
+    @patch('src.http_pool.httpx.Client.post')
+    @patch('src.http_pool.httpx.Client.get')
+    def test_keep_warm_thread(self, mock_get, mock_post):
+        """keep-warm 스레드가 주기적으로 모델 로드 요청을 보내는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        mock_post.return_value = mock_response
+        
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url='http://localhost:11434'
+            )
+        
+        provider.start_keep_warm(0.01)
+        deadline = time.time() + 2
+        while mock_post.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        provider.close()
+        
+        assert mock_post.call_count >= 2
+        assert provider._keep_warm_thread is None
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_keep_alive_passed_to_llm(self, mock_get):
+        """keep_alive가 LLM 객체에 전달되는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        provider = LLMProviderManager(
+            provider='ollama',
+            model='test-model',
+            base_url='http://localhost:11434',
+            keep_alive=-1
+        )
+        
+        assert provider.llm.keep_alive == -1
+
+    
+    def _hedging_provider(self):
+        """지연 시간 표본이 채워진 2-백엔드 헤지 provider 생성"""
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama',
+                model='test-model',
+                base_url=['http://gpu-1:11434', 'http://gpu-2:11434'],
+                lazy=True,
+                hedging={'enabled': True, 'min_samples': 1, 'min_delay': 0.0}
+            )
+        provider.hedge_policy.record(0.02, provider._latency_key())
+        return provider
+    
+    def test_ainvoke_hedged_request(self):
+        """느린 백엔드 대신 헤지 요청의 응답을 사용하고 느린 요청을 취소하는지 테스트"""
+        provider = self._hedging_provider()
+        slow, fast = provider.backend_pool.backends
+        cancelled = []
+        
+        async def slow_ainvoke(prompt, config=None):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "느린 응답"
+        
+        async def fast_ainvoke(prompt, config=None):
+            return "빠른 응답"
+        
+        slow.llm = Mock()
+        slow.llm.ainvoke = AsyncMock(side_effect=slow_ainvoke)
+        fast.llm = Mock()
+        fast.llm.ainvoke = AsyncMock(side_effect=fast_ainvoke)
+        # 첫 요청이 느린 백엔드로 가도록 지연 시간 설정
+        fast.ewma_latency = 1.0
+        slow.ewma_latency = 0.1
+        
+        result = asyncio.run(provider.ainvoke("test prompt"))
+        
+        assert result == "빠른 응답"
+        assert cancelled == [True]
+        assert provider.get_hedging_stats()['hedge_wins'] == 1
+        assert slow.inflight == 0 and fast.inflight == 0
+        assert slow.limiter.get_stats()['inflight'] == 0
+    
+    def test_invoke_hedged_request(self):
+        """동기 호출 헤지 요청 테스트"""
+        provider = self._hedging_provider()
+        slow, fast = provider.backend_pool.backends
+        release = threading.Event()
+        
+        def slow_invoke(prompt, config=None):
+            release.wait(timeout=5)
+            return "느린 응답"
+        
+        slow.llm = Mock()
+        slow.llm.invoke.side_effect = slow_invoke
+        fast.llm = Mock()
+        fast.llm.invoke.return_value = "빠른 응답"
+        fast.ewma_latency = 1.0
+        slow.ewma_latency = 0.1
+        
+        try:
+            assert provider.invoke("test prompt") == "빠른 응답"
+            assert provider.get_hedging_stats()['hedged'] == 1
+        finally:
+            release.set()
+            provider.close()
+    
+    def test_hedge_timer_starts_when_primary_runs(self):
+        """헤지 실행기 대기열에서 기다린 시간으로 헤지 요청을 보내지 않는지 테스트"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        provider = self._hedging_provider()
+        for backend in provider.backend_pool.backends:
+            backend.llm = Mock()
+            backend.llm.invoke.return_value = "응답"
+        provider._hedge_executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        provider._hedge_executor.submit(release.wait, 5)
+        
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        try:
+            assert provider.invoke("test prompt") == "응답"
+            assert provider.get_hedging_stats()['hedged'] == 0
+        finally:
+            release.set()
+            timer.cancel()
+            provider.close()
+    
+    def test_hedge_excludes_primary_waiting_on_limiter(self):
+        """첫 요청이 동시 요청 한도를 기다리는 중이면 헤지가 다른 백엔드로 가는지 테스트"""
+        from src.concurrency_limiter import AdaptiveLimiter
+        
+        provider = self._hedging_provider()
+        slow, fast = provider.backend_pool.backends
+        slow.limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        slow.limiter.acquire()
+        slow.llm = Mock()
+        slow.llm.ainvoke = AsyncMock(return_value="느린 응답")
+        fast.llm = Mock()
+        fast.llm.ainvoke = AsyncMock(return_value="빠른 응답")
+        fast.ewma_latency = 1.0
+        slow.ewma_latency = 0.1
+        
+        result = asyncio.run(asyncio.wait_for(provider.ainvoke("test prompt"), timeout=5))
+        
+        assert result == "빠른 응답"
+        slow.llm.ainvoke.assert_not_called()
+        assert slow.inflight == 0
+        assert slow.limiter.get_stats()['queued'] == 0
+    
+    def test_hedge_delay_per_request_kind(self):
+        """긴 답변의 지연 시간이 짧은 요청의 헤지 대기 시간에 섞이지 않는지 테스트"""
+        provider = self._hedging_provider()
+        short = provider._latency_key({'max_tokens': 256})
+        for _ in range(5):
+            provider.hedge_policy.record(20.0, provider._latency_key())
+            provider.hedge_policy.record(0.5, short)
+        
+        assert provider._hedge_delay(short) == 0.5
+        assert provider._hedge_delay(provider._latency_key()) == 20.0
+
+
+class TestUsageLedger:
+    """UsageLedger 테스트 클래스"""
+    
+    def test_openai_usage_and_replayed_calls(self):
+        """OpenAI 형식 사용량과 캐시 응답 집계 테스트"""
+        from src.llm_provider import _extract_usage
+        
+        result = LLMResult(
+            generations=[[Generation(text="응답")]],
+            llm_output={'token_usage': {'prompt_tokens': 12, 'completion_tokens': 30}}
+        )
+        meter = CallMeter()
+        meter.record_usage(_extract_usage(result))
+        
+        cached_meter = CallMeter()
+        cached_meter.cached = True
+        
+        ledger = UsageLedger()
+        ledger.record(meter)
+        ledger.record(cached_meter)
+        summary = ledger.summary()
+        
+        assert summary['calls'] == 2
+        assert summary['replayed_calls'] == 1
+        assert summary['prompt_eval_count'] == 12
+        assert summary['eval_count'] == 30
+        assert summary['decode_tps'] is None
+
+
+class TestDirectHTTPLLM:
+    """DirectHTTPLLM 테스트 클래스"""
+    
+    def _pool(self, handler):
+        """Mock transport를 사용하는 연결 풀 생성"""
+        pool = HTTPConnectionPool()
+        pool._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return pool
+    
+    def test_ollama_invoke(self):
+        """Ollama /api/generate 직접 호출 및 사용량 전달 테스트"""
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={
+                'response': '안녕하세요',
+                'done': True,
+                'eval_count': 5,
+                'eval_duration': 250_000_000,
+            })
+        
+        llm = DirectHTTPLLM('ollama', 'test-model', 'http://localhost:11434',
+                            self._pool(handler), temperature=0.2, max_tokens=100,
+                            keep_alive='10m')
+        meter = CallMeter()
+        from src.llm_provider import _UsageHandler
+        
+        assert llm.invoke("질의", config={'callbacks': [_UsageHandler(meter)]}) == '안녕하세요'
+        
+        body = json.loads(requests[0].content)
+        assert str(requests[0].url) == 'http://localhost:11434/api/generate'
+        assert body['options'] == {'temperature': 0.2, 'num_predict': 100}
+        assert body['stream'] is False
+        assert body['keep_alive'] == '10m'
+        assert meter.usage['eval_count'] == 5
+        assert meter.usage['eval_duration'] == pytest.approx(0.25)
+    
+    def test_ollama_stream(self):
+        """Ollama NDJSON 스트리밍 테스트"""
+        lines = [
+            {'response': '안녕', 'done': False},
+            {'response': '하세요', 'done': False},
+            {'response': '', 'done': True, 'eval_count': 2},
+        ]
+        
+        def handler(request):
+            content = '\n'.join(json.dumps(line) for line in lines)
+            return httpx.Response(200, content=content.encode('utf-8'))
+        
+        llm = DirectHTTPLLM('ollama', 'test-model', 'http://localhost:11434',
+                            self._pool(handler))
+        
+        assert list(llm.stream("질의")) == ['안녕', '하세요']
+    
+    def test_openai_compatible_invoke(self):
+        """OpenAI 호환 /v1/completions 직접 호출 테스트"""
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={
+                'choices': [{'text': '응답'}],
+                'usage': {'prompt_tokens': 3, 'completion_tokens': 1},
+            })
+        
+        llm = DirectHTTPLLM('lmstudio', 'test-model', 'http://localhost:1234',
+                            self._pool(handler))
+        
+        assert llm.invoke("질의") == '응답'
+        body = json.loads(requests[0].content)
+        assert str(requests[0].url) == 'http://localhost:1234/v1/completions'
+        assert body['max_tokens'] == 2000
+        assert body['top_p'] == 1
+    
+    def test_generation_options(self):
+        """호출별 생성 옵션이 요청 본문에 반영되는지 테스트"""
+        requests = []
+        
+        def handler(request):
+            requests.append(json.loads(request.content))
+            if request.url.path == '/api/generate':
+                return httpx.Response(200, json={'response': '응답', 'done': True})
+            return httpx.Response(200, json={'choices': [{'text': '응답'}]})
+        
+        ollama = DirectHTTPLLM('ollama', 'test-model', 'http://localhost:11434',
+                               self._pool(handler), temperature=0.2)
+        ollama.invoke("질의", options={'num_predict': 32, 'stop': ['\n\n']})
+        assert requests[0]['options'] == {
+            'temperature': 0.2, 'num_predict': 32, 'stop': ['\n\n']
+        }
+        
+        lmstudio = DirectHTTPLLM('lmstudio', 'test-model', 'http://localhost:1234',
+                                 self._pool(handler))
+        lmstudio.invoke("질의", max_tokens=16, stop=['\n'])
+        assert requests[1]['max_tokens'] == 16
+        assert requests[1]['stop'] == ['\n']
+        
+        schema = {'type': 'object'}
+        ollama.invoke("질의", format=schema)
+        assert requests[2]['format'] == schema
+        lmstudio.invoke("질의", extra_body={'response_format': {'type': 'json_object'}})
+        assert requests[3]['response_format'] == {'type': 'json_object'}
+    
+    def test_ollama_context_roundtrip(self):
+        """생성 컨텍스트를 측정 객체에 기록하고 다음 요청에 전달하는지 테스트"""
+        requests = []
+        
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                'response': '응답', 'done': True, 'context': [7, 8, 9]
+            })
+        
+        from src.llm_provider import _UsageHandler
+        llm = DirectHTTPLLM('ollama', 'test-model', 'http://localhost:11434',
+                            self._pool(handler))
+        meter = CallMeter()
+        
+        llm.invoke("질의", config={'callbacks': [_UsageHandler(meter)]})
+        assert meter.context == [7, 8, 9]
+        assert 'context' not in requests[0]
+        
+        llm.invoke("다음 지시", context=meter.context)
+        assert requests[1]['context'] == [7, 8, 9]
+    
+    def test_error_status(self):
+        """오류 응답 시 예외 발생 테스트"""
+        def handler(request):
+            return httpx.Response(404, json={'error': 'model not found'})
+        
+        llm = DirectHTTPLLM('ollama', 'missing', 'http://localhost:11434',
+                            self._pool(handler))
+        
+        with pytest.raises(ValueError, match="model not found"):
+            llm.invoke("질의")
+    
+    @patch('src.http_pool.httpx.Client.get')
+    def test_selected_by_client_option(self, mock_get):
+        """client='direct'이면 DirectHTTPLLM을 사용하는지 테스트"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        provider = LLMProviderManager(
+            provider='ollama',
+            model='test-model',
+            base_url='http://localhost:11434',
+            client='direct'
+        )
+        
+        assert isinstance(provider.llm, DirectHTTPLLM)
+        assert provider.get_provider_info()['client'] == 'direct'
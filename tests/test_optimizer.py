@@ -1,14 +1,19 @@
 """
 PromptOptimizer 테스트
 """
+import asyncio
+import json
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, AsyncMock
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.prompt_optimizer import PromptOptimizer, OptimizationError, OptimizationStep
+from src.prompt_optimizer import (
+    PromptOptimizer, OptimizationError, OptimizationStep, ANALYSIS_SCHEMA
+)
+from src.run_context import RunContext
 
 
 class TestPromptOptimizer:
@@ -166,3 +171,395 @@ class TestPromptOptimizer:
         
         with pytest.raises(OptimizationError, match="프롬프트 최적화 실패"):
             self.optimizer.optimize_prompt(query, analysis)
+    
+    def test_aanalyze_query_success(self):
+        """비동기 질의 분석 성공 테스트"""
+        self.mock_llm_provider.ainvoke = AsyncMock(return_value="""
+        명확성: 7/10
+        완전성: 6/10
+        컨텍스트: 추가 정보 필요
+        """)
+        
+        analysis = asyncio.run(self.optimizer.aanalyze_query("파이썬 웹 스크래핑"))
+        
+        assert analysis['명확성'] == '7/10'
+        assert analysis['컨텍스트'] == '추가 정보 필요'
+        self.mock_llm_provider.invoke.assert_not_called()
+        assert len(self.optimizer.get_optimization_steps()) == 1
+    
+    def test_aoptimize_prompt_success(self):
+        """비동기 프롬프트 최적화 성공 테스트"""
+        self.mock_llm_provider.ainvoke = AsyncMock(return_value="  개선된 질의  ")
+        
+        optimized = asyncio.run(
+            self.optimizer.aoptimize_prompt("파이썬 웹 스크래핑", {})
+        )
+        
+        assert optimized == "개선된 질의"
+        steps = self.optimizer.get_optimization_steps()
+        assert steps[0].name == "프롬프트 최적화"
+    
+    def test_aanalyze_query_empty(self):
+        """비동기 빈 질의 분석 테스트"""
+        with pytest.raises(OptimizationError, match="빈 질의"):
+            asyncio.run(self.optimizer.aanalyze_query(""))
+    
+    def test_memoized_analysis_and_optimization(self):
+        """같은 질의를 다시 제출하면 LLM을 호출하지 않는지 테스트"""
+        self.mock_llm_provider.invoke.side_effect = [
+            "명확성: 7/10\n완전성: 6/10\n컨텍스트: 충분",
+            "개선된 질의"
+        ]
+        
+        self.optimizer.analyze_query("파이썬  웹 스크래핑")
+        self.optimizer.optimize_prompt("파이썬  웹 스크래핑", {})
+        
+        # 공백만 다른 질의는 정규화 후 같은 키로 조회됨
+        analysis = self.optimizer.analyze_query("파이썬 웹 스크래핑")
+        optimized = self.optimizer.optimize_prompt("파이썬 웹 스크래핑", analysis)
+        
+        assert analysis['명확성'] == '7/10'
+        assert optimized == "개선된 질의"
+        assert self.mock_llm_provider.invoke.call_count == 2
+        assert len(self.optimizer.get_optimization_steps()) == 4
+        
+        stats = self.optimizer.get_memo_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+    
+    def test_memo_returns_copy(self):
+        """메모된 분석 결과를 수정해도 메모가 오염되지 않는지 테스트"""
+        self.mock_llm_provider.invoke.return_value = "명확성: 7/10"
+        
+        first = self.optimizer.analyze_query("테스트 질의입니다.")
+        first['명확성'] = '변경됨'
+        
+        second = self.optimizer.analyze_query("테스트 질의입니다.")
+        assert second['명확성'] == '7/10'
+    
+    def test_memo_lru_eviction(self):
+        """메모 최대 크기 초과 시 LRU 제거 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, memo_size=1)
+        self.mock_llm_provider.invoke.return_value = "개선된 질의"
+        
+        optimizer.optimize_prompt("첫 번째 질의", {})
+        optimizer.optimize_prompt("두 번째 질의", {})
+        optimizer.optimize_prompt("첫 번째 질의", {})
+        
+        assert self.mock_llm_provider.invoke.call_count == 3
+        assert optimizer.get_memo_stats()['entries'] == 1
+    
+    def test_memo_disabled(self):
+        """memo_size=0이면 메모를 사용하지 않는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, memo_size=0)
+        self.mock_llm_provider.invoke.return_value = "개선된 질의"
+        
+        optimizer.optimize_prompt("질의", {})
+        optimizer.optimize_prompt("질의", {})
+        
+        assert self.mock_llm_provider.invoke.call_count == 2
+    
+    def test_optimize_many_preserves_order_and_errors(self):
+        """일괄 최적화가 입력 순서를 유지하고 항목별 오류를 반환하는지 테스트"""
+        def fake_invoke(prompt, meter=None):
+            if "실패 질의" in prompt:
+                raise Exception("LLM 오류")
+            return "명확성: 7/10" if "분석" in prompt else "개선된 질의"
+        
+        self.mock_llm_provider.invoke.side_effect = fake_invoke
+        queries = ["첫 번째 질의", "실패 질의", "세 번째 질의"]
+        
+        results = self.optimizer.optimize_many(queries, max_concurrency=2)
+        
+        assert [r['query'] for r in results] == queries
+        assert results[0]['optimized_prompt'] == "개선된 질의"
+        assert results[0]['error'] is None
+        assert results[1]['optimized_prompt'] is None
+        assert "LLM 오류" in results[1]['error']
+        assert results[2]['analysis']['명확성'] == '7/10'
+    
+    def test_aoptimize_many(self):
+        """비동기 일괄 최적화 테스트"""
+        self.mock_llm_provider.ainvoke = AsyncMock(return_value="개선된 질의")
+        
+        results = asyncio.run(self.optimizer.aoptimize_many(["질의 하나", "질의 둘"]))
+        
+        assert [r['query'] for r in results] == ["질의 하나", "질의 둘"]
+        assert all(r['error'] is None for r in results)
+        assert all(r['optimized_prompt'] == "개선된 질의" for r in results)
+    
+    def test_steps_record_call_metrics(self):
+        """최적화 단계에 호출 측정값이 기록되는지 테스트"""
+        def fake_invoke(prompt, meter=None):
+            meter.start()
+            meter.record_usage({'eval_count': 42})
+            meter.finish()
+            return "개선된 질의"
+        
+        self.mock_llm_provider.invoke.side_effect = fake_invoke
+        
+        self.optimizer.optimize_prompt("테스트 질의", {})
+        
+        step = self.optimizer.get_optimization_steps()[0]
+        assert step.metrics['usage'] == {'eval_count': 42}
+    
+    def test_stage_providers(self):
+        """단계별 제공자로 분석/최적화가 호출되는지 테스트"""
+        analyze_provider = Mock()
+        analyze_provider.invoke.return_value = "명확성: 7/10"
+        optimizer = PromptOptimizer(
+            self.mock_llm_provider,
+            stage_providers={'analyze': analyze_provider}
+        )
+        self.mock_llm_provider.invoke.return_value = "개선된 질의"
+        
+        analysis = optimizer.analyze_query("테스트 질의")
+        optimized = optimizer.optimize_prompt("테스트 질의", analysis)
+        
+        assert optimized == "개선된 질의"
+        assert analyze_provider.invoke.call_count == 1
+        assert self.mock_llm_provider.invoke.call_count == 1
+        assert "분석" in analyze_provider.invoke.call_args[0][0]
+    
+    def test_default_optimize_options_keep_text_after_preamble(self):
+        """머리말로 시작하는 응답에서 기본 생성 옵션이 개선된 질의를 자르지 않는지 테스트"""
+        from src.config_manager import ConfigManager
+        
+        generation = ConfigManager().get_optimization_config().generation
+        optimizer = PromptOptimizer(self.mock_llm_provider, generation=generation)
+        output = "Here is the improved query:\n\nHow do I scrape a web page with Python requests?"
+        
+        def fake_invoke(prompt, meter=None, options=None):
+            # 서버처럼 중단 시퀀스가 처음 나오는 곳에서 생성 중단
+            for stop in (options or {}).get('stop', []):
+                if stop in output:
+                    return output[:output.index(stop)]
+            return output
+        
+        self.mock_llm_provider.invoke.side_effect = fake_invoke
+        
+        optimized = optimizer.optimize_prompt("web scraping in python", {})
+        
+        assert "How do I scrape a web page with Python requests?" in optimized
+    
+    def test_generation_options(self):
+        """단계별 생성 옵션이 제공자로 전달되는지 테스트"""
+        optimizer = PromptOptimizer(
+            self.mock_llm_provider,
+            generation={'analyze': {'max_tokens': 128, 'stop': ['\n4.']}}
+        )
+        self.mock_llm_provider.invoke.return_value = "명확성: 7/10"
+        
+        optimizer.analyze_query("테스트 질의")
+        assert self.mock_llm_provider.invoke.call_args[1]['options'] == {
+            'max_tokens': 128, 'stop': ['\n4.']
+        }
+        
+        # 옵션이 없는 단계는 제공자 기본값 사용
+        optimizer.optimize_prompt("테스트 질의", {})
+        assert 'options' not in self.mock_llm_provider.invoke.call_args[1]
+    
+    def test_prefix_reuse_shared_prefix(self):
+        """접두사 재사용 시 두 프롬프트가 질의로 시작하는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, prefix_reuse=True)
+        self.mock_llm_provider.invoke.return_value = "명확성: 7/10"
+        
+        optimizer.analyze_query("테스트 질의")
+        optimizer.optimize_prompt("테스트 질의", {})
+        
+        prompts = [c[0][0] for c in self.mock_llm_provider.invoke.call_args_list]
+        assert all(p.startswith("질의: 테스트 질의\n\n") for p in prompts)
+        # Mock 제공자는 context를 지원하지 않으므로 전체 프롬프트 사용
+        assert 'options' not in self.mock_llm_provider.invoke.call_args[1]
+    
+    def test_prefix_reuse_context(self):
+        """분석 응답의 생성 컨텍스트에 이어서 최적화하는지 테스트"""
+        provider = Mock()
+        provider.supports_context = True
+        
+        def fake_invoke(prompt, meter=None, options=None):
+            meter.start()
+            if "분석" in prompt:
+                meter.record_context([1, 2, 3])
+                return "명확성: 7/10"
+            return "개선된 질의"
+        
+        provider.invoke.side_effect = fake_invoke
+        optimizer = PromptOptimizer(provider, prefix_reuse=True)
+        
+        optimizer.analyze_query("테스트 질의")
+        assert optimizer.optimize_prompt("테스트 질의", {}) == "개선된 질의"
+        
+        prompt, kwargs = provider.invoke.call_args[0][0], provider.invoke.call_args[1]
+        assert kwargs['options'] == {'context': [1, 2, 3]}
+        assert "테스트 질의" not in prompt
+        
+        # 컨텍스트는 한 번만 사용
+        optimizer.clear_memo()
+        optimizer.optimize_prompt("테스트 질의", {})
+        assert 'options' not in provider.invoke.call_args[1]
+    
+    def test_steps_bounded(self):
+        """단계 기록이 history_size개까지만 보관되는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, memo_size=0, history_size=2)
+        self.mock_llm_provider.invoke.return_value = "명확성: 7/10"
+        
+        for query in ["질의 하나", "질의 둘", "질의 셋"]:
+            optimizer.analyze_query(query)
+        
+        steps = optimizer.get_optimization_steps()
+        assert [step.input_data for step in steps] == ["질의 둘", "질의 셋"]
+        assert isinstance(steps[0].timestamp, int)
+        assert steps[0].as_dict()['time']
+    
+    def test_steps_keep_preview_only(self, tmp_path):
+        """단계 기록은 미리보기와 길이만 보관하고 전체 텍스트는 파일에만 쓰는지 테스트"""
+        path = tmp_path / "steps.jsonl"
+        optimizer = PromptOptimizer(self.mock_llm_provider, memo_size=0,
+                                    step_spill_path=str(path))
+        query = "긴 질의 " * 100
+        self.mock_llm_provider.invoke.return_value = "개선된 질의 " * 100
+        
+        optimized = optimizer.optimize_prompt(query, {})
+        
+        step = optimizer.get_optimization_steps()[0]
+        assert len(step.input_data) <= 201 and step.input_data.endswith("…")
+        assert step.input_length == len(query)
+        assert step.output_length == len(optimized)
+        
+        optimizer.step_archive.flush()
+        records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert len(records) == 1
+        assert records[0]['input_data'] == query
+        assert records[0]['output_data'] == optimized
+        assert len(optimizer.step_archive) == 0
+    
+    def test_run_context_records(self):
+        """실행 컨텍스트를 넘기면 단계 기록과 생성 컨텍스트를 그 실행에 보관하는지 테스트"""
+        provider = Mock()
+        provider.supports_context = True
+        calls = []
+        
+        def fake_invoke(prompt, meter=None, options=None):
+            meter.start()
+            calls.append(prompt)
+            if "분석" in prompt:
+                meter.record_context([len(calls)])
+                return "명확성: 7/10"
+            return "개선된 질의"
+        
+        provider.invoke.side_effect = fake_invoke
+        optimizer = PromptOptimizer(provider, memo_size=0, prefix_reuse=True)
+        first, second = RunContext("테스트 질의"), RunContext("테스트 질의")
+        
+        # 같은 질의를 번갈아 실행해도 각자의 분석 컨텍스트를 사용
+        optimizer.analyze_query("테스트 질의", run=first)
+        optimizer.analyze_query("테스트 질의", run=second)
+        optimizer.optimize_prompt("테스트 질의", {}, run=first)
+        assert provider.invoke.call_args[1]['options'] == {'context': [1]}
+        optimizer.optimize_prompt("테스트 질의", {}, run=second)
+        assert provider.invoke.call_args[1]['options'] == {'context': [2]}
+        
+        assert [step.name for step in first.steps] == ["질의 분석", "프롬프트 최적화"]
+        assert [step.name for step in second.steps] == ["질의 분석", "프롬프트 최적화"]
+        assert optimizer.get_optimization_steps() == []
+    
+    def test_analyze_and_optimize(self):
+        """한 번의 호출로 분석과 최적화 결과를 파싱하는지 테스트"""
+        self.mock_llm_provider.invoke.return_value = """**명확성**: 6/10 - 범위가 넓음
+완전성: 5/10 - 대상 사이트 정보 없음
+컨텍스트: 사용할 라이브러리
+개선된 질의: requests와 BeautifulSoup으로
+뉴스 사이트 제목을 수집하는 파이썬 코드를 작성해 주세요."""
+        
+        analysis, optimized = self.optimizer.analyze_and_optimize("파이썬 웹 스크래핑")
+        
+        assert self.mock_llm_provider.invoke.call_count == 1
+        assert analysis['명확성'] == '6/10 - 범위가 넓음'
+        assert analysis['컨텍스트'] == '사용할 라이브러리'
+        assert optimized.startswith("requests와 BeautifulSoup으로\n뉴스 사이트")
+        assert self.optimizer.get_optimization_steps()[0].name == "질의 분석 및 최적화"
+        
+        # 단계별 메모에 저장되어 다시 호출하지 않음
+        assert self.optimizer.analyze_and_optimize("파이썬 웹 스크래핑")[1] == optimized
+        assert self.mock_llm_provider.invoke.call_count == 1
+    
+    def test_analyze_and_optimize_missing_query(self):
+        """개선된 질의가 없는 통합 응답은 오류로 처리하는지 테스트"""
+        self.mock_llm_provider.invoke.return_value = "Clarity: 7/10\nCompleteness: 6/10"
+        
+        with pytest.raises(OptimizationError, match="개선된 질의"):
+            self.optimizer.analyze_and_optimize("web scraping in python")
+    
+    def test_structured_analysis(self):
+        """JSON 분석 형식이 스키마를 전달하고 정수 점수로 파싱하는지 테스트"""
+        optimizer = PromptOptimizer(
+            self.mock_llm_provider,
+            generation={'analyze': {'max_tokens': 64, 'stop': ['\n4.']}},
+            analysis_format='json'
+        )
+        self.mock_llm_provider.invoke.return_value = (
+            '{"clarity": 8, "completeness": 4, "context": "target site"}'
+        )
+        
+        analysis = optimizer.analyze_query("web scraping in python")
+        
+        assert analysis == {'명확성': 8, '완전성': 4, '컨텍스트': 'target site'}
+        prompt = self.mock_llm_provider.invoke.call_args[0][0]
+        assert prompt.startswith("Query: web scraping in python\n\n")
+        assert "JSON" in prompt
+        # 텍스트용 stop 시퀀스 대신 스키마 전달
+        assert self.mock_llm_provider.invoke.call_args[1]['options'] == {
+            'max_tokens': 64, 'format': ANALYSIS_SCHEMA
+        }
+    
+    def test_structured_analysis_strict(self):
+        """스키마와 맞지 않는 JSON 분석 응답은 오류로 처리하는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, analysis_format='json')
+        
+        for response in ['명확성: 7/10',
+                         '{"clarity": 11, "completeness": 4, "context": ""}',
+                         '{"clarity": "7", "completeness": 4, "context": ""}',
+                         '{"clarity": 7, "completeness": true, "context": ""}',
+                         '{"clarity": 7, "completeness": 4}']:
+            with pytest.raises(OptimizationError):
+                optimizer._parse_structured_analysis(response)
+        
+        # 앞뒤 텍스트는 무시
+        assert optimizer._parse_structured_analysis(
+            'Here: {"clarity": 7, "completeness": 4, "context": " none "}.'
+        ) == {'명확성': 7, '완전성': 4, '컨텍스트': 'none'}
+        
+        with pytest.raises(ValueError):
+            PromptOptimizer(self.mock_llm_provider, analysis_format='yaml')
+    
+    def test_fused_memo_partial_entry_counts_miss(self):
+        """분석 결과만 메모된 경우 fused 조회가 누락으로 기록되는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, mode='fused')
+        optimizer._memo_set('analyze', "partial query", {'명확성': '5/10'})
+        self.mock_llm_provider.invoke.return_value = "Clarity: 7/10\nImproved query: better"
+        
+        analysis, optimized = optimizer.analyze_and_optimize("partial query")
+        
+        assert optimized == "better"
+        assert analysis['명확성'] == '7/10'
+        assert self.mock_llm_provider.invoke.call_count == 1
+        stats = optimizer.get_memo_stats()
+        assert stats['hits'] == 0
+        assert stats['misses'] == 1
+        
+        # 두 결과가 모두 메모된 뒤에는 한 번의 적중으로 기록
+        optimizer.analyze_and_optimize("partial query")
+        assert self.mock_llm_provider.invoke.call_count == 1
+        assert optimizer.get_memo_stats()['hits'] == 1
+    
+    def test_optimize_many_fused(self):
+        """fused 모드 일괄 최적화가 질의당 한 번 호출하는지 테스트"""
+        optimizer = PromptOptimizer(self.mock_llm_provider, mode='fused')
+        self.mock_llm_provider.invoke.return_value = "Clarity: 7/10\nImproved query: better"
+        
+        results = optimizer.optimize_many(["first query", "second query"])
+        
+        assert [r['optimized_prompt'] for r in results] == ["better", "better"]
+        assert results[0]['analysis']['명확성'] == '7/10'
+        assert self.mock_llm_provider.invoke.call_count == 2
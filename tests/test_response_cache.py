@@ -0,0 +1,86 @@
+"""
+ResponseCache 테스트
+"""
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """ResponseCache 테스트 클래스"""
+    
+    def test_make_key_depends_on_params(self):
+        """파라미터가 다르면 키가 달라지는지 테스트"""
+        params = {'provider': 'ollama', 'model': 'llama2', 'temperature': 0.7, 'max_tokens': 2000}
+        key1 = ResponseCache.make_key(params, "프롬프트")
+        key2 = ResponseCache.make_key({**params, 'temperature': 0.1}, "프롬프트")
+        key3 = ResponseCache.make_key(params, "다른 프롬프트")
+        
+        assert key1 == ResponseCache.make_key(dict(params), "프롬프트")
+        assert key1 != key2
+        assert key1 != key3
+    
+    def test_get_and_set(self):
+        """저장 후 조회 및 hit/miss 카운터 테스트"""
+        cache = ResponseCache(path=':memory:')
+        
+        assert cache.get("key") is None
+        cache.set("key", "응답")
+        assert cache.get("key") == "응답"
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+    
+    def test_ttl_expiry(self):
+        """TTL 만료 테스트"""
+        cache = ResponseCache(path=':memory:', ttl=10)
+        
+        with patch('src.response_cache.time.time', return_value=1000.0):
+            cache.set("key", "응답")
+        with patch('src.response_cache.time.time', return_value=1020.0):
+            assert cache.get("key") is None
+        
+        assert cache.get_stats()['entries'] == 0
+    
+    def test_lru_eviction(self):
+        """최대 항목 수 초과 시 LRU 제거 테스트"""
+        cache = ResponseCache(path=':memory:', max_entries=2)
+        
+        with patch('src.response_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("a", "A")
+            cache.set("b", "B")
+            cache.get("a")  # a를 최근 사용으로 갱신
+            cache.set("c", "C")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert cache.get_stats()['entries'] == 2
+    
+    def test_bypass(self):
+        """bypass 모드에서는 조회를 건너뛰는지 테스트"""
+        cache = ResponseCache(path=':memory:', bypass=True)
+        
+        cache.set("key", "응답")
+        assert cache.get("key") is None
+        
+        cache.bypass = False
+        assert cache.get("key") == "응답"
+    
+    def test_persists_across_instances(self, tmp_path):
+        """프로세스 재시작 후에도 캐시가 유지되는지 테스트"""
+        path = str(tmp_path / "cache" / "responses.db")
+        
+        cache = ResponseCache(path=path)
+        cache.set("key", "응답")
+        cache.close()
+        
+        reopened = ResponseCache(path=path)
+        assert reopened.get("key") == "응답"
+        assert reopened.get_stats()['entries'] == 1
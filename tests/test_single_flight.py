@@ -0,0 +1,157 @@
+"""
+SingleFlight 테스트
+"""
+import asyncio
+import threading
+import time
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlight 테스트 클래스"""
+    
+    def test_sync_coalescing(self):
+        """동시에 들어온 동일 키 호출이 한 번만 실행되는지 테스트"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+        
+        def slow_call():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "결과"
+        
+        def worker():
+            results.append(flight.do("key", slow_call))
+        
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(timeout=5)
+        
+        waiters = [threading.Thread(target=worker) for _ in range(3)]
+        for t in waiters:
+            t.start()
+        while flight.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        for t in [leader] + waiters:
+            t.join(timeout=5)
+        
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert all(result == "결과" for result, _ in results)
+        
+        stats = flight.get_stats()
+        assert stats['hits'] == 3
+        assert stats['misses'] == 1
+        assert stats['entries'] == 0
+    
+    def test_sync_error_propagates(self):
+        """실행 오류가 대기 호출에도 전달되는지 테스트"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+        
+        def failing_call():
+            started.set()
+            release.wait(timeout=5)
+            raise ValueError("실패")
+        
+        def worker():
+            try:
+                flight.do("key", failing_call)
+            except ValueError as e:
+                errors.append(e)
+        
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(timeout=5)
+        waiter = threading.Thread(target=worker)
+        waiter.start()
+        while flight.coalesced < 1:
+            time.sleep(0.001)
+        release.set()
+        leader.join(timeout=5)
+        waiter.join(timeout=5)
+        
+        assert len(errors) == 2
+        
+        # 완료 후에는 다시 실행됨
+        assert flight.do("key", lambda: "새 결과") == ("새 결과", False)
+    
+    def test_async_coalescing(self):
+        """비동기 동일 키 호출 병합 테스트"""
+        flight = SingleFlight()
+        calls = []
+        
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "결과"
+        
+        async def run():
+            return await asyncio.gather(
+                *[flight.ado("key", slow_call) for _ in range(4)],
+                flight.ado("other", slow_call)
+            )
+        
+        results = asyncio.run(run())
+        
+        assert len(calls) == 2
+        assert [shared for _, shared in results] == [False, True, True, True, False]
+        assert flight.get_stats()['hits'] == 3
+    
+    def test_async_error_propagates(self):
+        """비동기 실행 오류가 대기 호출에도 전달되는지 테스트"""
+        flight = SingleFlight()
+        
+        async def failing_call():
+            await asyncio.sleep(0.01)
+            raise ValueError("실패")
+        
+        async def run():
+            return await asyncio.gather(
+                flight.ado("key", failing_call),
+                flight.ado("key", failing_call),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(run())
+        
+        assert all(isinstance(r, ValueError) for r in results)
+    
+    def test_async_leader_cancelled(self):
+        """실행 측이 취소되면 대기 측이 취소되지 않고 다시 실행하는지 테스트"""
+        flight = SingleFlight()
+        calls = []
+        
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "결과"
+        
+        async def run():
+            leader = asyncio.ensure_future(flight.ado("key", slow_call))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.ado("key", slow_call)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            return leader, results
+        
+        leader, results = asyncio.run(run())
+        
+        assert leader.cancelled()
+        assert len(calls) == 2
+        assert sorted(shared for _, shared in results) == [False, True]
+        assert all(result == "결과" for result, _ in results)
+        assert flight.get_stats()['entries'] == 0
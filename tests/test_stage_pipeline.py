@@ -0,0 +1,143 @@
+"""
+StagePipeline 테스트
+"""
+import asyncio
+import time
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.stage_pipeline import StagePipeline
+
+
+def _sleep_stage(name: str, delay: float, log: list = None):
+    """delay초 후 항목에 단계 이름을 덧붙이는 단계 생성"""
+    async def run(item):
+        if log is not None:
+            log.append((name, item))
+        await asyncio.sleep(delay)
+        return f"{item}>{name}"
+    return name, run
+
+
+class TestStagePipeline:
+    """StagePipeline 테스트 클래스"""
+    
+    def test_stages_overlap(self):
+        """단계가 질의 사이에서 겹쳐 실행되어 가장 느린 단계에 맞춰지는지 테스트"""
+        pipeline = StagePipeline(
+            [_sleep_stage('a', 0.05), _sleep_stage('b', 0.05), _sleep_stage('c', 0.05)],
+            ordered=True
+        )
+        
+        async def collect():
+            return [result async for result in pipeline.astream(range(20))]
+        
+        start = time.perf_counter()
+        results = asyncio.run(collect())
+        elapsed = time.perf_counter() - start
+        
+        # 순차 실행이면 20 * 0.15초, 파이프라인이면 약 (20 + 2) * 0.05초
+        assert elapsed < 1.8
+        assert results == [f"{i}>a>b>c" for i in range(20)]
+        assert pipeline.get_stats()['b']['processed'] == 20
+    
+    def test_slowest_stage_workers(self):
+        """느린 단계에 작업자를 늘리면 처리량이 늘어나는지 테스트"""
+        pipeline = StagePipeline(
+            [_sleep_stage('fast', 0.01), _sleep_stage('slow', 0.1)],
+            workers={'slow': 5}
+        )
+        
+        async def collect():
+            return [result async for result in pipeline.astream(range(20))]
+        
+        start = time.perf_counter()
+        results = asyncio.run(collect())
+        elapsed = time.perf_counter() - start
+        
+        # 작업자 1개면 20 * 0.1초
+        assert elapsed < 1.0
+        assert sorted(results) == sorted(f"{i}>fast>slow" for i in range(20))
+        assert pipeline.get_stats()['slow']['workers'] == 5
+    
+    def test_backpressure(self):
+        """결과를 꺼내지 않으면 입력을 더 읽지 않는지 테스트"""
+        consumed = []
+        
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield i
+        
+        pipeline = StagePipeline([_sleep_stage('a', 0.0), _sleep_stage('b', 0.0)], queue_size=2)
+        
+        async def take_one():
+            results = pipeline.astream(items())
+            first = await results.__anext__()
+            await asyncio.sleep(0.1)
+            await results.aclose()
+            return first
+        
+        assert asyncio.run(take_one()) is not None
+        assert len(consumed) <= pipeline.max_in_flight + 1
+    
+    def test_stage_error_skips_later_stages(self):
+        """단계에서 예외가 발생하면 뒤 단계를 건너뛰고 예외를 결과로 반환하는지 테스트"""
+        log = []
+        
+        async def fail_on_odd(item):
+            if item % 2:
+                raise ValueError(f"실패 {item}")
+            return item
+        
+        pipeline = StagePipeline(
+            [('check', fail_on_odd), _sleep_stage('after', 0.0, log)], ordered=True
+        )
+        
+        async def collect():
+            return [result async for result in pipeline.astream(range(4))]
+        
+        results = asyncio.run(collect())
+        
+        assert results[0] == "0>after"
+        assert isinstance(results[1], ValueError)
+        assert [item for _, item in log] == [0, 2]
+    
+    def test_async_input_and_input_error(self):
+        """비동기 입력을 처리하고 입력 오류는 읽은 항목을 끝낸 뒤 전달하는지 테스트"""
+        async def items():
+            for i in range(3):
+                yield i
+            raise RuntimeError("입력 오류")
+        
+        pipeline = StagePipeline([_sleep_stage('a', 0.0)], ordered=True)
+        results = []
+        
+        async def collect():
+            async for result in pipeline.astream(items()):
+                results.append(result)
+        
+        with pytest.raises(RuntimeError):
+            asyncio.run(collect())
+        assert results == ["0>a", "1>a", "2>a"]
+    
+    def test_sync_stream(self):
+        """동기 제너레이터로 결과를 받고 중간에 멈출 수 있는지 테스트"""
+        pipeline = StagePipeline([_sleep_stage('a', 0.01), _sleep_stage('b', 0.01)], ordered=True)
+        assert list(pipeline.stream(range(5))) == [f"{i}>a>b" for i in range(5)]
+        
+        results = pipeline.stream(iter(range(1000)))
+        assert next(results) == "0>a>b"
+        results.close()
+    
+    def test_invalid_arguments(self):
+        """잘못된 인자 검증 테스트"""
+        with pytest.raises(ValueError):
+            StagePipeline([])
+        with pytest.raises(ValueError):
+            StagePipeline([_sleep_stage('a', 0.0)], workers=0)
+        with pytest.raises(ValueError):
+            StagePipeline([_sleep_stage('a', 0.0)], queue_size=0)
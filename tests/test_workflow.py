@@ -1,7 +1,11 @@
 """
 PromptOptimizationWorkflow 통합 테스트
 """
+import asyncio
+import re
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, MagicMock, patch
 
 import sys
@@ -12,6 +16,12 @@ from src.workflow import PromptOptimizationWorkflow, WorkflowState
 from src.llm_provider import LLMProviderManager
 from src.prompt_optimizer import PromptOptimizer
 from src.display import DisplayManager
+from src.run_context import RunContext
+from src.checkpoint_store import SqliteCheckpointSaver
+
+
+class _Crash(BaseException):
+    """프로세스 중단을 흉내 내는 예외 (노드의 except Exception에 잡히지 않음)"""
 
 
 class TestPromptOptimizationWorkflow:
@@ -194,6 +204,246 @@ class TestPromptOptimizationWorkflow:
         assert 'start' in final_state['timestamps']
         assert 'end' in final_state['timestamps']
         assert final_state['error'] is None
+        
+        # 타임스탬프는 벽시계 나노초 정수로 저장하고 표시할 때만 변환
+        timestamps = final_state['timestamps']
+        assert all(isinstance(value, int) for value in timestamps.values())
+        assert timestamps['start'] <= timestamps['analyze'] <= timestamps['end']
+        assert [step['timestamp'] for step in final_state['steps']] == [
+            timestamps[step['name']] for step in final_state['steps']
+        ]
+    
+    def test_run_workflow_fused(self):
+        """fused 모드에서 두 노드로 실행되는지 테스트"""
+        optimizer = Mock(spec=PromptOptimizer)
+        optimizer.mode = 'fused'
+        optimizer.analyze_and_optimize.return_value = ({'명확성': '7/10'}, '최적화된 프롬프트')
+        optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider, optimizer, self.mock_display
+        )
+        final_state = workflow.run('테스트 질의')
+        
+        assert set(workflow.workflow.get_graph().nodes) - {'__start__', '__end__'} == {
+            'analyze_optimize', 'invoke_llm'
+        }
+        assert [step['name'] for step in final_state['steps']] == [
+            'analyze_optimize', 'invoke_llm'
+        ]
+        assert final_state['optimized_prompt'] == '최적화된 프롬프트'
+        assert final_state['llm_response'] == 'LLM 응답'
+        optimizer.analyze_query.assert_not_called()
+    
+    def _parallel_optimizer(self, delay: float):
+        """분석과 최적화가 delay초씩 걸리는 Mock optimizer 생성"""
+        optimizer = Mock(spec=PromptOptimizer)
+        optimizer.optimization_uses_analysis = False
+        optimizer.check_intent_preservation.return_value = True
+        
+        def analyze(query, meter=None, run=None):
+            time.sleep(delay)
+            return {'명확성': '7/10'}
+        
+        def optimize(query, analysis, meter=None, run=None):
+            time.sleep(delay)
+            return '최적화된 프롬프트'
+        
+        optimizer.analyze_query.side_effect = analyze
+        optimizer.optimize_prompt.side_effect = optimize
+        return optimizer
+    
+    def test_run_workflow_parallel(self):
+        """분석과 최적화를 병렬로 실행하고 결과를 병합하는지 테스트"""
+        optimizer = self._parallel_optimizer(0.2)
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider, optimizer, self.mock_display, parallel=True
+        )
+        
+        start = time.perf_counter()
+        final_state = workflow.run('테스트 질의')
+        elapsed = time.perf_counter() - start
+        
+        assert workflow.parallel
+        assert elapsed < 0.35
+        assert final_state['analysis'] == {'명확성': '7/10'}
+        assert final_state['optimized_prompt'] == '최적화된 프롬프트'
+        assert final_state['llm_response'] == 'LLM 응답'
+        assert sorted(step['name'] for step in final_state['steps']) == [
+            'analyze', 'invoke_llm', 'optimize'
+        ]
+        assert {'analyze', 'optimize', 'invoke_llm'} <= set(final_state['timestamps'])
+    
+    def test_parallel_falls_back_to_serial(self):
+        """최적화가 분석에 의존하거나 스트리밍이면 순차 실행하는지 테스트"""
+        optimizer = self._parallel_optimizer(0.0)
+        optimizer.optimization_uses_analysis = True
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider, optimizer, self.mock_display, parallel=True
+        )
+        assert not workflow.parallel
+        
+        streaming = PromptOptimizationWorkflow(
+            self.mock_llm_provider, self._parallel_optimizer(0.0), self.mock_display,
+            streaming=True, parallel=True
+        )
+        assert not streaming.parallel
+    
+    def test_parallel_error_skips_llm(self):
+        """병렬 실행 중 분석 오류가 나면 LLM을 호출하지 않는지 테스트"""
+        optimizer = self._parallel_optimizer(0.0)
+        optimizer.analyze_query.side_effect = Exception("분석 오류")
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider, optimizer, self.mock_display, parallel=True
+        )
+        
+        final_state = workflow.run('테스트 질의')
+        
+        assert "분석 오류" in final_state['error']
+        self.mock_llm_provider.invoke.assert_not_called()
+    
+    def test_arun_workflow(self):
+        """비동기 노드로 워크플로우를 실행하는지 테스트"""
+        self.mock_prompt_optimizer.aanalyze_query.return_value = {'명확성': '7/10'}
+        self.mock_prompt_optimizer.aoptimize_prompt.return_value = '최적화된 프롬프트'
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.ainvoke.return_value = 'LLM 응답'
+        
+        final_state = asyncio.run(self.workflow.arun('테스트 질의'))
+        
+        assert final_state['llm_response'] == 'LLM 응답'
+        assert [step['name'] for step in final_state['steps']] == [
+            'analyze', 'optimize', 'invoke_llm'
+        ]
+        assert 'end' in final_state['timestamps']
+        self.mock_prompt_optimizer.analyze_query.assert_not_called()
+        self.mock_llm_provider.invoke.assert_not_called()
+    
+    def test_arun_many_concurrent(self):
+        """여러 질의를 동시에 실행하고 질의별 상태를 분리하는지 테스트"""
+        async def analyze(query, meter=None, run=None):
+            await asyncio.sleep(0.05)
+            return {'명확성': query}
+        
+        async def optimize(query, analysis, meter=None, run=None):
+            await asyncio.sleep(0.05)
+            return f"최적화: {query}"
+        
+        async def ainvoke(prompt, meter=None):
+            await asyncio.sleep(0.05)
+            if prompt == "최적화: 질의 3":
+                raise Exception("LLM 오류")
+            return f"응답: {prompt}"
+        
+        self.mock_prompt_optimizer.aanalyze_query.side_effect = analyze
+        self.mock_prompt_optimizer.aoptimize_prompt.side_effect = optimize
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.ainvoke.side_effect = ainvoke
+        queries = [f"질의 {i}" for i in range(100)]
+        
+        start = time.perf_counter()
+        states = asyncio.run(self.workflow.arun_many(queries))
+        elapsed = time.perf_counter() - start
+        
+        # 순차 실행이면 100 * 0.15초
+        assert elapsed < 2.0
+        assert [s['original_query'] for s in states] == queries
+        for query, state in zip(queries, states):
+            assert state['analysis'] == {'명확성': query}
+            if query == "질의 3":
+                assert "LLM 오류" in state['error']
+                continue
+            assert state['llm_response'] == f"응답: 최적화: {query}"
+            assert len(state['steps']) == 3
+        
+        assert asyncio.run(self.workflow.arun_many([])) == []
+    
+    def test_arun_many_max_concurrency(self):
+        """max_concurrency를 넘겨 동시에 실행하지 않는지 테스트"""
+        active = 0
+        peak = 0
+        
+        async def analyze(query, meter=None, run=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {}
+        
+        self.mock_prompt_optimizer.aanalyze_query.side_effect = analyze
+        self.mock_prompt_optimizer.aoptimize_prompt.return_value = '최적화된 프롬프트'
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.ainvoke.return_value = 'LLM 응답'
+        
+        states = asyncio.run(self.workflow.arun_many([f"질의 {i}" for i in range(12)],
+                                                     max_concurrency=3))
+        
+        assert len(states) == 12
+        assert all(state['error'] is None for state in states)
+        assert peak <= 3
+    
+    def _pipeline_mocks(self, delay: float):
+        """단계마다 delay초 걸리는 비동기 Mock 설정"""
+        async def analyze(query, meter=None, run=None):
+            await asyncio.sleep(delay)
+            return {'명확성': query}
+        
+        async def optimize(query, analysis, meter=None, run=None):
+            await asyncio.sleep(delay)
+            return f"최적화: {query}"
+        
+        async def ainvoke(prompt, meter=None):
+            await asyncio.sleep(delay)
+            if prompt == "최적화: 질의 3":
+                raise Exception("LLM 오류")
+            return f"응답: {prompt}"
+        
+        self.mock_prompt_optimizer.aanalyze_query.side_effect = analyze
+        self.mock_prompt_optimizer.aoptimize_prompt.side_effect = optimize
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.ainvoke.side_effect = ainvoke
+    
+    def test_astream_many_pipelines_stages(self):
+        """질의 사이에서 단계를 겹쳐 실행하며 결과를 스트리밍하는지 테스트"""
+        self._pipeline_mocks(0.05)
+        queries = [f"질의 {i}" for i in range(20)]
+        
+        async def collect():
+            return [state async for state in self.workflow.astream_many(queries, ordered=True)]
+        
+        start = time.perf_counter()
+        states = asyncio.run(collect())
+        elapsed = time.perf_counter() - start
+        
+        # 질의를 하나씩 실행하면 20 * 0.15초
+        assert elapsed < 1.8
+        assert [s['original_query'] for s in states] == queries
+        for query, state in zip(queries, states):
+            if query == "질의 3":
+                assert "LLM 오류" in state['error']
+                continue
+            assert state['llm_response'] == f"응답: 최적화: {query}"
+            assert [step['name'] for step in state['steps']] == [
+                'analyze', 'optimize', 'invoke_llm'
+            ]
+            assert 'end' in state['timestamps']
+        assert len(self.workflow.get_state_history()) == 20 * 3 - 1
+    
+    def test_stream_many_sync_generator(self):
+        """동기 제너레이터로 비동기 입력을 처리하는지 테스트"""
+        self._pipeline_mocks(0.0)
+        
+        async def queries():
+            for i in range(5):
+                yield f"질의 {i}"
+        
+        states = list(self.workflow.stream_many(queries(), workers={'invoke_llm': 2}))
+        
+        assert sorted(s['original_query'] for s in states) == [f"질의 {i}" for i in range(5)]
+        assert sum(1 for s in states if s['error'] is None) == 4
     
     def test_get_state_history(self):
         """상태 히스토리 반환 테스트"""
@@ -230,6 +480,166 @@ class TestPromptOptimizationWorkflow:
         
         assert len(self.workflow.get_state_history()) == 0
     
+    def test_history_bounded(self, tmp_path):
+        """상태 히스토리가 용량을 넘으면 오래된 기록을 파일로 밀어내는지 테스트"""
+        self.mock_prompt_optimizer.analyze_query.return_value = {'명확성': '7/10'}
+        self.mock_prompt_optimizer.optimize_prompt.return_value = '최적화된 프롬프트'
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        spill_path = tmp_path / "history.jsonl"
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider, self.mock_prompt_optimizer, self.mock_display,
+            history_size=3, history_spill_path=str(spill_path)
+        )
+        
+        workflow.run('첫 질의')
+        workflow.run('둘째 질의')
+        workflow.state_history.close()
+        
+        history = workflow.get_state_history()
+        assert [record.node for record in history] == ['analyze', 'optimize', 'invoke_llm']
+        assert all(record.query == '둘째 질의' for record in history)
+        assert history[-1].output == 'LLM 응답'
+        assert len(spill_path.read_text(encoding='utf-8').splitlines()) == 3
+    
+    def _checkpoint_workflow(self, path: str) -> PromptOptimizationWorkflow:
+        """체크포인트를 저장하는 워크플로우 생성 (Mock 설정 포함)"""
+        self.mock_prompt_optimizer.analyze_query.return_value = {'명확성': '7/10'}
+        self.mock_prompt_optimizer.optimize_prompt.return_value = '최적화된 프롬프트'
+        self.mock_prompt_optimizer.aanalyze_query.return_value = {'명확성': '7/10'}
+        self.mock_prompt_optimizer.aoptimize_prompt.return_value = '최적화된 프롬프트'
+        self.mock_prompt_optimizer.check_intent_preservation.return_value = True
+        return PromptOptimizationWorkflow(
+            self.mock_llm_provider, self.mock_prompt_optimizer, self.mock_display,
+            checkpointer=SqliteCheckpointSaver(path=path, commit_every=1)
+        )
+    
+    def test_run_id_changes_with_config(self):
+        """모델·생성 설정이 바뀌면 체크포인트 실행 식별자가 바뀌는지 테스트"""
+        with patch('src.llm_provider.LLMProviderManager._initialize_llm'):
+            provider = LLMProviderManager(
+                provider='ollama', model='test-model',
+                base_url='http://localhost:11434', lazy=True
+            )
+        optimizer = PromptOptimizer(provider, generation={'optimize': {'max_tokens': 256}})
+        workflow = PromptOptimizationWorkflow(provider, optimizer, self.mock_display)
+        query = '테스트 질의'
+        run_id = workflow.run_id_for(query)
+        
+        assert workflow.run_id_for(query) == run_id
+        assert workflow.run_id_for('다른 질의') != run_id
+        
+        changes = [
+            (provider, 'model', 'other-model'),
+            (provider, 'base_urls', ['http://gpu-2:11434']),
+            (provider, 'temperature', 0.2),
+            (provider, 'max_tokens', 512),
+            (optimizer, 'generation', {'optimize': {'max_tokens': 128}}),
+            (optimizer, 'analysis_format', 'json'),
+            (optimizer, 'prefix_reuse', True),
+        ]
+        for target, name, value in changes:
+            original = getattr(target, name)
+            setattr(target, name, value)
+            assert workflow.run_id_for(query) != run_id, name
+            setattr(target, name, original)
+        assert workflow.run_id_for(query) == run_id
+    
+    def test_checkpoint_resume(self, tmp_path):
+        """중단된 실행은 마지막 완료 노드 다음부터, 완료된 실행은 저장된 결과로 반환하는지 테스트"""
+        path = str(tmp_path / "checkpoints.db")
+        workflow = self._checkpoint_workflow(path)
+        self.mock_llm_provider.invoke.side_effect = _Crash()
+        with pytest.raises(_Crash):
+            workflow.run('테스트 질의')
+        
+        # 새 프로세스처럼 저장소를 다시 열어 재실행
+        self.mock_llm_provider.invoke.side_effect = None
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        restarted = self._checkpoint_workflow(path)
+        final_state = restarted.run('테스트 질의')
+        
+        assert final_state['llm_response'] == 'LLM 응답'
+        assert [step['name'] for step in final_state['steps']] == [
+            'analyze', 'optimize', 'invoke_llm'
+        ]
+        assert self.mock_prompt_optimizer.analyze_query.call_count == 1
+        assert self.mock_prompt_optimizer.optimize_prompt.call_count == 1
+        assert [record.node for record in restarted.get_state_history()] == ['invoke_llm']
+        
+        again = restarted.run('테스트 질의')
+        assert again['llm_response'] == 'LLM 응답'
+        assert 'end' in again['timestamps']
+        assert self.mock_llm_provider.invoke.call_count == 2
+        restarted.checkpointer.close()
+    
+    def test_checkpoint_timestamps_survive_restart(self, tmp_path):
+        """다른 monotonic 기준으로 재시작해 이어서 실행해도 시각이 올바른지 테스트"""
+        from src.history_store import wall_to_datetime
+        
+        path = str(tmp_path / "checkpoints.db")
+        before = time.time_ns()
+        workflow = self._checkpoint_workflow(path)
+        self.mock_llm_provider.invoke.side_effect = _Crash()
+        with pytest.raises(_Crash):
+            workflow.run('테스트 질의')
+        workflow.checkpointer.close()
+        
+        # 재부팅 후 프로세스처럼 monotonic 시각과 벽시계 기준이 바뀐 상태에서 재개
+        self.mock_llm_provider.invoke.side_effect = None
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        with patch('src.workflow.monotonic_ns', return_value=1), \
+                patch('src.history_store._WALL_OFFSET_NS', 0):
+            restarted = self._checkpoint_workflow(path)
+            final_state = restarted.run('테스트 질의')
+        after = time.time_ns()
+        
+        timestamps = final_state['timestamps']
+        order = ['start', 'analyze', 'optimize', 'invoke_llm', 'end']
+        assert [timestamps[name] for name in order] == sorted(timestamps[name] for name in order)
+        assert all(before <= timestamps[name] <= after for name in order)
+        assert abs((wall_to_datetime(timestamps['start']).timestamp() * 1e9) - before) < 60e9
+        restarted.checkpointer.close()
+    
+    def test_checkpoint_retries_error(self, tmp_path):
+        """오류로 끝난 실행은 처음부터 다시 실행하는지 테스트"""
+        workflow = self._checkpoint_workflow(str(tmp_path / "checkpoints.db"))
+        self.mock_llm_provider.invoke.side_effect = Exception("LLM 오류")
+        assert "LLM 오류" in workflow.run('테스트 질의')['error']
+        
+        self.mock_llm_provider.invoke.side_effect = None
+        self.mock_llm_provider.invoke.return_value = 'LLM 응답'
+        final_state = workflow.run('테스트 질의')
+        
+        assert final_state['error'] is None
+        assert final_state['llm_response'] == 'LLM 응답'
+        assert len(final_state['steps']) == 3
+        assert self.mock_prompt_optimizer.analyze_query.call_count == 2
+    
+    def test_arun_many_resumes_batch(self, tmp_path):
+        """재시작한 배치가 완료된 질의는 건너뛰고 중단된 질의만 이어서 실행하는지 테스트"""
+        path = str(tmp_path / "checkpoints.db")
+        workflow = self._checkpoint_workflow(path)
+        self.mock_llm_provider.ainvoke.return_value = 'LLM 응답'
+        asyncio.run(workflow.arun_many(['질의 0', '질의 1']))
+        self.mock_llm_provider.invoke.side_effect = _Crash()
+        with pytest.raises(_Crash):
+            workflow.run('질의 2')
+        
+        restarted = self._checkpoint_workflow(path)
+        self.mock_llm_provider.ainvoke.reset_mock()
+        self.mock_prompt_optimizer.aanalyze_query.reset_mock()
+        queries = ['질의 0', '질의 1', '질의 2', '질의 3', '질의 3']
+        states = asyncio.run(restarted.arun_many(queries))
+        
+        assert [s['original_query'] for s in states] == queries
+        assert all(s['llm_response'] == 'LLM 응답' for s in states)
+        # 질의 2는 LLM 호출만, 질의 3은 한 번만 처음부터 실행
+        assert self.mock_llm_provider.ainvoke.call_count == 2
+        assert self.mock_prompt_optimizer.aanalyze_query.call_count == 1
+        assert states[3] is not states[4]
+        assert restarted.run_id_for('질의 3') != restarted.run_id_for('질의 2')
+    
     def test_workflow_with_intent_not_preserved(self):
         """의도 보존 안됨 경고 테스트"""
         # Mock 설정
@@ -246,12 +656,54 @@ class TestPromptOptimizationWorkflow:
         
         # 워크플로우는 계속 진행되어야 함
         assert final_state['llm_response'] is not None
+    
+    def test_invoke_llm_node_streaming(self):
+        """스트리밍 모드 LLM 호출 노드 테스트"""
+        workflow = PromptOptimizationWorkflow(
+            self.mock_llm_provider,
+            self.mock_prompt_optimizer,
+            self.mock_display,
+            streaming=True
+        )
+        
+        def fake_invoke(prompt, meter=None):
+            meter.start()
+            for chunk in ["스트리밍", " 응답"]:
+                meter.record_token(chunk)
+            meter.finish()
+            return "스트리밍 응답"
+        
+        self.mock_llm_provider.invoke.side_effect = fake_invoke
+        
+        state: WorkflowState = {
+            'original_query': '테스트 질의',
+            'analysis': {'명확성': '7/10'},
+            'optimized_prompt': '최적화된 프롬프트',
+            'llm_response': None,
+            'steps': [],
+            'timestamps': {},
+            'error': None
+        }
+        
+        result_state = workflow._invoke_llm_node(state)
+        
+        assert result_state['llm_response'] == "스트리밍 응답"
+        step = result_state['steps'][0]
+        assert step['ttft'] is not None
+        assert step['tokens_per_sec'] is not None
+        assert 'duration' in step
+        
+        # 청크가 디스플레이로 전달되고, 전체 응답 블록은 다시 출력하지 않음
+        self.mock_display.show_stream_start.assert_called_once()
+        assert self.mock_display.show_stream_chunk.call_count == 2
+        self.mock_display.show_stream_end.assert_called_once()
+        self.mock_display.show_llm_response.assert_not_called()
 
 
 class TestWorkflowIntegration:
     """실제 컴포넌트를 사용한 통합 테스트 (Mock LLM 사용)"""
     
-    @patch('src.llm_provider.requests.get')
+    @patch('src.http_pool.httpx.Client.get')
     def test_full_workflow_with_mocked_llm(self, mock_get):
         """Mock LLM을 사용한 전체 워크플로우 테스트"""
         # 연결 검증 Mock
@@ -280,3 +732,81 @@ class TestWorkflowIntegration:
             # 검증
             assert final_state['original_query'] == query
             assert final_state['error'] is None or 'LLM' not in final_state['error']
+
+
+class _TaggedProvider:
+    """프롬프트에 들어 있는 질의 태그를 그대로 돌려주는 제공자 (동기/비동기)"""
+    
+    supports_context = False
+    
+    def _respond(self, prompt: str) -> str:
+        return "명확성: " + re.search(r'run-\d+', prompt).group()
+    
+    def invoke(self, prompt, meter=None, options=None):
+        return self._respond(prompt)
+    
+    async def ainvoke(self, prompt, meter=None, options=None):
+        await asyncio.sleep(0)
+        return self._respond(prompt)
+
+
+class TestConcurrentRuns:
+    """하나의 optimizer/workflow/제공자를 동시 실행에서 공유하는 테스트"""
+    
+    RUNS = 1000
+    
+    def setup_method(self):
+        """공유 인스턴스 생성"""
+        self.provider = _TaggedProvider()
+        self.optimizer = PromptOptimizer(self.provider)
+        self.workflow = PromptOptimizationWorkflow(
+            self.provider, self.optimizer, Mock(spec=DisplayManager),
+            history_size=3 * self.RUNS
+        )
+    
+    def _assert_owned(self, query: str, run_context: RunContext, final_state):
+        """실행 기록이 모두 해당 질의의 것인지 확인"""
+        tag = query.split()[0]
+        assert final_state['error'] is None
+        assert final_state['llm_response'] == f"명확성: {tag}"
+        assert [step.name for step in run_context.steps] == ["질의 분석", "프롬프트 최적화"]
+        assert all(step.input_data == query for step in run_context.steps)
+        assert [record.node for record in run_context.history] == [
+            'analyze', 'optimize', 'invoke_llm'
+        ]
+        assert all(record.query == query for record in run_context.history)
+        assert all(record.run_id == run_context.run_id for record in run_context.history)
+    
+    def test_threaded_runs_keep_records_separate(self):
+        """스레드 풀에서 동시에 실행해도 실행별 기록이 섞이지 않는지 테스트"""
+        queries = [f"run-{i} web scraping" for i in range(self.RUNS)]
+        contexts = [RunContext(query) for query in queries]
+        
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            states = list(executor.map(self.workflow.run, queries, contexts))
+        
+        for query, run_context, final_state in zip(queries, contexts, states):
+            self._assert_owned(query, run_context, final_state)
+        # 공용 기록에는 섞이지 않고, 인스턴스 히스토리는 실행 단위로 이어 붙음
+        assert self.optimizer.get_optimization_steps() == []
+        history = self.workflow.get_state_history()
+        assert len(history) == 3 * self.RUNS
+        for i in range(0, len(history), 3):
+            assert len({record.run_id for record in history[i:i + 3]}) == 1
+    
+    def test_async_runs_keep_records_separate(self):
+        """이벤트 루프에서 동시에 실행해도 실행별 기록이 섞이지 않는지 테스트"""
+        queries = [f"run-{i} sql tuning" for i in range(self.RUNS)]
+        contexts = [RunContext(query) for query in queries]
+        
+        async def run_all():
+            return await asyncio.gather(*(
+                self.workflow.arun(query, run_context)
+                for query, run_context in zip(queries, contexts)
+            ))
+        
+        states = asyncio.run(run_all())
+        
+        for query, run_context, final_state in zip(queries, contexts, states):
+            self._assert_owned(query, run_context, final_state)
+        assert len(self.workflow.get_state_history()) == 3 * self.RUNS